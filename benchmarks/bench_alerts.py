@@ -0,0 +1,87 @@
+"""Per-sample cost of evaluating a thousand alert rules at 10 Hz, for short and long windows.
+
+Run with: python benchmarks/bench_alerts.py [rules] [samples]
+
+Exits with status 1 when the engine would take more than BUDGET_SHARE of one core at 10 Hz.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import random
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.alerts import AlertEngine, parse_rule
+
+DEFAULT_RULES = 1_000
+DEFAULT_SAMPLES = 3_000
+SAMPLE_HZ = 10.0
+BUDGET_SHARE = 0.05
+TEMPLATES = (
+    "cpu > {threshold} for {window}",
+    "avg(ram, {window}) > {threshold}",
+    "ewma(cpu, {window}) > {threshold}",
+    "slope(ram, {window}) > 0.{threshold}",
+    "p95(net_recv, {window}) > {threshold}k",
+    "p99(cpu, {window}) >= {threshold}",
+)
+
+
+def _rules(count: int, window: str) -> list:
+    return [
+        parse_rule(f"r{index}: " + TEMPLATES[index % len(TEMPLATES)].format(threshold=50 + index % 50, window=window))
+        for index in range(count)
+    ]
+
+
+def _snapshots(count: int) -> list[SystemSnapshot]:
+    rng = random.Random(3)
+    started = datetime(2024, 1, 1)
+    return [
+        SystemSnapshot(
+            captured_at=started + timedelta(seconds=index / SAMPLE_HZ),
+            elapsed_seconds=index / SAMPLE_HZ,
+            uptime_seconds=1000.0 + index / SAMPLE_HZ,
+            cpu_percent=rng.uniform(0.0, 100.0),
+            ram_percent=40.0 + index * 0.001,
+            disk_percent=70.1,
+            process_count=300,
+            net_sent_bps=1234.5,
+            net_recv_bps=rng.lognormvariate(10.0, 1.5),
+        )
+        for index in range(count)
+    ]
+
+
+def main() -> int:
+    rules = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RULES
+    samples = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SAMPLES
+    snapshots = _snapshots(samples)
+    print(f"{rules:,} rules, {samples:,} samples at {SAMPLE_HZ:g} Hz")
+    worst = 0.0
+    for window in ("10s", "1h"):
+        engine = AlertEngine(_rules(rules, window))
+        started = time.perf_counter()
+        for snapshot in snapshots:
+            engine.observe(snapshot)
+        per_sample = (time.perf_counter() - started) / samples
+        engine.close()
+        share = per_sample * SAMPLE_HZ
+        worst = max(worst, share)
+        print(f"{'window ' + window:>12} {per_sample * 1e6:10.1f} us/sample {share:8.2%} of one core")
+    if worst > BUDGET_SHARE:
+        print(f"over budget: {worst:.2%} > {BUDGET_SHARE:.0%} of one core")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
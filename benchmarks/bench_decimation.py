@@ -0,0 +1,58 @@
+"""Frame time of pushing a trace into pyqtgraph with and without M4 decimation.
+
+Run headless with: QT_QPA_PLATFORM=offscreen python benchmarks/bench_decimation.py
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import time
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from PyQt5.QtWidgets import QApplication
+import pyqtgraph as pg
+
+from system_monitor.services.decimation import m4_decimate
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+PLOT_WIDTH = 1000
+FRAMES = 10
+
+
+def _frame_ms(plot: pg.PlotWidget, curve: pg.PlotDataItem, x: np.ndarray, y: np.ndarray, decimate: bool) -> float:
+    started = time.perf_counter()
+    for _ in range(FRAMES):
+        data_x, data_y = m4_decimate(x, y, PLOT_WIDTH) if decimate else (x, y)
+        curve.setData(data_x, data_y)
+        plot.grab()
+    return (time.perf_counter() - started) / FRAMES * 1e3
+
+
+def main() -> int:
+    app = QApplication.instance() or QApplication(sys.argv)
+    plot = pg.PlotWidget()
+    plot.resize(PLOT_WIDTH, 400)
+    curve = plot.getPlotItem().plot(pen=pg.mkPen((85, 170, 255), width=3))
+
+    rng = np.random.default_rng(7)
+    print(f"{'points':>10} {'full ms/frame':>14} {'m4 ms/frame':>12} {'m4 points':>10}")
+    for size in SIZES:
+        x = np.arange(size, dtype=float)
+        y = np.clip(rng.normal(30.0, 10.0, size), 0.0, 100.0)
+        full_ms = _frame_ms(plot, curve, x, y, decimate=False)
+        m4_ms = _frame_ms(plot, curve, x, y, decimate=True)
+        kept = len(m4_decimate(x, y, PLOT_WIDTH)[0])
+        print(f"{size:>10,} {full_ms:>14.2f} {m4_ms:>12.2f} {kept:>10,}")
+    app.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
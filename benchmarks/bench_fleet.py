@@ -0,0 +1,96 @@
+"""Aggregator ingest rate and fleet-view frame cost with hundreds of simulated agents.
+
+Run with: QT_QPA_PLATFORM=offscreen python benchmarks/bench_fleet.py [agents] [records per agent]
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.binary_exporter import encode_record
+from system_monitor.services.fleet import FleetAggregator
+from system_monitor.services.fleet_agent import open_fleet_socket
+from system_monitor.services.fleet_protocol import RECORDS, encode_frame, encode_hello
+
+DEFAULT_AGENTS = 300
+DEFAULT_RECORDS = 100
+
+
+def _frames(count: int) -> bytes:
+    started = datetime(2024, 1, 1)
+    return b"".join(
+        encode_frame(
+            RECORDS,
+            encode_record(
+                SystemSnapshot(started + timedelta(seconds=index), float(index), 1.0, float(index % 100), 50.0, 60.0, 7, 0.0, 0.0)
+            ),
+        )
+        for index in range(count)
+    )
+
+
+def main() -> int:
+    agents = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_AGENTS
+    records = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_RECORDS
+    frames = _frames(records)
+    aggregator = FleetAggregator(("127.0.0.1", 0), history_seconds=120.0)
+    aggregator.start()
+    connections = []
+    try:
+        for index in range(agents):
+            connection = open_fleet_socket(aggregator.address)
+            connection.sendall(encode_hello(f"agent-{index:04d}", 1.0))
+            connections.append(connection)
+        started = time.perf_counter()
+        # Every agent's records as one burst of one-record frames, as after a network stall.
+        for connection in connections:
+            connection.sendall(frames)
+        total = agents * records
+        while sum(host.records for host in aggregator.hosts()) < total:
+            time.sleep(0.001)
+        ingest = time.perf_counter() - started
+        print(f"{agents} agents x {records} records: {total / ingest:,.0f} records/s ingested")
+
+        changed = aggregator.take_changed()
+        started = time.perf_counter()
+        for host in changed:
+            host.series()
+        print(f"copy out {len(changed)} changed hosts: {(time.perf_counter() - started) * 1e3:.2f} ms per frame")
+
+        try:
+            from PyQt5.QtWidgets import QApplication
+
+            from system_monitor.ui.fleet_window import FleetWindow
+        except ModuleNotFoundError:
+            return 0
+        app = QApplication.instance() or QApplication([])
+        window = FleetWindow(aggregator)
+        window.show()
+        # The first frame creates and lays out every tile; later ones only rebuild polylines and repaint.
+        for label in ("first", "steady"):
+            for host in aggregator.hosts():
+                aggregator._changed.add(host.name)  # noqa: SLF001 - every tile changed in this frame
+            started = time.perf_counter()
+            window.render_frame()
+            app.processEvents()
+            elapsed = time.perf_counter() - started
+            print(f"{label} fleet view frame with {len(window.tiles)} changed tiles: {elapsed * 1e3:.1f} ms")
+        window.close()
+    finally:
+        for connection in connections:
+            connection.close()
+        aggregator.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+"""Compare the NumPy ring buffer with the original deque-based HistoryBuffer.
+
+Run with: python benchmarks/bench_history_buffer.py
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from pathlib import Path
+import sys
+import time
+from typing import Deque
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.services.history_buffer import HistoryBuffer
+
+SIZES = (10_000, 100_000, 1_000_000)
+READ_REPEATS = 20
+
+
+class DequeHistoryBuffer:
+    # The pre-NumPy implementation, kept verbatim as the comparison baseline.
+    def __init__(self, max_points: int) -> None:
+        self._time: Deque[float] = deque(maxlen=max_points)
+        self._cpu: Deque[float] = deque(maxlen=max_points)
+        self._ram: Deque[float] = deque(maxlen=max_points)
+
+    def append(self, elapsed_seconds: float, cpu_percent: float, ram_percent: float) -> None:
+        self._time.append(elapsed_seconds)
+        self._cpu.append(cpu_percent)
+        self._ram.append(ram_percent)
+
+    @property
+    def time_points(self) -> list[float]:
+        return list(self._time)
+
+    @property
+    def cpu_points(self) -> list[float]:
+        return list(self._cpu)
+
+    def cpu_window(self, size: int) -> list[float]:
+        return list(self._cpu)[-size:]
+
+
+def _measure(buffer_factory, size: int) -> tuple[float, float]:
+    history = buffer_factory(size)
+    started = time.perf_counter()
+    for index in range(size * 2):
+        history.append(float(index), 50.0, 25.0)
+    append_us = (time.perf_counter() - started) / (size * 2) * 1e6
+
+    started = time.perf_counter()
+    for _ in range(READ_REPEATS):
+        history.time_points
+        history.cpu_points
+        history.cpu_window(size // 2)
+    read_ms = (time.perf_counter() - started) / READ_REPEATS * 1e3
+    return append_us, read_ms
+
+
+def main() -> int:
+    print(f"{'points':>10} {'impl':>8} {'append us/op':>14} {'read ms/tick':>14}")
+    for size in SIZES:
+        for label, factory in (("deque", DequeHistoryBuffer), ("numpy", HistoryBuffer)):
+            append_us, read_ms = _measure(lambda points: factory(max_points=points), size)
+            print(f"{size:>10,} {label:>8} {append_us:>14.3f} {read_ms:>14.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,46 @@
+"""Per-tick cost of ProcessSampler on this host, optionally padded with idle child processes.
+
+Run with: python benchmarks/bench_process_sampler.py [extra_processes]
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import subprocess
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.services.process_sampler import DEFAULT_BUDGET_SECONDS, ProcessSampler
+
+TICKS = 20
+
+
+def main() -> int:
+    extra = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    children = [subprocess.Popen(["sleep", "600"]) for _ in range(extra)]
+    try:
+        print(f"{'budget ms':>10} {'tick':>5} {'processes':>10} {'refreshed':>10} {'tracked':>8} {'ms':>8}")
+        for budget in (DEFAULT_BUDGET_SECONDS, 10.0):
+            sampler = ProcessSampler(budget_seconds=budget)
+            for tick in range(TICKS):
+                table = sampler.sample()
+                if tick in (0, 1, TICKS - 1):
+                    print(
+                        f"{budget * 1e3:>10.0f} {tick:>5} {table.process_count:>10,} {table.refreshed_count:>10,}"
+                        f" {len(sampler):>8,} {table.sample_seconds * 1e3:>8.2f}"
+                    )
+                time.sleep(0.05)
+    finally:
+        for child in children:
+            child.kill()
+            child.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
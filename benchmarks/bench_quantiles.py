@@ -0,0 +1,116 @@
+"""Rolling percentile cost, accuracy and memory: sketches against sorting a raw sample window.
+
+Run with: python benchmarks/bench_quantiles.py [samples] [hosts]
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import math
+from pathlib import Path
+import sys
+import time
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.quantile_sketch import (
+    PERCENT_RANGE,
+    QUANTILE_WINDOWS,
+    QUANTILES,
+    QuantileSketch,
+    QuantileTracker,
+)
+
+DEFAULT_SAMPLES = 36_000
+DEFAULT_HOSTS = 300
+SAMPLE_HZ = 10.0
+
+
+def _snapshots(count: int) -> list[SystemSnapshot]:
+    rng = np.random.default_rng(3)
+    cpu = np.clip(rng.gamma(2.0, 10.0, count), 0.0, 100.0).tolist()
+    recv = rng.lognormal(10.0, 2.0, count).tolist()
+    started = datetime(2024, 1, 1)
+    return [
+        SystemSnapshot(
+            captured_at=started + timedelta(seconds=index / SAMPLE_HZ),
+            elapsed_seconds=index / SAMPLE_HZ,
+            uptime_seconds=1000.0,
+            cpu_percent=cpu[index],
+            ram_percent=40.0 + (index % 600) / 60.0,
+            disk_percent=70.1,
+            process_count=300,
+            net_sent_bps=recv[index] / 10.0,
+            net_recv_bps=recv[index],
+        )
+        for index in range(count)
+    ]
+
+
+def _exact(values: np.ndarray, fraction: float) -> float:
+    rank = max(1, math.ceil(fraction * len(values))) - 1
+    return float(np.partition(values, rank)[rank])
+
+
+def main() -> int:
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SAMPLES
+    hosts = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_HOSTS
+    snapshots = _snapshots(samples)
+    fractions = [fraction for _, fraction in QUANTILES]
+
+    tracker = QuantileTracker()
+    started = time.perf_counter()
+    for snapshot in snapshots:
+        vectors = tracker.observe(snapshot)
+    per_sample = (time.perf_counter() - started) / samples
+    sketch_bytes = sum(window.nbytes for windows in tracker.windows.values() for window in windows.values())
+
+    # The same 1h window kept raw and sorted on every sample, for one metric.
+    recv = np.array([snapshot.net_recv_bps for snapshot in snapshots])
+    window = int(3600 * SAMPLE_HZ)
+    rounds = min(samples, 200)
+    started = time.perf_counter()
+    for end in range(samples - rounds, samples):
+        chunk = recv[max(0, end + 1 - window) : end + 1]
+        [_exact(chunk, fraction) for fraction in fractions]
+    raw_per_sample = (time.perf_counter() - started) / rounds
+
+    estimate = dict(zip(vectors["net_recv_bps_quantiles"].labels, vectors["net_recv_bps_quantiles"].values.tolist()))
+    tail = recv[-min(samples, window) :]
+    metrics = len(tracker.windows)
+    print(f"{samples:,} samples at {SAMPLE_HZ:g} Hz, {metrics} metrics x {len(QUANTILE_WINDOWS)} windows")
+    print(f"{'tracker.observe':>28} {per_sample * 1e6:9.1f} us/sample {per_sample * SAMPLE_HZ:8.3%} of one core")
+    print(f"{'raw 1h window, one metric':>28} {raw_per_sample * 1e6:9.1f} us/sample")
+    # The sketches are the same size at any rate; raw 1h windows grow with it.
+    print(f"{'sketch memory':>28} {sketch_bytes / 1024:9.1f} KiB at any rate")
+    for hz in (SAMPLE_HZ, 10 * SAMPLE_HZ):
+        print(f"{'raw 1h windows at ' + format(hz, 'g') + ' Hz':>28} {3600 * hz * 8 * metrics / 1024:9.1f} KiB")
+    for label, fraction in QUANTILES:
+        exact = _exact(tail, fraction)
+        value = estimate[f"{label}_1h"]
+        print(f"{'net_recv ' + label + ' 1h':>28} {value:14,.0f} vs exact {exact:14,.0f} ({abs(value - exact) / exact:.3%})")
+
+    sketches = []
+    rng = np.random.default_rng(9)
+    for _ in range(hosts):
+        sketch = QuantileSketch(*PERCENT_RANGE)
+        sketch.extend(rng.uniform(0.0, 100.0, 600))
+        sketches.append(sketch)
+    started = time.perf_counter()
+    merged = QuantileSketch(*PERCENT_RANGE)
+    for sketch in sketches:
+        merged.merge(sketch)
+    merged.quantiles(fractions)
+    merge_ms = (time.perf_counter() - started) * 1e3
+    print(f"{'merge ' + str(hosts) + ' host sketches':>28} {merge_ms:9.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+"""GUI-thread cost of the dashboard: stylesheet rings versus painted rings, frames per --fps, and minimized.
+
+Run headless with: QT_QPA_PLATFORM=offscreen python benchmarks/bench_render.py
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from PyQt5 import QtCore
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QApplication, QFrame, QWidget
+
+from system_monitor.services.system_stats import SystemStatsService
+from system_monitor.ui.main_window import DEFAULT_FPS, MainWindow
+from system_monitor.ui.progress_ring import ProgressRing
+
+RING_UPDATES = 400
+INTERVAL_MS = 100
+RUN_SECONDS = 5.0
+FPS_CHOICES = (30.0, 10.0, 4.0)
+# The stylesheet the ring frames used to be rebuilt with on every sample.
+GRADIENT_STYLE = (
+    "QFrame{{border-radius: 110px;background-color: qconicalgradient(cx:0.5, cy:0.5, angle:90, "
+    "stop:{stop_1} rgba(255, 0, 127, 0), stop:{stop_2} rgba(85, 170, 255, 255));}}"
+)
+
+
+def _ring_values() -> list[float]:
+    return [(index * 7.3) % 100.0 for index in range(RING_UPDATES)]
+
+
+def _time_stylesheet_ring(host: QWidget) -> float:
+    frame = QFrame(host)
+    frame.setGeometry(10, 10, 220, 220)
+    frame.show()
+    started = time.perf_counter()
+    for value in _ring_values():
+        progress = (100 - value) / 100.0
+        frame.setStyleSheet(GRADIENT_STYLE.format(stop_1=max(progress - 0.001, 0.0), stop_2=progress))
+        frame.repaint()
+    return (time.perf_counter() - started) / RING_UPDATES
+
+
+def _time_painted_ring(host: QWidget) -> float:
+    ring = ProgressRing(QColor(85, 170, 255), parent=host)
+    ring.setGeometry(10, 10, 220, 220)
+    ring.show()
+    started = time.perf_counter()
+    for value in _ring_values():
+        ring.set_value(value)
+        ring.repaint()
+    return (time.perf_counter() - started) / RING_UPDATES
+
+
+def _gui_thread_load(app: QApplication, fps: float, minimized: bool = False) -> tuple[float, int]:
+    window = MainWindow(SystemStatsService(), poll_interval_ms=INTERVAL_MS, fps=fps)
+    if minimized:
+        window.showMinimized()
+    else:
+        window.show()
+    frames = 0
+    original = window.render_frame
+
+    def counted_frame() -> None:
+        nonlocal frames
+        frames += 1
+        original()
+
+    window.frame_timer.timeout.disconnect()
+    window.frame_timer.timeout.connect(counted_frame)
+    # thread_time only counts the GUI thread, not the sampler thread feeding it.
+    started = time.thread_time()
+    QtCore.QTimer.singleShot(int(RUN_SECONDS * 1000), app.quit)
+    app.exec_()
+    busy = time.thread_time() - started
+    window.close()
+    return busy / RUN_SECONDS, frames
+
+
+def main() -> int:
+    app = QApplication.instance() or QApplication(sys.argv)
+    host = QWidget()
+    host.resize(240, 240)
+    host.show()
+    stylesheet = _time_stylesheet_ring(host)
+    painted = _time_painted_ring(host)
+    print(f"{'ring update':>12} {'us/update':>10}")
+    print(f"{'stylesheet':>12} {stylesheet * 1e6:>10.1f}")
+    print(f"{'painted':>12} {painted * 1e6:>10.1f}")
+    host.close()
+
+    print(f"\nsampling every {INTERVAL_MS}ms for {RUN_SECONDS:.0f}s")
+    print(f"{'fps':>6} {'window':>10} {'frames':>7} {'gui cpu %':>10}")
+    for fps in FPS_CHOICES:
+        load, frames = _gui_thread_load(app, fps)
+        print(f"{fps:>6.0f} {'shown':>10} {frames:>7} {load * 100:>10.1f}")
+    load, frames = _gui_thread_load(app, DEFAULT_FPS, minimized=True)
+    print(f"{DEFAULT_FPS:>6.0f} {'minimized':>10} {frames:>7} {load * 100:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
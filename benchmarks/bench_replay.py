@@ -0,0 +1,80 @@
+"""Open latency and replay throughput of ReplaySource for CSV, binary and Parquet recordings.
+
+Run with: python benchmarks/bench_replay.py [rows]
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.exporters import create_exporter
+from system_monitor.services.metric_vectors import core_labels, make_vector
+from system_monitor.services.replay import ReplaySource
+
+DEFAULT_ROWS = 200_000
+CORES = 16
+LAYOUT = {"cpu_core_percent": core_labels(CORES)}
+
+
+def _record(path: Path, rows: int) -> None:
+    started = datetime(2024, 1, 1)
+    labels = LAYOUT["cpu_core_percent"]
+    exporter = create_exporter(path, vector_layout=LAYOUT)
+    # Recording is a conversion: every row must reach the file, however far the writer falls behind.
+    exporter.block_when_full = True
+    for index in range(rows):
+        exporter.write(
+            SystemSnapshot(
+                captured_at=started + timedelta(milliseconds=100 * index),
+                elapsed_seconds=index * 0.1,
+                uptime_seconds=1000.0 + index * 0.1,
+                cpu_percent=float(index % 100),
+                ram_percent=42.5,
+                disk_percent=70.1,
+                process_count=300,
+                net_sent_bps=1234.5,
+                net_recv_bps=6789.0,
+                vectors={"cpu_core_percent": make_vector(labels, [float((index + core) % 100) for core in range(CORES)])},
+            )
+        )
+    exporter.close()
+    if exporter.dropped:
+        raise SystemExit(f"{path.name}: the exporter dropped {exporter.dropped} rows")
+
+
+def main() -> int:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    print(f"{rows:,} recorded rows, {CORES} cores each")
+    print(f"{'format':>8} {'file MB':>9} {'open ms':>9} {'replay rows/s':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for suffix in (".csv", ".bin", ".parquet"):
+            path = Path(tmp) / f"recording{suffix}"
+            try:
+                _record(path, rows)
+            except RuntimeError as error:
+                print(f"{suffix[1:]:>8} skipped: {error}")
+                continue
+            started = time.perf_counter()
+            source = ReplaySource(path, speed=None)
+            opened = time.perf_counter() - started
+            started = time.perf_counter()
+            while not source.finished:
+                source.sample()
+            replay = time.perf_counter() - started
+            size_mb = path.stat().st_size / 1e6
+            print(f"{suffix[1:]:>8} {size_mb:>9.1f} {opened * 1e3:>9.2f} {rows / replay:>14,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
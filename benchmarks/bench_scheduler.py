@@ -0,0 +1,82 @@
+"""Cadence of a 100ms QTimer versus the deadline-scheduled BackgroundSampler while the GUI thread is busy.
+
+Run headless with: QT_QPA_PLATFORM=offscreen python benchmarks/bench_scheduler.py
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import time
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from PyQt5 import QtCore
+from PyQt5.QtWidgets import QApplication
+
+from system_monitor.services.sampler import BackgroundSampler
+
+INTERVAL_MS = 100
+RUN_SECONDS = 6.0
+# The GUI thread spends this long "rendering" every LOAD_EVERY_MS, like a heavy repaint would.
+LOAD_MS = 35
+LOAD_EVERY_MS = 60
+
+
+class _StampSource:
+    def __init__(self) -> None:
+        self.stamps: list[float] = []
+
+    def sample(self) -> float:
+        self.stamps.append(time.monotonic())
+        return self.stamps[-1]
+
+
+def _busy(milliseconds: float) -> None:
+    until = time.perf_counter() + milliseconds / 1000.0
+    while time.perf_counter() < until:
+        pass
+
+
+def _report(label: str, stamps: list[float]) -> None:
+    periods = np.diff(stamps)
+    expected = INTERVAL_MS / 1000.0
+    drift = (stamps[-1] - stamps[0]) - (len(stamps) - 1) * expected
+    print(
+        f"{label:>10} {len(stamps):>6} {periods.mean() * 1e3:>10.2f} "
+        f"{np.abs(periods - expected).mean() / expected * 100:>10.2f} {drift * 1e3:>10.1f}"
+    )
+
+
+def main() -> int:
+    app = QApplication.instance() or QApplication(sys.argv)
+    qtimer_stamps: list[float] = []
+    qtimer = QtCore.QTimer()
+    qtimer.timeout.connect(lambda: qtimer_stamps.append(time.monotonic()))
+    load = QtCore.QTimer()
+    load.timeout.connect(lambda: _busy(LOAD_MS))
+
+    source = _StampSource()
+    sampler = BackgroundSampler(source, INTERVAL_MS, max_pending=0)
+
+    qtimer.start(INTERVAL_MS)
+    load.start(LOAD_EVERY_MS)
+    sampler.start()
+    QtCore.QTimer.singleShot(int(RUN_SECONDS * 1000), app.quit)
+    app.exec_()
+    sampler.stop()
+
+    print(f"{'source':>10} {'ticks':>6} {'period ms':>10} {'error %':>10} {'drift ms':>10}")
+    _report("QTimer", qtimer_stamps)
+    _report("scheduler", source.stamps)
+    print(f"scheduler {sampler.scheduler.summary()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
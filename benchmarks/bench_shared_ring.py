@@ -0,0 +1,83 @@
+"""Per-record cost of publishing to and following a shared snapshot ring, next to sampling the host directly.
+
+Run with: python benchmarks/bench_shared_ring.py [records]
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import os
+from pathlib import Path
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.metric_vectors import core_labels, make_vector
+from system_monitor.services.shared_ring import SharedRingSource, SharedSnapshotRing
+from system_monitor.services.system_stats import SystemStatsService
+
+DEFAULT_RECORDS = 20_000
+CORES = 16
+LAYOUT = {"cpu_core_percent": core_labels(CORES)}
+
+
+def _snapshots(count: int) -> list[SystemSnapshot]:
+    started = datetime(2024, 1, 1)
+    labels = LAYOUT["cpu_core_percent"]
+    return [
+        SystemSnapshot(
+            captured_at=started + timedelta(milliseconds=100 * index),
+            elapsed_seconds=index * 0.1,
+            uptime_seconds=1000.0 + index * 0.1,
+            cpu_percent=float(index % 100),
+            ram_percent=42.5,
+            disk_percent=70.1,
+            process_count=300,
+            net_sent_bps=1234.5,
+            net_recv_bps=6789.0,
+            vectors={"cpu_core_percent": make_vector(labels, [float((index + core) % 100) for core in range(CORES)])},
+        )
+        for index in range(count)
+    ]
+
+
+def main() -> int:
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RECORDS
+    snapshots = _snapshots(records)
+    ring = SharedSnapshotRing(f"system-monitor-bench-{os.getpid()}", capacity=records + 1, vector_layout=LAYOUT)
+    try:
+        source = SharedRingSource(ring.name)
+        started = time.perf_counter()
+        for snapshot in snapshots:
+            ring.write(snapshot)
+        publish = (time.perf_counter() - started) / records
+        started = time.perf_counter()
+        while source.sample() is not None:
+            pass
+        follow = (time.perf_counter() - started) / records
+        source.close()
+    finally:
+        ring.close()
+
+    service = SystemStatsService(collect_vectors=True)
+    service.sample()
+    rounds = 200
+    started = time.perf_counter()
+    for _ in range(rounds):
+        service.sample()
+    sample = (time.perf_counter() - started) / rounds
+
+    print(f"{records:,} records, {CORES} cores each")
+    print(f"{'publish':>24} {publish * 1e6:9.2f} us/record")
+    print(f"{'attached sample()':>24} {follow * 1e6:9.2f} us/record")
+    print(f"{'SystemStatsService.sample':>24} {sample * 1e6:9.2f} us/sample")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+"""Startup time and peak RSS of the headless collector versus the GUI path.
+
+Each variant runs in a fresh interpreter until its first snapshot is captured, then exits.
+Run with: QT_QPA_PLATFORM=offscreen python benchmarks/bench_startup.py
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import subprocess
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+RUNS = 5
+
+HEADLESS_SCRIPT = """
+import sys
+sys.path.insert(0, {src!r})
+from system_monitor.collector import HeadlessCollector
+from system_monitor.services.system_stats import SystemStatsService
+collector = HeadlessCollector(SystemStatsService(), interval_ms=1000, history_seconds=30)
+collector.sampler.add_listener(lambda snapshot: collector.stop())
+collector.run()
+"""
+
+GUI_SCRIPT = """
+import sys
+sys.path.insert(0, {src!r})
+from PyQt5 import QtCore
+from PyQt5.QtWidgets import QApplication
+app = QApplication(sys.argv)
+from system_monitor.services.system_stats import SystemStatsService
+from system_monitor.ui.main_window import MainWindow
+window = MainWindow(SystemStatsService(), poll_interval_ms=250)
+window.show()
+def check():
+    if window.current_snapshot is not None:
+        window.close()
+        app.quit()
+timer = QtCore.QTimer()
+timer.timeout.connect(check)
+timer.start(5)
+app.exec_()
+"""
+
+
+def _run(script: str) -> tuple[float, float]:
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", script.format(src=str(SRC))],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"benchmark child exited with {process.returncode}")
+    rss_kib = usage.ru_maxrss if sys.platform != "darwin" else usage.ru_maxrss / 1024
+    return elapsed, rss_kib / 1024
+
+
+def main() -> int:
+    print(f"{'path':>10} {'first sample ms':>16} {'peak RSS MB':>12}")
+    for label, script in (("headless", HEADLESS_SCRIPT), ("gui", GUI_SCRIPT)):
+        results = [_run(script) for _ in range(RUNS)]
+        best_ms = min(elapsed for elapsed, _ in results) * 1e3
+        rss_mb = min(rss for _, rss in results)
+        print(f"{label:>10} {best_ms:>16.0f} {rss_mb:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,40 @@
+"""Samples per second and CPU time per sample for the psutil and procfs stats backends (Linux),
+with and without the per-core/interface/mount vectors.
+
+Run with: python benchmarks/bench_stats_backends.py
+"""
+
+from __future__ import annotations
+
+import itertools
+from pathlib import Path
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.services.system_stats import STATS_BACKENDS, create_stats_service
+
+SAMPLES = 2_000
+
+
+def main() -> int:
+    print(f"{'backend':>8} {'vectors':>8} {'samples/s':>10} {'cpu us/sample':>14}")
+    for backend, collect_vectors in itertools.product(STATS_BACKENDS, (False, True)):
+        service = create_stats_service(backend, collect_vectors=collect_vectors)
+        service.sample()
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        for _ in range(SAMPLES):
+            service.sample()
+        cpu_seconds = time.process_time() - cpu_started
+        wall_seconds = time.perf_counter() - wall_started
+        print(f"{backend:>8} {str(collect_vectors):>8} {SAMPLES / wall_seconds:>10,.0f} {cpu_seconds / SAMPLES * 1e6:>14.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
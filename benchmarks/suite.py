@@ -0,0 +1,261 @@
+"""Reproducible benchmark suite: sampling, history, graph refresh and CSV export, checked against a baseline.
+
+Run headless with: QT_QPA_PLATFORM=offscreen python benchmarks/suite.py [--json results.json]
+
+Every case reports the best of several repeats, like timeit, since interference only ever adds time. Results are
+compared with benchmarks/baseline.json and the run exits with status 1 when a metric is worse than the baseline by
+more than --tolerance (default 30%). The baseline is machine specific: I refresh it on the release machine with
+--update-baseline. --only NAME limits the run to cases whose name starts with NAME.
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import platform
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Callable
+from unittest.mock import patch
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.csv_exporter import CsvMetricsExporter
+from system_monitor.services.history_buffer import HistoryBuffer
+from system_monitor.services.system_stats import SystemStatsService
+
+BASELINE_PATH = Path(__file__).resolve().with_name("baseline.json")
+DEFAULT_TOLERANCE = 0.30
+REPEATS = 5
+SAMPLE_CALLS = 200
+HISTORY_SIZES = (1_000, 100_000, 1_000_000)
+GRAPH_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+GRAPH_INTERVAL_MS = 100
+GRAPH_FRAMES = 10
+CSV_ROWS = 20_000
+
+# name -> (value, unit, "lower" or "higher" is better)
+Results = dict[str, tuple[float, str, str]]
+Case = Callable[[], Results]
+
+
+def _best(measure: Callable[[], float], better: str = "lower", repeats: int = REPEATS) -> float:
+    samples = [measure() for _ in range(repeats)]
+    return min(samples) if better == "lower" else max(samples)
+
+
+def _fake_psutil() -> SimpleNamespace:
+    # Constant answers, so the mocked case measures only the service's own overhead.
+    counters = SimpleNamespace(bytes_sent=1000, bytes_recv=3000)
+    usage = SimpleNamespace(percent=50.0)
+    pids = list(range(300))
+    return SimpleNamespace(
+        boot_time=lambda: 0.0,
+        cpu_percent=lambda interval=None, percpu=False: 25.0,
+        virtual_memory=lambda: usage,
+        disk_usage=lambda path: usage,
+        pids=lambda: pids,
+        net_io_counters=lambda pernic=False: counters,
+    )
+
+
+def _sample_us(service: SystemStatsService) -> float:
+    started = time.perf_counter()
+    for _ in range(SAMPLE_CALLS):
+        service.sample()
+    return (time.perf_counter() - started) / SAMPLE_CALLS * 1e6
+
+
+def case_stats_sample() -> Results:
+    real = SystemStatsService()
+    results = {"stats_sample/real_psutil": (_best(lambda: _sample_us(real)), "us/sample", "lower")}
+    with patch("system_monitor.services.system_stats.psutil", _fake_psutil()):
+        mocked = SystemStatsService()
+        results["stats_sample/mocked_psutil"] = (_best(lambda: _sample_us(mocked)), "us/sample", "lower")
+    return results
+
+
+def case_history_buffer() -> Results:
+    results: Results = {}
+    for size in HISTORY_SIZES:
+        appends = min(size, 200_000)
+
+        def append_us() -> float:
+            history = HistoryBuffer(max_points=size)
+            started = time.perf_counter()
+            for index in range(appends):
+                history.append(float(index), 50.0, 25.0)
+            return (time.perf_counter() - started) / appends * 1e6
+
+        history = HistoryBuffer(max_points=size)
+        for index in range(size):
+            history.append(float(index), 50.0, 25.0)
+
+        def read_us() -> float:
+            started = time.perf_counter()
+            for _ in range(100):
+                history.time_points
+                history.cpu_points
+                history.cpu_window(size // 2)
+            return (time.perf_counter() - started) / 100 * 1e6
+
+        results[f"history_buffer/append/{size}"] = (_best(append_us), "us/append", "lower")
+        results[f"history_buffer/read/{size}"] = (_best(read_us), "us/read", "lower")
+    return results
+
+
+def case_refresh_graph() -> Results:
+    from PyQt5.QtWidgets import QApplication
+
+    from system_monitor.ui.main_window import MainWindow
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    history_seconds = max(GRAPH_SIZES) * GRAPH_INTERVAL_MS // 1000
+    window = MainWindow(SystemStatsService(), history_seconds=history_seconds, poll_interval_ms=GRAPH_INTERVAL_MS)
+    # Live sampling would race the prefilled history, so the window only renders what I feed it.
+    window.frame_timer.stop()
+    window.sampler.stop()
+    window.process_sampler.stop()
+    window.resize(1200, 800)
+    window.show()
+    app.processEvents()
+
+    rng = np.random.default_rng(7)
+    results: Results = {}
+    filled = 0
+    for size in GRAPH_SIZES:
+        values = np.clip(rng.normal(30.0, 10.0, size - filled), 0.0, 100.0)
+        for offset, value in enumerate(values):
+            elapsed = (filled + offset) * GRAPH_INTERVAL_MS / 1000.0
+            window.history.append(elapsed, value, 100.0 - value)
+        filled = size
+
+        def frame_ms() -> float:
+            started = time.perf_counter()
+            for _ in range(GRAPH_FRAMES):
+                window.refresh_graph()
+                window.cpu_graph.grab()
+            return (time.perf_counter() - started) / GRAPH_FRAMES * 1e3
+
+        results[f"refresh_graph/{size}"] = (_best(frame_ms), "ms/frame", "lower")
+    window.close()
+    app.processEvents()
+    return results
+
+
+def _snapshot(index: int) -> SystemSnapshot:
+    return SystemSnapshot(
+        captured_at=datetime(2024, 1, 1),
+        elapsed_seconds=index * 0.1,
+        uptime_seconds=1000.0 + index * 0.1,
+        cpu_percent=float(index % 100),
+        ram_percent=42.5,
+        disk_percent=70.1,
+        process_count=300,
+        net_sent_bps=1234.5,
+        net_recv_bps=6789.0,
+    )
+
+
+def case_csv_export() -> Results:
+    snapshots = [_snapshot(index) for index in range(CSV_ROWS)]
+
+    def rows_per_second() -> float:
+        with tempfile.TemporaryDirectory() as tmp:
+            exporter = CsvMetricsExporter(Path(tmp) / "metrics.csv")
+            # Rows dropped on a full queue would count as written, so the sampler side waits for the writer here.
+            exporter.block_when_full = True
+            started = time.perf_counter()
+            for snapshot in snapshots:
+                exporter.write(snapshot)
+            exporter.close()
+            elapsed = time.perf_counter() - started
+            if exporter.dropped:
+                raise RuntimeError(f"csv export dropped {exporter.dropped} of {CSV_ROWS} rows")
+            return CSV_ROWS / elapsed
+
+    return {"csv_export/rows_per_second": (_best(rows_per_second, "higher"), "rows/s", "higher")}
+
+
+CASES: dict[str, Case] = {
+    "stats_sample": case_stats_sample,
+    "history_buffer": case_history_buffer,
+    "refresh_graph": case_refresh_graph,
+    "csv_export": case_csv_export,
+}
+
+
+def machine_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results: Results, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, (value, unit, better) in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            continue
+        expected = reference["value"]
+        worse = value > expected * (1 + tolerance) if better == "lower" else value < expected / (1 + tolerance)
+        if worse:
+            regressions.append(f"{name}: {value:,.3f} {unit} vs baseline {expected:,.3f} {unit}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", type=Path, metavar="PATH", help="Also write the results to PATH as JSON.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON to compare against.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown (0.3 = 30%%).")
+    parser.add_argument("--update-baseline", action="store_true", help="Overwrite the baseline with this run.")
+    parser.add_argument("--only", metavar="NAME", help="Run only cases whose name starts with NAME.")
+    args = parser.parse_args()
+
+    results: Results = {}
+    for name, case in CASES.items():
+        if args.only and not name.startswith(args.only):
+            continue
+        results.update(case())
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+    print(f"{'benchmark':<34} {'value':>14} {'baseline':>14}  unit")
+    for name, (value, unit, _) in results.items():
+        reference = baseline.get("results", {}).get(name, {}).get("value")
+        shown = f"{reference:>14,.3f}" if reference is not None else f"{'-':>14}"
+        print(f"{name:<34} {value:>14,.3f} {shown}  {unit}")
+
+    payload = {
+        "machine": machine_info(),
+        "results": {name: {"value": value, "unit": unit, "better": better} for name, (value, unit, better) in results.items()},
+    }
+    if args.json:
+        args.json.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,20 +1,38 @@
 from __future__ import annotations
 
 import argparse
-import os
 from pathlib import Path
-import shutil
-import sys
-import tempfile
 
-import PyQt5
-from PyQt5 import QtCore
-from PyQt5.QtWidgets import QApplication
+from system_monitor.constants import SHARED_RING_NAME
+from system_monitor.services.buffered_exporter import parse_flush_policy, parse_size
+from system_monitor.services.exporters import EXPORT_FORMATS, check_export_options, create_exporter, infer_export_format
+from system_monitor.services.rotating_sink import COMPRESSIONS, ROTATION_INTERVALS, RotationPolicy
+from system_monitor.services.replay import parse_replay_speed
+from system_monitor.services.system_stats import STATS_BACKENDS, create_stats_service
+from system_monitor.self_metrics import SELF_PROFILER
+from system_monitor.startup_profile import STARTUP_PROFILER
 
-from system_monitor.services.csv_exporter import CsvMetricsExporter
-from system_monitor.services.system_stats import SystemStatsService
-from system_monitor.ui.main_window import MainWindow
-from system_monitor.ui.splash_screen import SplashScreen
+
+def parse_listen_address(spec: str) -> tuple[str, int]:
+    # ":9105" listens on every interface, "127.0.0.1:9105" on one, and a bare "9105" is a port. It lives
+    # here rather than in metrics_server so parsing arguments does not import http.server on every start.
+    host, _, port = spec.rpartition(":")
+    try:
+        number = int(port)
+    except ValueError:
+        raise ValueError(f"invalid listen address {spec!r}; use e.g. :9105 or 127.0.0.1:9105") from None
+    if not 0 <= number <= 65535:
+        raise ValueError(f"invalid port in {spec!r}")
+    return host.strip("[]"), number
+
+
+def parse_fleet_address(spec: str) -> str | tuple[str, int]:
+    # "unix:/run/fleet.sock" (or any path) is a Unix socket, anything else a TCP host:port.
+    if spec.startswith("unix:"):
+        return spec[len("unix:") :]
+    if "/" in spec:
+        return spec
+    return parse_listen_address(spec)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -25,6 +43,17 @@ def build_parser() -> argparse.ArgumentParser:
         default=1000,
         help="Sampling interval in milliseconds (default: 1000)",
     )
+    parser.add_argument(
+        "--fps",
+        type=float,
+        default=10.0,
+        help="Maximum dashboard redraws per second, independent of --interval-ms (default: 10)",
+    )
+    parser.add_argument(
+        "--low-power",
+        action="store_true",
+        help="Stretch the sampling interval up to 8x while the CPU is idle; any load restores --interval-ms.",
+    )
     parser.add_argument(
         "--history-seconds",
         type=int,
@@ -32,9 +61,139 @@ def build_parser() -> argparse.ArgumentParser:
         help="Visible history window in seconds (default: 30)",
     )
     parser.add_argument(
+        "--backend",
+        choices=STATS_BACKENDS,
+        default="psutil",
+        help="Where system metrics come from: psutil (portable) or procfs (Linux, reads /proc directly).",
+    )
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        metavar="PATH",
+        help="Play back an exported CSV, binary or Parquet file instead of sampling this machine.",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=parse_replay_speed,
+        default=1.0,
+        metavar="SPEED",
+        help="Replay speed relative to the recording: 1x, 10x, 100x or max (default: 1x).",
+    )
+    parser.add_argument(
+        "--attach",
+        nargs="?",
+        const=SHARED_RING_NAME,
+        metavar="NAME",
+        help=f"Follow a collector's shared-memory ring instead of sampling this machine (default: {SHARED_RING_NAME}).",
+    )
+    parser.add_argument(
+        "--share-ring",
+        nargs="?",
+        const=SHARED_RING_NAME,
+        metavar="NAME",
+        help="Publish every snapshot to a shared-memory ring other dashboards and tools can --attach to.",
+    )
+    parser.add_argument(
+        "--push-to",
+        type=parse_fleet_address,
+        metavar="ADDR",
+        help="Stream every snapshot to a --fleet view at host:port or unix:PATH.",
+    )
+    parser.add_argument(
+        "--host-name",
+        metavar="NAME",
+        help="Name this machine's tile in the fleet view (default: the host name).",
+    )
+    parser.add_argument(
+        "--fleet",
+        type=parse_fleet_address,
+        metavar="ADDR",
+        help="Show a tile per --push-to agent instead of this machine; listens on ADDR, e.g. :9200 or unix:PATH.",
+    )
+    parser.add_argument(
+        "--export",
         "--export-csv",
+        dest="export_path",
+        type=Path,
+        metavar="PATH",
+        help="Write captured metrics to PATH (CSV unless --export-format or the suffix says otherwise).",
+    )
+    parser.add_argument(
+        "--export-format",
+        choices=EXPORT_FORMATS,
+        help="Export file format: csv, bin (packed records, memory-mappable) or parquet (needs pyarrow).",
+    )
+    parser.add_argument(
+        "--export-flush-every",
+        type=parse_flush_policy,
+        metavar="THRESHOLD",
+        help="Flush exported rows every N seconds, rows or bytes, e.g. 5s, 100rows or 64KB (default: 1s).",
+    )
+    parser.add_argument(
+        "--export-rotate-size",
+        type=parse_size,
+        metavar="SIZE",
+        help="Start a new export segment once the current one reaches SIZE, e.g. 100MB.",
+    )
+    parser.add_argument(
+        "--export-rotate-every",
+        choices=ROTATION_INTERVALS,
+        help="Start a new export segment every hour or day.",
+    )
+    parser.add_argument(
+        "--export-compress",
+        choices=COMPRESSIONS,
+        help="Compress closed export segments in the background (zstd needs the zstandard package).",
+    )
+    parser.add_argument(
+        "--export-keep",
+        type=int,
+        metavar="N",
+        help="Keep only the newest N closed export segments.",
+    )
+    parser.add_argument(
+        "--export-append",
+        action="store_true",
+        help="Append to an existing export file instead of starting a new one.",
+    )
+    parser.add_argument(
+        "--export-vectors",
+        action="store_true",
+        help="Also export per-core, per-interface and per-mount metrics (one column each). Rolling p50/p95/p99 are always exported.",
+    )
+    parser.add_argument(
+        "--history-store",
+        type=Path,
+        metavar="PATH",
+        help="Keep history in an SQLite database at PATH and backfill the graphs from it on the next start.",
+    )
+    parser.add_argument(
+        "--history-retention-days",
+        type=float,
+        metavar="DAYS",
+        help="Drop --history-store samples older than DAYS; 0 keeps everything (default: 7).",
+    )
+    parser.add_argument(
+        "--alert",
+        action="append",
+        metavar="RULE",
+        help="Alert rule, repeatable: e.g. 'cpu > 90 for 60s', 'slope(ram, 30s) > 0.5' or 'p95(net_recv, 5min) > 10M'.",
+    )
+    parser.add_argument(
+        "--alert-rules",
         type=Path,
-        help="Write captured metrics to a CSV file.",
+        metavar="PATH",
+        help="Read alert rules from PATH, one per line (# starts a comment).",
+    )
+    parser.add_argument(
+        "--alert-notify",
+        action="store_true",
+        help="Show a desktop notification when an alert fires or resolves (notify-send or osascript).",
+    )
+    parser.add_argument(
+        "--alert-hook",
+        metavar="CMD",
+        help="Run CMD through the shell on every alert transition; ALERT_RULE, ALERT_STATE, ALERT_MESSAGE are set.",
     )
     parser.add_argument(
         "--no-splash",
@@ -46,83 +205,205 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Open the dashboard in maximized mode.",
     )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print an import/construct timing breakdown once the first snapshot is on screen.",
+    )
+    parser.add_argument(
+        "--timing-report",
+        action="store_true",
+        help="On exit, print sampler tick counts, missed ticks and jitter/sample-time histograms to stderr.",
+    )
+    parser.add_argument(
+        "--self-metrics",
+        action="store_true",
+        help="Time the monitor's own hot paths and show them in a status bar panel and overlay (F12).",
+    )
+    parser.add_argument(
+        "--self-metrics-out",
+        type=Path,
+        metavar="PATH",
+        help="On exit, write per-stage latency percentiles and the monitor's CPU/RSS to PATH as JSON.",
+    )
+    parser.add_argument(
+        "--serve-metrics",
+        type=parse_listen_address,
+        metavar="ADDR",
+        help="Serve Prometheus metrics on ADDR, e.g. :9105 or 127.0.0.1:9105 (/metrics and /history?since=SECONDS).",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Collect (and export) metrics without loading Qt; CSV rows go to stdout unless --export is set.",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        metavar="SECONDS",
+        help="Stop the headless collector after SECONDS (default: run until SIGTERM/SIGINT).",
+    )
     return parser
 
 
-def configure_qt_plugin_paths() -> None:
-    plugin_root = Path(PyQt5.__file__).resolve().parent / "Qt5" / "plugins"
-    platform_root = plugin_root / "platforms"
-    if not platform_root.exists():
-        return
-
-    effective_plugin_root = plugin_root
-    effective_platform_root = platform_root
-
-    # On macOS, Qt can fail to discover plugins when they're under a hidden path (like `.venv`).
-    # I stage platform plugins into a visible runtime path so the Cocoa plugin can be loaded reliably.
-    if sys.platform == "darwin" and any(part.startswith(".") for part in plugin_root.parts):
-        runtime_root = Path(tempfile.gettempdir()) / "system-monitor-qt-runtime"
-        runtime_plugin_root = runtime_root / "plugins"
-        runtime_platform_root = runtime_plugin_root / "platforms"
-        runtime_platform_root.mkdir(parents=True, exist_ok=True)
-
-        for dylib in platform_root.glob("*.dylib"):
-            shutil.copy2(dylib, runtime_platform_root / dylib.name)
-
-        qt_lib_root = plugin_root.parent / "lib"
-        runtime_lib_link = runtime_root / "lib"
-        if qt_lib_root.exists():
-            if runtime_lib_link.exists() or runtime_lib_link.is_symlink():
-                if runtime_lib_link.is_symlink() and runtime_lib_link.resolve() == qt_lib_root.resolve():
-                    pass
-                elif runtime_lib_link.is_symlink() or runtime_lib_link.is_file():
-                    runtime_lib_link.unlink()
-                else:
-                    shutil.rmtree(runtime_lib_link)
-            if not runtime_lib_link.exists():
-                runtime_lib_link.symlink_to(qt_lib_root, target_is_directory=True)
-
-        effective_plugin_root = runtime_plugin_root
-        effective_platform_root = runtime_platform_root
-
-    if not os.environ.get("QT_PLUGIN_PATH", "").strip():
-        os.environ["QT_PLUGIN_PATH"] = str(effective_plugin_root)
-    if not os.environ.get("QT_QPA_PLATFORM_PLUGIN_PATH", "").strip():
-        os.environ["QT_QPA_PLATFORM_PLUGIN_PATH"] = str(effective_platform_root)
-    QtCore.QCoreApplication.addLibraryPath(str(effective_plugin_root))
+def create_source(args: argparse.Namespace, collect_vectors: bool = False, track_quantiles: bool = False):
+    if args.attach:
+        from system_monitor.services.shared_ring import SharedRingSource
+
+        # An attached ring relays the publisher's percentiles, which cover more than this session.
+        return SharedRingSource(args.attach)
+    if args.replay:
+        from system_monitor.services.replay import ReplaySource
+
+        source = ReplaySource(args.replay, speed=args.replay_speed)
+    else:
+        source = create_stats_service(args.backend, collect_vectors=collect_vectors)
+    if not track_quantiles:
+        return source
+    from system_monitor.services.quantile_sketch import QuantileSource
+
+    return QuantileSource(source)
+
+
+def source_interval_policy(args: argparse.Namespace, source):
+    # Replays and attached rings pace themselves: from the recorded timestamps, or from the ring's head.
+    return source.next_interval if args.replay or args.attach else None
+
+
+def build_shared_ring(args: argparse.Namespace, source, interval_seconds: float):
+    if not args.share_ring:
+        return None
+    from system_monitor.services.shared_ring import SharedSnapshotRing
+
+    return SharedSnapshotRing(args.share_ring, vector_layout=source.vector_layout(), interval_seconds=interval_seconds)
+
+
+def build_fleet_agent(args: argparse.Namespace, interval_seconds: float):
+    if args.push_to is None:
+        return None
+    import socket
+
+    from system_monitor.services.fleet_agent import FleetAgent
+
+    return FleetAgent(args.push_to, args.host_name or socket.gethostname(), interval_seconds)
+
+
+def export_rotation(args: argparse.Namespace) -> RotationPolicy:
+    return RotationPolicy(
+        max_bytes=args.export_rotate_size,
+        interval=args.export_rotate_every,
+        compression=args.export_compress,
+        keep=args.export_keep,
+    )
+
+
+def build_exporter(args: argparse.Namespace, stats_service=None):
+    if not args.export_path:
+        return None
+    # The vector columns are fixed when the file opens, from the cores, interfaces and mounts present now.
+    # The rolling percentiles are a fixed handful of columns, so they go in with or without --export-vectors.
+    vector_layout = stats_service.vector_layout() if stats_service is not None else None
+    if vector_layout is not None and not args.export_vectors:
+        from system_monitor.services.quantile_sketch import QUANTILE_SUFFIX
+
+        vector_layout = {name: labels for name, labels in vector_layout.items() if name.endswith(QUANTILE_SUFFIX)} or None
+    exporter = create_exporter(
+        args.export_path,
+        args.export_format,
+        flush_policy=args.export_flush_every,
+        rotation=export_rotation(args),
+        append=args.export_append,
+        vector_layout=vector_layout,
+    )
+    # A replay at max speed is a file conversion, so there the sampler waits for the writer rather than dropping rows.
+    exporter.block_when_full = bool(args.replay) and args.replay_speed is None
+    return exporter
+
+
+def build_history_store(args: argparse.Namespace):
+    # A replay is already on disk and an attached ring has its own collector, so neither uses the store.
+    if not args.history_store or args.replay or args.attach:
+        return None
+    from system_monitor.services.history_store import DEFAULT_RETENTION_DAYS, HistoryStore
+
+    retention_days = args.history_retention_days
+    return HistoryStore(args.history_store, DEFAULT_RETENTION_DAYS if retention_days is None else retention_days)
+
+
+def load_alert_rules(args: argparse.Namespace):
+    from system_monitor.services.alerts import parse_rule, read_rule_file
+
+    rules = [parse_rule(spec) for spec in args.alert or ()]
+    if args.alert_rules:
+        rules.extend(read_rule_file(args.alert_rules))
+    return rules
+
+
+def build_alert_engine(args: argparse.Namespace, log_stream=None):
+    if not (args.alert or args.alert_rules):
+        return None
+    from system_monitor.services.alerts import AlertEngine, DesktopNotifier, HookCommand, StreamAlertLog
+
+    sinks = []
+    if log_stream is not None:
+        sinks.append(StreamAlertLog(log_stream))
+    if args.alert_notify:
+        sinks.append(DesktopNotifier())
+    if args.alert_hook:
+        sinks.append(HookCommand(args.alert_hook))
+    return AlertEngine(load_alert_rules(args), sinks)
+
+
+def build_metrics_server(args: argparse.Namespace):
+    if args.serve_metrics is None:
+        return None
+    from system_monitor.services.metrics_server import MetricsServer
+
+    return MetricsServer(args.serve_metrics)
 
 
 def main(argv: list[str] | None = None) -> int:
-    args = build_parser().parse_args(argv)
-    configure_qt_plugin_paths()
-
-    QApplication.setAttribute(QtCore.Qt.AA_EnableHighDpiScaling, True)
-    QApplication.setAttribute(QtCore.Qt.AA_UseHighDpiPixmaps, True)
-
-    app = QApplication(sys.argv)
-    stats_service = SystemStatsService()
-    exporter = CsvMetricsExporter(args.export_csv) if args.export_csv else None
-
-    def create_main_window() -> MainWindow:
-        return MainWindow(
-            stats_service=stats_service,
-            history_seconds=args.history_seconds,
-            poll_interval_ms=args.interval_ms,
-            exporter=exporter,
-            start_maximized=args.start_maximized,
-        )
-
-    if args.no_splash:
-        window = create_main_window()
-        if args.start_maximized:
-            window.showMaximized()
-        else:
-            window.show()
-        return app.exec_()
-
-    splash = SplashScreen(window_factory=create_main_window)
-    splash.show()
-    return app.exec_()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.attach and (args.replay or args.share_ring):
+        parser.error("--attach follows a live collector; it cannot be combined with --replay or --share-ring")
+    if args.fleet is not None and (args.headless or args.replay or args.attach or args.push_to is not None):
+        parser.error("--fleet only shows remote agents; run those with --headless --push-to ADDR")
+    if args.alert or args.alert_rules:
+        # I check the rules up front so a typo is a usage error, not a traceback after the window opens.
+        try:
+            load_alert_rules(args)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+    elif args.alert_notify or args.alert_hook:
+        parser.error("--alert-notify and --alert-hook need rules from --alert or --alert-rules")
+    if args.export_path:
+        # Same for export flags the chosen format can't honour, before any writer or sampler thread starts.
+        try:
+            check_export_options(
+                args.export_format or infer_export_format(args.export_path), export_rotation(args), args.export_append
+            )
+        except ValueError as error:
+            parser.error(str(error))
+    if args.profile_startup:
+        STARTUP_PROFILER.enable()
+        STARTUP_PROFILER.mark("arguments parsed")
+    if args.self_metrics or args.self_metrics_out:
+        SELF_PROFILER.enable()
+    try:
+        # I import the Qt stack only on the GUI path so headless collection never loads PyQt5 or pyqtgraph.
+        if args.headless:
+            from system_monitor.collector import run_collector
+
+            return run_collector(args)
+
+        with STARTUP_PROFILER.stage("import PyQt5"):
+            from system_monitor.gui import run_gui
+
+        return run_gui(args)
+    finally:
+        if args.self_metrics_out:
+            SELF_PROFILER.dump(args.self_metrics_out)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import signal
+import sys
+import threading
+from typing import TextIO
+
+from system_monitor.app import (
+    build_alert_engine,
+    build_exporter,
+    build_fleet_agent,
+    build_history_store,
+    build_metrics_server,
+    build_shared_ring,
+    create_source,
+    source_interval_policy,
+)
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.csv_exporter import CSV_COLUMNS
+from system_monitor.services.history_store import HistoryStore, backfill_history
+from system_monitor.services.history_tiers import TieredHistory
+from system_monitor.services.low_power import IdleBackoff
+from system_monitor.services.sampler import BackgroundSampler, IntervalPolicy, SnapshotSource
+
+# Without a window to protect I let the headless path sample much faster than the GUI's 100ms floor.
+MIN_HEADLESS_INTERVAL_MS = 10
+
+
+class StreamCsvWriter:
+    def __init__(self, stream: TextIO) -> None:
+        self._stream = stream
+        self._writer = csv.writer(stream)
+        self._writer.writerow(CSV_COLUMNS)
+
+    def write(self, snapshot: SystemSnapshot) -> None:
+        self._writer.writerow(snapshot.csv_row())
+        self._stream.flush()
+
+
+class HeadlessCollector:
+    def __init__(
+        self,
+        stats_service: SnapshotSource,
+        interval_ms: int,
+        history_seconds: int,
+        exporter=None,
+        output: TextIO | None = None,
+        low_power: bool = False,
+        interval_policy: IntervalPolicy | None = None,
+        history_store: HistoryStore | None = None,
+    ) -> None:
+        self.interval_ms = max(MIN_HEADLESS_INTERVAL_MS, interval_ms)
+        self.history = TieredHistory.for_window(max(10, history_seconds), self.interval_ms)
+        self.exporter = exporter
+        self.history_store = history_store
+        self._backfill = history_store.recent(max(10, history_seconds)) if history_store else None
+        self.sampler = BackgroundSampler(
+            stats_service,
+            self.interval_ms,
+            max_pending=0,
+            interval_policy=interval_policy or (IdleBackoff(self.interval_ms / 1000.0) if low_power else None),
+        )
+        # A finite source (a replay) ends the run when it runs out, and a failing one ends it with status 1.
+        self.sampler.on_exhausted = self.stop
+        self.sampler.add_listener(self._record)
+        if history_store is not None:
+            self.sampler.add_listener(history_store.write)
+        if exporter is not None:
+            self.sampler.add_listener(exporter.write)
+        elif output is not None:
+            self.sampler.add_listener(StreamCsvWriter(output).write)
+        self._stop_event = threading.Event()
+
+    def _record(self, snapshot: SystemSnapshot) -> None:
+        if self._backfill is not None:
+            backfill_history(self.history, self._backfill, snapshot)
+            self._backfill = None
+        self.history.append(snapshot.elapsed_seconds, snapshot.cpu_percent, snapshot.ram_percent)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self, duration_seconds: float | None = None) -> int:
+        self.sampler.start()
+        try:
+            self._stop_event.wait(duration_seconds)
+        finally:
+            self.sampler.stop()
+            if self.exporter is not None:
+                self.exporter.close()
+            if self.history_store is not None:
+                self.history_store.close()
+        return 1 if self.sampler.error is not None else 0
+
+
+def run_collector(args: argparse.Namespace) -> int:
+    # Attached dashboards draw the per-core heatmap, so a shared ring always carries vectors. The
+    # rolling percentiles ride along as vectors wherever they are read: exports, the ring and /metrics.
+    vectors = args.export_vectors or bool(args.share_ring)
+    quantiles = vectors or bool(args.export_path) or args.serve_metrics is not None
+    stats_service = create_source(args, collect_vectors=vectors, track_quantiles=quantiles)
+    collector = HeadlessCollector(
+        stats_service=stats_service,
+        interval_ms=args.interval_ms,
+        history_seconds=args.history_seconds,
+        exporter=build_exporter(args, stats_service),
+        output=sys.stdout,
+        low_power=args.low_power,
+        interval_policy=source_interval_policy(args, stats_service),
+        history_store=build_history_store(args),
+    )
+    shared_ring = build_shared_ring(args, stats_service, collector.interval_ms / 1000.0)
+    if shared_ring is not None:
+        collector.sampler.add_listener(shared_ring.write)
+    # Alerts go to stderr, since stdout may carry the CSV stream.
+    alert_engine = build_alert_engine(args, sys.stderr)
+    if alert_engine is not None:
+        collector.sampler.add_listener(alert_engine.observe)
+    fleet_agent = build_fleet_agent(args, collector.interval_ms / 1000.0)
+    if fleet_agent is not None:
+        collector.sampler.add_listener(fleet_agent.write)
+
+    def handle_termination(signum, frame) -> None:
+        collector.stop()
+
+    signal.signal(signal.SIGTERM, handle_termination)
+    signal.signal(signal.SIGINT, handle_termination)
+    metrics_server = build_metrics_server(args)
+    if metrics_server is not None:
+        metrics_server.attach(collector.sampler, collector.history)
+        metrics_server.start()
+    try:
+        status = collector.run(args.duration)
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
+        if shared_ring is not None:
+            shared_ring.close()
+        if fleet_agent is not None:
+            fleet_agent.close()
+        if alert_engine is not None:
+            alert_engine.close()
+    if args.timing_report:
+        collector.sampler.scheduler.report(sys.stderr)
+    return status
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 MAIN_UI_FILE = PROJECT_ROOT / "main.ui"
 SPLASH_UI_FILE = PROJECT_ROOT / "splash_screen.ui"
 APP_NAME = "System Monitor"
+UI_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "system-monitor" / "ui"
+SHARED_RING_NAME = "system-monitor"
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+import shutil
+import signal
+import sys
+import tempfile
+from typing import Generator
+
+import PyQt5
+from PyQt5 import QtCore
+from PyQt5.QtWidgets import QApplication, QMainWindow
+
+from system_monitor.app import (
+    build_alert_engine,
+    build_exporter,
+    build_fleet_agent,
+    build_history_store,
+    build_metrics_server,
+    build_shared_ring,
+    create_source,
+    source_interval_policy,
+)
+from system_monitor.constants import APP_NAME
+from system_monitor.startup_profile import STARTUP_PROFILER
+
+
+def configure_qt_plugin_paths() -> None:
+    plugin_root = Path(PyQt5.__file__).resolve().parent / "Qt5" / "plugins"
+    platform_root = plugin_root / "platforms"
+    if not platform_root.exists():
+        return
+
+    effective_plugin_root = plugin_root
+    effective_platform_root = platform_root
+
+    # On macOS, Qt can fail to discover plugins when they're under a hidden path (like `.venv`).
+    # I stage platform plugins into a visible runtime path so the Cocoa plugin can be loaded reliably.
+    if sys.platform == "darwin" and any(part.startswith(".") for part in plugin_root.parts):
+        runtime_root = Path(tempfile.gettempdir()) / "system-monitor-qt-runtime"
+        runtime_plugin_root = runtime_root / "plugins"
+        runtime_platform_root = runtime_plugin_root / "platforms"
+        runtime_platform_root.mkdir(parents=True, exist_ok=True)
+
+        for dylib in platform_root.glob("*.dylib"):
+            shutil.copy2(dylib, runtime_platform_root / dylib.name)
+
+        qt_lib_root = plugin_root.parent / "lib"
+        runtime_lib_link = runtime_root / "lib"
+        if qt_lib_root.exists():
+            if runtime_lib_link.exists() or runtime_lib_link.is_symlink():
+                if runtime_lib_link.is_symlink() and runtime_lib_link.resolve() == qt_lib_root.resolve():
+                    pass
+                elif runtime_lib_link.is_symlink() or runtime_lib_link.is_file():
+                    runtime_lib_link.unlink()
+                else:
+                    shutil.rmtree(runtime_lib_link)
+            if not runtime_lib_link.exists():
+                runtime_lib_link.symlink_to(qt_lib_root, target_is_directory=True)
+
+        effective_plugin_root = runtime_plugin_root
+        effective_platform_root = runtime_platform_root
+
+    if not os.environ.get("QT_PLUGIN_PATH", "").strip():
+        os.environ["QT_PLUGIN_PATH"] = str(effective_plugin_root)
+    if not os.environ.get("QT_QPA_PLATFORM_PLUGIN_PATH", "").strip():
+        os.environ["QT_QPA_PLATFORM_PLUGIN_PATH"] = str(effective_platform_root)
+    QtCore.QCoreApplication.addLibraryPath(str(effective_plugin_root))
+
+
+def install_termination_handler(app: QApplication) -> None:
+    def handle_termination(signum, frame) -> None:
+        app.closeAllWindows()
+        app.quit()
+
+    signal.signal(signal.SIGTERM, handle_termination)
+    signal.signal(signal.SIGINT, handle_termination)
+    # Qt's event loop runs in C++, so I wake the interpreter periodically to let Python deliver signals.
+    wakeup_timer = QtCore.QTimer(app)
+    wakeup_timer.timeout.connect(lambda: None)
+    wakeup_timer.start(250)
+
+
+def run_build(build: Generator[float, None, QMainWindow]) -> QMainWindow:
+    # Runs every step of a staged build at once, for when there is no splash to animate.
+    while True:
+        try:
+            next(build)
+        except StopIteration as finished:
+            return finished.value
+
+
+def run_fleet_view(app: QApplication, args: argparse.Namespace) -> int:
+    from system_monitor.services.fleet import FleetAggregator
+    from system_monitor.ui.fleet_window import FleetWindow
+
+    aggregator = FleetAggregator(args.fleet, history_seconds=args.history_seconds)
+    aggregator.start()
+    try:
+        window = FleetWindow(aggregator, fps=args.fps)
+        if args.start_maximized:
+            window.showMaximized()
+        else:
+            window.show()
+        return app.exec_()
+    finally:
+        aggregator.close()
+
+
+def run_gui(args: argparse.Namespace) -> int:
+    configure_qt_plugin_paths()
+
+    QApplication.setAttribute(QtCore.Qt.AA_EnableHighDpiScaling, True)
+    QApplication.setAttribute(QtCore.Qt.AA_UseHighDpiPixmaps, True)
+
+    with STARTUP_PROFILER.stage("create QApplication"):
+        app = QApplication(sys.argv)
+    install_termination_handler(app)
+    if args.fleet is not None:
+        return run_fleet_view(app, args)
+    with STARTUP_PROFILER.stage("start stats service"):
+        # The dashboard always collects vectors because the per-core heatmap needs them, and tracks
+        # the rolling percentiles for the quick-stats strip.
+        stats_service = create_source(args, collect_vectors=True, track_quantiles=True)
+        exporter = build_exporter(args, stats_service)
+        metrics_server = build_metrics_server(args)
+        history_store = build_history_store(args)
+        alert_engine = build_alert_engine(args)
+
+    # Listeners that publish snapshots elsewhere (a shared ring, a fleet agent) and close on exit.
+    publishers = []
+    windows: list[QMainWindow] = []
+
+    def build_main_window() -> Generator[float, None, QMainWindow]:
+        # Yields the fraction of the build done after each step, so the splash can hand control back
+        # to the event loop in between; pyqtgraph is the heaviest import, so it waits for the splash too.
+        with STARTUP_PROFILER.stage("import dashboard (pyqtgraph)"):
+            from system_monitor.ui.main_window import MainWindow
+        window = MainWindow(
+            stats_service=stats_service,
+            history_seconds=args.history_seconds,
+            poll_interval_ms=args.interval_ms,
+            exporter=exporter,
+            start_maximized=args.start_maximized,
+            fps=args.fps,
+            low_power=args.low_power,
+            interval_policy=source_interval_policy(args, stats_service),
+            history_store=history_store,
+            alert_engine=alert_engine,
+            staged=True,
+        )
+        steps = window.build_steps()
+        yield 1.0 / (len(steps) + 1)
+        for done, (label, step) in enumerate(steps, start=2):
+            with STARTUP_PROFILER.stage(f"MainWindow: {label}"):
+                step()
+            yield done / (len(steps) + 1)
+        if args.replay:
+            window.setWindowTitle(f"{APP_NAME} (replay of {args.replay.name})")
+        elif args.attach:
+            window.setWindowTitle(f"{APP_NAME} (attached to {args.attach})")
+        shared_ring = build_shared_ring(args, stats_service, window.poll_interval_ms / 1000.0)
+        if shared_ring is not None:
+            window.sampler.add_listener(shared_ring.write)
+            publishers.append(shared_ring)
+        fleet_agent = build_fleet_agent(args, window.poll_interval_ms / 1000.0)
+        if fleet_agent is not None:
+            window.sampler.add_listener(fleet_agent.write)
+            publishers.append(fleet_agent)
+        if metrics_server is not None:
+            # Scrapes are answered from the sampler thread's cached payload, never from the GUI thread.
+            metrics_server.attach(window.sampler, window.history)
+            metrics_server.start()
+        windows.append(window)
+        return window
+
+    try:
+        if args.no_splash:
+            window = run_build(build_main_window())
+            if args.start_maximized:
+                window.showMaximized()
+            else:
+                window.show()
+            return app.exec_()
+
+        with STARTUP_PROFILER.stage("construct splash"):
+            from system_monitor.ui.splash_screen import SplashScreen
+
+            splash = SplashScreen(build=build_main_window())
+            splash.show()
+        return app.exec_()
+    finally:
+        # closeEvent already flushed the exporter on a normal exit; this covers a SIGTERM during the splash.
+        if exporter:
+            exporter.close()
+        if history_store:
+            history_store.close()
+        if alert_engine is not None:
+            alert_engine.close()
+        if metrics_server is not None:
+            metrics_server.close()
+        for publisher in publishers:
+            publisher.close()
+        if args.timing_report:
+            for window in windows:
+                window.sampler.scheduler.report(sys.stderr)
+
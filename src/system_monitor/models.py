@@ -1,7 +1,21 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import TYPE_CHECKING, Mapping
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+@dataclass(frozen=True)
+class MetricVector:
+    # One value per label (core, interface, mount), stored as a read-only float32 array.
+    labels: tuple[str, ...]
+    values: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.labels)
 
 
 @dataclass(frozen=True)
@@ -15,6 +29,7 @@ class SystemSnapshot:
     process_count: int
     net_sent_bps: float
     net_recv_bps: float
+    vectors: Mapping[str, MetricVector] = field(default_factory=dict, compare=False, repr=False)
 
     def csv_row(self) -> tuple[str, float, float, float, float, float, int, float, float]:
         return (
@@ -28,3 +43,30 @@ class SystemSnapshot:
             self.net_sent_bps,
             self.net_recv_bps,
         )
+
+
+@dataclass(frozen=True)
+class ProcessInfo:
+    pid: int
+    name: str
+    cpu_percent: float
+    rss_bytes: int
+
+
+@dataclass(frozen=True)
+class ProcessTable:
+    top_cpu: tuple[ProcessInfo, ...]
+    top_rss: tuple[ProcessInfo, ...]
+    process_count: int
+    refreshed_count: int
+    sample_seconds: float
+
+    def rows(self) -> list[ProcessInfo]:
+        # Union of both top lists, CPU leaders first, without duplicating a process present in both.
+        seen: set[int] = set()
+        rows: list[ProcessInfo] = []
+        for info in self.top_cpu + self.top_rss:
+            if info.pid not in seen:
+                seen.add(info.pid)
+                rows.append(info)
+        return rows
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import threading
+import time
+
+try:
+    import psutil
+except ModuleNotFoundError:  # pragma: no cover - handled at runtime on launch
+    psutil = None
+
+from system_monitor.services.scheduler import Histogram
+
+PERCENTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+
+
+def _own_process() -> psutil.Process:
+    if psutil is None:
+        raise RuntimeError("psutil is not installed. I install dependencies with: pip install -r requirements.txt")
+    return psutil.Process(os.getpid())
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    # One stage name can be entered from several threads at once (every exporter's writer thread
+    # times "export encode"), so the start time is thread-local and recording takes a lock.
+    __slots__ = ("histogram", "_local", "_lock")
+
+    def __init__(self) -> None:
+        self.histogram = Histogram()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> None:
+        self._local.started = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self._local.started
+        with self._lock:
+            self.histogram.record(elapsed)
+
+
+class SelfProfiler:
+    # Like STARTUP_PROFILER this is off by default: a disabled `stage()` hands back one shared no-op
+    # context manager, so the hot paths pay a method call and an attribute check.
+    def __init__(self) -> None:
+        self.enabled = False
+        self._stages: dict[str, _Stage] = {}
+        self._lock = threading.Lock()
+        self._process: psutil.Process | None = None
+        self._started_wall = time.monotonic()
+        self._started_cpu = time.process_time()
+        self._last_wall = self._started_wall
+        self._last_cpu = self._started_cpu
+
+    def enable(self) -> None:
+        self._process = _own_process()
+        self.enabled = True
+        self._started_wall = self._last_wall = time.monotonic()
+        self._started_cpu = self._last_cpu = time.process_time()
+
+    def stage(self, name: str) -> _Stage | _NullStage:
+        if not self.enabled:
+            return _NULL_STAGE
+        stage = self._stages.get(name)
+        if stage is None:
+            with self._lock:
+                stage = self._stages.setdefault(name, _Stage())
+        return stage
+
+    def histograms(self) -> dict[str, Histogram]:
+        with self._lock:
+            return {name: stage.histogram for name, stage in self._stages.items()}
+
+    def process_usage(self) -> tuple[float, int]:
+        # CPU percent of one core since the previous call, plus resident memory in bytes.
+        wall, cpu = time.monotonic(), time.process_time()
+        elapsed = wall - self._last_wall
+        percent = (cpu - self._last_cpu) / elapsed * 100.0 if elapsed > 0 else 0.0
+        self._last_wall, self._last_cpu = wall, cpu
+        return percent, self._rss()
+
+    def _rss(self) -> int:
+        if self._process is None:
+            self._process = _own_process()
+        return self._process.memory_info().rss
+
+    def summary(self) -> dict:
+        elapsed = time.monotonic() - self._started_wall
+        stages = {}
+        for name, histogram in sorted(self.histograms().items()):
+            entry = {"count": histogram.count, "mean_ms": histogram.mean * 1e3}
+            for label, fraction in PERCENTILES:
+                entry[f"{label}_ms"] = histogram.percentile(fraction) * 1e3
+            entry["max_ms"] = histogram.maximum * 1e3
+            entry["total_ms"] = histogram.total * 1e3
+            stages[name] = entry
+        return {
+            "duration_seconds": elapsed,
+            "process": {
+                "cpu_percent": (time.process_time() - self._started_cpu) / elapsed * 100.0 if elapsed > 0 else 0.0,
+                "rss_bytes": self._rss(),
+            },
+            "stages": stages,
+        }
+
+    def format_table(self) -> str:
+        lines = [f"{'stage':<18} {'n':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"]
+        for name, entry in self.summary()["stages"].items():
+            lines.append(
+                f"{name:<18} {entry['count']:>7} {entry['p50_ms']:>8.3f} {entry['p95_ms']:>8.3f} "
+                f"{entry['p99_ms']:>8.3f} {entry['max_ms']:>8.3f}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.summary(), indent=2) + "\n", encoding="utf-8")
+
+
+SELF_PROFILER = SelfProfiler()
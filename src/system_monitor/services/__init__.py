@@ -1 +1,23 @@
-__all__ = ["CsvMetricsExporter", "HistoryBuffer", "SystemStatsService"]
+__all__ = [
+    "AlertEngine",
+    "BackgroundSampler",
+    "BinaryMetricsExporter",
+    "CsvMetricsExporter",
+    "DeadlineScheduler",
+    "FleetAgent",
+    "FleetAggregator",
+    "HistoryBuffer",
+    "HistoryStore",
+    "IdleBackoff",
+    "MetricsServer",
+    "ParquetMetricsExporter",
+    "ProcfsStatsService",
+    "ProcessSampler",
+    "QuantileSketch",
+    "QuantileSource",
+    "SharedRingSource",
+    "SharedSnapshotRing",
+    "SystemStatsService",
+    "TieredHistory",
+    "VectorHistory",
+]
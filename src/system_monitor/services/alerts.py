@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+import math
+import operator
+import os
+from pathlib import Path
+import queue
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from typing import Callable, Iterable, TextIO
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.sliced_window import SlicedWindow
+
+METRIC_ALIASES = {
+    "cpu": "cpu_percent",
+    "ram": "ram_percent",
+    "disk": "disk_percent",
+    "processes": "process_count",
+    "net_sent": "net_sent_bps",
+    "net_recv": "net_recv_bps",
+    "uptime": "uptime_seconds",
+}
+METRICS = frozenset(METRIC_ALIASES.values())
+HOOK_TIMEOUT_SECONDS = 30.0
+DISPATCH_QUEUE_SIZE = 256
+
+_COMPARISONS: dict[str, Callable[[float, float], bool]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "min": 60.0, "h": 3600.0}
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)(ms|s|m|min|h)$")
+_SCALES = {"": 1.0, "k": 1e3, "K": 1e3, "M": 1e6, "G": 1e9}
+_RULE = re.compile(
+    r"""^\s*(?:(?P<name>[\w.-]+)\s*:\s*)?
+    (?:(?P<function>[a-z]+[\d.]*)\s*\(\s*(?P<argument>\w+)\s*,\s*(?P<window>[\w.]+)\s*\)|(?P<metric>\w+))
+    \s*(?P<op>>=|<=|>|<)\s*
+    (?P<threshold>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)(?P<scale>[kKMG]?)
+    (?:\s+for\s+(?P<hold>[\w.]+))?\s*$""",
+    re.VERBOSE,
+)
+
+
+def parse_duration(spec: str) -> float:
+    match = _DURATION.match(spec.strip())
+    if match is None:
+        raise ValueError(f"invalid duration {spec!r}; use e.g. 500ms, 60s, 5min or 1h")
+    seconds = float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+    if seconds <= 0:
+        raise ValueError(f"duration {spec!r} must be positive")
+    return seconds
+
+
+class _WindowTally(SlicedWindow):
+    # Running (count, total) tallies over a trailing time window, kept per slice and summed, so
+    # the state is 2 * slices numbers.
+    __slots__ = ("count", "total", "_counts", "_totals")
+
+    def __init__(self, window_seconds: float) -> None:
+        super().__init__(window_seconds)
+        self.count = 0.0
+        self.total = 0.0
+        self._counts = [0.0] * self.slices
+        self._totals = [0.0] * self.slices
+
+    def add(self, timestamp: float, amount: float) -> None:
+        slot = self._slot(timestamp)
+        self._counts[slot] += 1.0
+        self._totals[slot] += amount
+        self.count += 1.0
+        self.total += amount
+
+    def _reset(self) -> None:
+        self._counts = [0.0] * self.slices
+        self._totals = [0.0] * self.slices
+        self.count = self.total = 0.0
+
+    def _expire(self, slot: int) -> None:
+        self.count -= self._counts[slot]
+        self.total -= self._totals[slot]
+        self._counts[slot] = self._totals[slot] = 0.0
+
+
+class _Latest:
+    def __init__(self, comparison: Callable[[float, float], bool], threshold: float) -> None:
+        self.comparison = comparison
+        self.threshold = threshold
+        self.value = math.nan
+
+    def push(self, timestamp: float, value: float) -> bool:
+        self.value = value
+        return self.comparison(value, self.threshold)
+
+
+class _WindowMean(_Latest):
+    def __init__(self, comparison: Callable[[float, float], bool], threshold: float, window_seconds: float) -> None:
+        super().__init__(comparison, threshold)
+        self.window = _WindowTally(window_seconds)
+
+    def push(self, timestamp: float, value: float) -> bool:
+        window = self.window
+        window.add(timestamp, value)
+        self.value = window.total / window.count
+        return self.comparison(self.value, self.threshold)
+
+
+class _WindowQuantile(_Latest):
+    # "p95(x, 5min) > T" holds exactly when fewer than ceil(0.95 n) of the n samples in the window
+    # are <= T, so with a fixed threshold the rule only has to count samples on each side of it.
+    # `value` is the share of samples on the alerting side of the threshold.
+    def __init__(
+        self, comparison: Callable[[float, float], bool], threshold: float, window_seconds: float, fraction: float
+    ) -> None:
+        super().__init__(comparison, threshold)
+        self.fraction = fraction
+        self.window = _WindowTally(window_seconds)
+        # For > and <= the rank is compared with the count of samples <= T, for >= and < with the count < T.
+        self._inclusive = comparison in (operator.gt, operator.le)
+        self._upper = comparison in (operator.gt, operator.ge)
+
+    def push(self, timestamp: float, value: float) -> bool:
+        below = value <= self.threshold if self._inclusive else value < self.threshold
+        window = self.window
+        window.add(timestamp, 1.0 if below else 0.0)
+        rank = max(1.0, math.ceil(self.fraction * window.count - 1e-9))
+        below_count = window.total
+        self.value = (window.count - below_count if self._upper else below_count) / window.count
+        return below_count < rank if self._upper else below_count >= rank
+
+
+class _Ewma(_Latest):
+    # Time-aware exponential smoothing: a sample after dt seconds moves the average by
+    # 1 - exp(-dt / tau), so irregular intervals (low-power mode, replays) weigh correctly.
+    def __init__(self, comparison: Callable[[float, float], bool], threshold: float, tau_seconds: float) -> None:
+        super().__init__(comparison, threshold)
+        self.tau_seconds = tau_seconds
+        self._last_time: float | None = None
+
+    def _smooth(self, timestamp: float, sample: float) -> None:
+        if self._last_time is None:
+            self.value = sample
+        elif timestamp > self._last_time:
+            alpha = 1.0 - math.exp(-(timestamp - self._last_time) / self.tau_seconds)
+            self.value += alpha * (sample - self.value)
+
+    def push(self, timestamp: float, value: float) -> bool:
+        self._smooth(timestamp, value)
+        self._last_time = timestamp
+        return self.comparison(self.value, self.threshold)
+
+
+class _EwmaSlope(_Ewma):
+    # The smoothed rate of change in metric units per second.
+    def __init__(self, comparison: Callable[[float, float], bool], threshold: float, tau_seconds: float) -> None:
+        super().__init__(comparison, threshold, tau_seconds)
+        self.value = 0.0
+        self._last_value = math.nan
+
+    def push(self, timestamp: float, value: float) -> bool:
+        last_time = self._last_time
+        if last_time is not None and timestamp > last_time:
+            self._smooth(timestamp, (value - self._last_value) / (timestamp - last_time))
+        # A clock that went back (a new replay) restarts the differences from here.
+        if last_time is None or timestamp != last_time:
+            self._last_time = timestamp
+            self._last_value = value
+        return last_time is not None and self.comparison(self.value, self.threshold)
+
+
+@dataclass(frozen=True)
+class AlertEvent:
+    rule: str
+    firing: bool
+    value: float
+    captured_at: datetime
+    message: str
+
+
+class AlertRule:
+    # One parsed rule, e.g. "cpu > 90 for 60s", "slope(ram, 30s) > 0.5" or
+    # "p95(net_recv, 5min) > 10M". It fires once its condition has held for `hold_seconds`
+    # (immediately without "for") and resolves on the first sample where it no longer holds;
+    # `observe` returns an event only on those transitions.
+    def __init__(self, name: str, metric: str, statistic: _Latest, hold_seconds: float, expression: str) -> None:
+        self.name = name
+        self.metric = metric
+        self.statistic = statistic
+        self.hold_seconds = hold_seconds
+        self.expression = expression
+        self.firing = False
+        self._since: float | None = None
+
+    def observe(self, timestamp: float, snapshot: SystemSnapshot) -> AlertEvent | None:
+        if self.statistic.push(timestamp, float(getattr(snapshot, self.metric))):
+            if self._since is None or timestamp < self._since:
+                self._since = timestamp
+            if not self.firing and timestamp - self._since >= self.hold_seconds:
+                self.firing = True
+                return self._event(snapshot)
+            return None
+        self._since = None
+        if self.firing:
+            self.firing = False
+            return self._event(snapshot)
+        return None
+
+    def _event(self, snapshot: SystemSnapshot) -> AlertEvent:
+        value = self.statistic.value
+        if isinstance(self.statistic, _WindowQuantile):
+            detail = f"{value:.1%} of the window on that side"
+        else:
+            detail = f"now {value:.4g}"
+        state = "firing" if self.firing else "resolved"
+        message = f"{self.expression} {state} ({detail})"
+        return AlertEvent(self.name, self.firing, value, snapshot.captured_at, message)
+
+
+def _metric(name: str) -> str:
+    metric = METRIC_ALIASES.get(name, name)
+    if metric not in METRICS:
+        raise ValueError(f"unknown metric {name!r}; use one of {', '.join(sorted(METRIC_ALIASES))} or {', '.join(sorted(METRICS))}")
+    return metric
+
+
+def parse_rule(spec: str) -> AlertRule:
+    match = _RULE.match(spec)
+    if match is None:
+        raise ValueError(
+            f"invalid alert rule {spec!r}; use e.g. 'cpu > 90 for 60s', 'slope(ram, 30s) > 0.5' or 'p95(net_recv, 5min) > 10M'"
+        )
+    comparison = _COMPARISONS[match["op"]]
+    threshold = float(match["threshold"]) * _SCALES[match["scale"]]
+    hold_seconds = parse_duration(match["hold"]) if match["hold"] else 0.0
+    function = match["function"]
+    if function is None:
+        metric = _metric(match["metric"])
+        statistic: _Latest = _Latest(comparison, threshold)
+    else:
+        metric = _metric(match["argument"])
+        window = parse_duration(match["window"])
+        if function in ("avg", "mean"):
+            statistic = _WindowMean(comparison, threshold, window)
+        elif function == "ewma":
+            statistic = _Ewma(comparison, threshold, window)
+        elif function == "slope":
+            statistic = _EwmaSlope(comparison, threshold, window)
+        elif re.fullmatch(r"p\d+(\.\d+)?", function) and 0 < float(function[1:]) < 100:
+            statistic = _WindowQuantile(comparison, threshold, window, float(function[1:]) / 100.0)
+        else:
+            raise ValueError(f"unknown function {function!r} in {spec!r}; use avg, ewma, slope or p50..p99.9")
+    expression = spec.strip()
+    if match["name"]:
+        expression = expression.split(":", 1)[1].strip()
+    return AlertRule(match["name"] or expression, metric, statistic, hold_seconds, expression)
+
+
+def read_rule_file(path: Path) -> list[AlertRule]:
+    # One rule per line; blank lines and # comments are skipped.
+    rules = []
+    for number, line in enumerate(Path(path).read_text(encoding="utf-8").splitlines(), start=1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        try:
+            rules.append(parse_rule(line))
+        except ValueError as error:
+            raise ValueError(f"{path}:{number}: {error}") from None
+    return rules
+
+
+AlertSink = Callable[[AlertEvent], None]
+
+
+class StreamAlertLog:
+    def __init__(self, stream: TextIO) -> None:
+        self._stream = stream
+
+    def __call__(self, event: AlertEvent) -> None:
+        state = "ALERT" if event.firing else "RESOLVED"
+        self._stream.write(f"{event.captured_at:%Y-%m-%d %H:%M:%S} {state} {event.rule}: {event.message}\n")
+        self._stream.flush()
+
+
+def _notification_command(title: str, body: str) -> list[str] | None:
+    if sys.platform == "darwin":
+        script = f"display notification {_applescript_string(body)} with title {_applescript_string(title)}"
+        return ["osascript", "-e", script]
+    if shutil.which("notify-send"):
+        return ["notify-send", "--app-name=System Monitor", title, body]
+    return None
+
+
+def _applescript_string(text: str) -> str:
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class DesktopNotifier:
+    # `--alert-notify`: notify-send on Linux/BSD desktops, osascript on macOS.
+    def __init__(self) -> None:
+        if _notification_command("", "") is None:
+            raise RuntimeError("notify-send is not installed. I install it with: sudo apt install libnotify-bin")
+
+    def __call__(self, event: AlertEvent) -> None:
+        title = f"{'Alert' if event.firing else 'Resolved'}: {event.rule}"
+        subprocess.run(_notification_command(title, event.message), check=False, timeout=HOOK_TIMEOUT_SECONDS)
+
+
+class HookCommand:
+    # `--alert-hook CMD`: runs CMD through the shell for every transition with the event in
+    # ALERT_RULE, ALERT_STATE (firing/resolved), ALERT_VALUE, ALERT_MESSAGE and ALERT_TIME.
+    def __init__(self, command: str) -> None:
+        self.command = command
+
+    def __call__(self, event: AlertEvent) -> None:
+        environment = dict(
+            os.environ,
+            ALERT_RULE=event.rule,
+            ALERT_STATE="firing" if event.firing else "resolved",
+            ALERT_VALUE=repr(event.value),
+            ALERT_MESSAGE=event.message,
+            ALERT_TIME=event.captured_at.isoformat(),
+        )
+        try:
+            subprocess.run(self.command, shell=True, env=environment, check=False, timeout=HOOK_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            print(f"alert hook timed out after {HOOK_TIMEOUT_SECONDS:.0f}s: {self.command}", file=sys.stderr)
+
+
+class AlertEngine:
+    # A sampler listener that runs every rule on every snapshot. Rules keep O(1) state per sample
+    # (running tallies over sliced windows, EWMAs, hold timers), so 1,000 rules cost the same at a
+    # 1h window as at 10s. Transitions go to the sinks on a dispatcher thread, so a slow hook or
+    # notification never holds up sampling. `firing` is swapped as a whole tuple and `version`
+    # bumps on every transition, so the GUI can poll both without locking.
+    def __init__(self, rules: Iterable[AlertRule], sinks: Iterable[AlertSink] = ()) -> None:
+        self.rules = list(rules)
+        names = [rule.name for rule in self.rules]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"duplicate alert rule names: {', '.join(duplicates)}")
+        self.sinks = list(sinks)
+        self.firing: tuple[AlertEvent, ...] = ()
+        self.version = 0
+        self.dropped = 0
+        self._queue: queue.Queue[AlertEvent | None] = queue.Queue(DISPATCH_QUEUE_SIZE)
+        self._thread: threading.Thread | None = None
+        if self.sinks:
+            self._thread = threading.Thread(target=self._dispatch, name="system-monitor-alerts", daemon=True)
+            self._thread.start()
+
+    def observe(self, snapshot: SystemSnapshot) -> list[AlertEvent]:
+        timestamp = snapshot.elapsed_seconds
+        events = [event for rule in self.rules if (event := rule.observe(timestamp, snapshot)) is not None]
+        if events:
+            self._publish(events)
+        return events
+
+    def _publish(self, events: list[AlertEvent]) -> None:
+        firing = {event.rule: event for event in self.firing}
+        for event in events:
+            if event.firing:
+                firing[event.rule] = event
+            else:
+                firing.pop(event.rule, None)
+        self.firing = tuple(firing.values())
+        self.version += 1
+        if self._thread is None:
+            return
+        for event in events:
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                self.dropped += 1
+
+    def _dispatch(self) -> None:
+        while (event := self._queue.get()) is not None:
+            for sink in self.sinks:
+                try:
+                    sink(event)
+                except Exception as error:  # noqa: BLE001 - one broken sink must not stop the others
+                    print(f"alert sink failed: {error}", file=sys.stderr)
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(HOOK_TIMEOUT_SECONDS)
+            self._thread = None
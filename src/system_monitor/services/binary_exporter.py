@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import struct
+
+import numpy as np
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.buffered_exporter import BufferedExporter, FlushPolicy
+from system_monitor.services.metric_vectors import VectorLayout, aligned_values
+from system_monitor.services.rotating_sink import RotatingFileSink, RotationPolicy
+
+BINARY_MAGIC = b"SMBIN\x00\x01\x00"
+HEADER_ALIGNMENT = 64
+RECORD_DTYPE = np.dtype(
+    [
+        ("captured_at_ns", "<i8"),
+        ("elapsed_seconds", "<f8"),
+        ("uptime_seconds", "<f8"),
+        ("cpu_percent", "<f4"),
+        ("ram_percent", "<f4"),
+        ("disk_percent", "<f4"),
+        ("process_count", "<u4"),
+        ("net_sent_bps", "<f8"),
+        ("net_recv_bps", "<f8"),
+    ]
+)
+_RECORD = struct.Struct("<qddfffIdd")
+assert _RECORD.size == RECORD_DTYPE.itemsize
+
+
+def captured_at_ns(snapshot: SystemSnapshot) -> int:
+    return round(snapshot.captured_at.timestamp() * 1_000_000) * 1_000
+
+
+def encode_record(snapshot: SystemSnapshot) -> bytes:
+    return _RECORD.pack(
+        captured_at_ns(snapshot),
+        snapshot.elapsed_seconds,
+        snapshot.uptime_seconds,
+        snapshot.cpu_percent,
+        snapshot.ram_percent,
+        snapshot.disk_percent,
+        snapshot.process_count,
+        snapshot.net_sent_bps,
+        snapshot.net_recv_bps,
+    )
+
+
+def encode_record_with_vectors(snapshot: SystemSnapshot, vector_layout: VectorLayout | None = None) -> bytes:
+    # One `record_dtype(vector_layout)` record: the scalar record, then each vector in layout order.
+    record = encode_record(snapshot)
+    if not vector_layout:
+        return record
+    vectors = [
+        aligned_values(snapshot, name, labels).astype("<f4", copy=False).tobytes() for name, labels in vector_layout.items()
+    ]
+    return record + b"".join(vectors)
+
+
+def record_dtype(vector_layout: VectorLayout | None = None) -> np.dtype:
+    # Vector metrics become fixed-width float32 sub-array fields after the scalar record, so
+    # records stay fixed-size and the file still memory-maps as one structured array.
+    if not vector_layout:
+        return RECORD_DTYPE
+    fields = [(name, RECORD_DTYPE[name].str) for name in RECORD_DTYPE.names]
+    fields.extend((name, "<f4", (len(labels),)) for name, labels in vector_layout.items())
+    return np.dtype(fields)
+
+
+def _field_schema(dtype: np.dtype, name: str) -> list:
+    field = dtype[name]
+    if field.shape:
+        return [name, field.base.str, list(field.shape)]
+    return [name, field.str]
+
+
+def encode_header(dtype: np.dtype = RECORD_DTYPE, vector_layout: VectorLayout | None = None) -> bytes:
+    # Layout: magic (8 bytes), little-endian uint32 schema length, JSON schema, then space padding so
+    # the first record starts on a 64-byte boundary and the file maps straight onto a NumPy array.
+    schema_fields = {
+        "version": 1,
+        "record_size": dtype.itemsize,
+        "fields": [_field_schema(dtype, name) for name in dtype.names],
+    }
+    if vector_layout:
+        schema_fields["labels"] = {name: list(labels) for name, labels in vector_layout.items()}
+    schema = json.dumps(schema_fields, separators=(",", ":")).encode("utf-8")
+    prefix_size = len(BINARY_MAGIC) + 4 + len(schema)
+    padding = -prefix_size % HEADER_ALIGNMENT
+    return BINARY_MAGIC + struct.pack("<I", len(schema) + padding) + schema + b" " * padding
+
+
+def _read_schema(path: Path) -> tuple[dict, int]:
+    with Path(path).open("rb") as handle:
+        magic = handle.read(len(BINARY_MAGIC))
+        if magic != BINARY_MAGIC:
+            raise ValueError(f"{path} is not a system-monitor binary metrics file")
+        (schema_size,) = struct.unpack("<I", handle.read(4))
+        schema = json.loads(handle.read(schema_size).decode("utf-8"))
+    return schema, len(BINARY_MAGIC) + 4 + schema_size
+
+
+def decode_header(data: bytes | memoryview) -> tuple[np.dtype, dict[str, tuple[str, ...]], int]:
+    # The in-memory form of read_header/read_vector_labels, for headers that do not live in a file.
+    if bytes(data[: len(BINARY_MAGIC)]) != BINARY_MAGIC:
+        raise ValueError("not a system-monitor binary metrics header")
+    (schema_size,) = struct.unpack_from("<I", data, len(BINARY_MAGIC))
+    start = len(BINARY_MAGIC) + 4
+    schema = json.loads(bytes(data[start : start + schema_size]).decode("utf-8"))
+    return _schema_dtype(schema), _schema_labels(schema), start + schema_size
+
+
+def _schema_dtype(schema: dict) -> np.dtype:
+    return np.dtype([(field[0], field[1], tuple(field[2])) if len(field) > 2 else tuple(field) for field in schema["fields"]])
+
+
+def _schema_labels(schema: dict) -> dict[str, tuple[str, ...]]:
+    return {name: tuple(labels) for name, labels in schema.get("labels", {}).items()}
+
+
+def read_header(path: Path) -> tuple[np.dtype, int]:
+    schema, offset = _read_schema(path)
+    return _schema_dtype(schema), offset
+
+
+def read_vector_labels(path: Path) -> dict[str, tuple[str, ...]]:
+    schema, _ = _read_schema(path)
+    return _schema_labels(schema)
+
+
+def load_binary_metrics(path: Path) -> np.ndarray:
+    # Zero-copy: the returned structured array is a read-only memory map over the record section.
+    path = Path(path)
+    dtype, offset = read_header(path)
+    count = (path.stat().st_size - offset) // dtype.itemsize
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+
+
+class BinaryMetricsExporter(BufferedExporter):
+    def __init__(
+        self,
+        output_path: Path,
+        flush_policy: FlushPolicy | None = None,
+        rotation: RotationPolicy | None = None,
+        append: bool = False,
+        vector_layout: VectorLayout | None = None,
+    ) -> None:
+        self.output_path = output_path
+        self.vector_layout = dict(vector_layout or {})
+        header = encode_header(record_dtype(self.vector_layout), self.vector_layout)
+        sink = RotatingFileSink(output_path, header=header, policy=rotation, append=append)
+        super().__init__(sink, policy=flush_policy)
+
+    def _encode(self, snapshot: SystemSnapshot) -> bytes:
+        return encode_record_with_vectors(snapshot, self.vector_layout)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+import queue
+import re
+import sys
+import threading
+import time
+from typing import BinaryIO
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.self_metrics import SELF_PROFILER
+
+DEFAULT_MAX_BUFFER_BYTES = 1024 * 1024
+DEFAULT_QUEUE_SIZE = 1024
+
+_SIZE_UNITS = {"b": 1, "kb": 1024, "kib": 1024, "mb": 1024**2, "mib": 1024**2, "gb": 1024**3, "gib": 1024**3}
+_TIME_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "min": 60.0}
+_ROW_UNITS = {"row", "rows", "r"}
+_SPEC_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]+)\s*$")
+
+
+@dataclass(frozen=True)
+class FlushPolicy:
+    max_rows: int | None = None
+    max_bytes: int | None = DEFAULT_MAX_BUFFER_BYTES
+    max_seconds: float | None = None
+
+    def should_flush(self, rows: int, size: int, seconds_since_flush: float) -> bool:
+        if rows == 0:
+            return False
+        if self.max_rows is not None and rows >= self.max_rows:
+            return True
+        if self.max_bytes is not None and size >= self.max_bytes:
+            return True
+        return self.max_seconds is not None and seconds_since_flush >= self.max_seconds
+
+
+DEFAULT_FLUSH_POLICY = FlushPolicy(max_seconds=1.0)
+
+
+def parse_size(spec: str) -> int:
+    match = _SPEC_PATTERN.match(spec)
+    if match is None or match.group(2).lower() not in _SIZE_UNITS:
+        raise ValueError(f"invalid size {spec!r}; use e.g. 64KB or 100MB")
+    size = int(float(match.group(1)) * _SIZE_UNITS[match.group(2).lower()])
+    if size <= 0:
+        raise ValueError("size must be positive")
+    return size
+
+
+def parse_flush_policy(spec: str) -> FlushPolicy:
+    # I accept one threshold per flag, e.g. "5s", "250ms", "100rows" or "64KB".
+    match = _SPEC_PATTERN.match(spec)
+    if match is None:
+        raise ValueError(f"invalid flush policy {spec!r}; use e.g. 5s, 250ms, 100rows or 64KB")
+    amount = float(match.group(1))
+    unit = match.group(2).lower()
+    if amount <= 0:
+        raise ValueError("flush policy threshold must be positive")
+    if unit in _TIME_UNITS:
+        return FlushPolicy(max_seconds=amount * _TIME_UNITS[unit])
+    if unit in _SIZE_UNITS:
+        return FlushPolicy(max_bytes=parse_size(spec))
+    if unit in _ROW_UNITS:
+        return FlushPolicy(max_rows=int(amount))
+    raise ValueError(f"unknown flush policy unit {unit!r}")
+
+
+_CLOSE = object()
+
+
+class BufferedExporter(ABC):
+    # Subclasses only turn snapshots into bytes. I run the actual I/O on a writer thread fed by a
+    # bounded queue, batch rows in memory, and flush according to the FlushPolicy, so neither the
+    # sampler nor the GUI ever waits on a syscall per row. `close` always drains and flushes.
+    # When the writer falls behind and the queue is full, rows are dropped and counted in `dropped`
+    # rather than stalling the sampler; `block_when_full` makes `write` wait instead, for runs
+    # whose only job is the export (an as-fast-as-possible replay).
+    def __init__(
+        self,
+        sink: BinaryIO,
+        policy: FlushPolicy | None = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        self.policy = policy or DEFAULT_FLUSH_POLICY
+        self._sink = sink
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._buffer = bytearray()
+        self._rows = 0
+        self._last_flush = time.monotonic()
+        self._error: BaseException | None = None
+        self._closed = False
+        self.block_when_full = False
+        self.dropped = 0
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"{type(self).__name__}-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, snapshot: SystemSnapshot) -> None:
+        if self._error is not None:
+            raise RuntimeError("metrics export failed") from self._error
+        if self._closed:
+            return
+        if self.block_when_full:
+            self._queue.put(snapshot)
+            return
+        try:
+            self._queue.put_nowait(snapshot)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_CLOSE)
+        self._thread.join()
+        if self.dropped:
+            print(f"{type(self).__name__} dropped {self.dropped} rows while the writer was behind", file=sys.stderr)
+        if self._error is not None:
+            raise RuntimeError("metrics export failed") from self._error
+
+    @abstractmethod
+    def _encode(self, snapshot: SystemSnapshot) -> bytes: ...
+
+    def _buffer_snapshot(self, snapshot: SystemSnapshot) -> None:
+        self._buffer += self._encode(snapshot)
+        self._rows += 1
+
+    def _buffered_bytes(self) -> int:
+        return len(self._buffer)
+
+    def _write_buffer(self) -> None:
+        self._sink.write(self._buffer)
+        self._sink.flush()
+
+    def _flush(self) -> None:
+        if self._rows or self._buffer:
+            self._write_buffer()
+            self._buffer.clear()
+            self._rows = 0
+        self._last_flush = time.monotonic()
+
+    def _close_sink(self) -> None:
+        self._sink.close()
+
+    def _next_timeout(self) -> float | None:
+        if self.policy.max_seconds is None or self._rows == 0:
+            return None
+        return max(0.0, self._last_flush + self.policy.max_seconds - time.monotonic())
+
+    def _run(self) -> None:
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self._next_timeout())
+                except queue.Empty:
+                    item = None
+                if item is _CLOSE:
+                    break
+                if item is not None:
+                    with SELF_PROFILER.stage("export encode"):
+                        self._buffer_snapshot(item)
+                if self.policy.should_flush(self._rows, self._buffered_bytes(), time.monotonic() - self._last_flush):
+                    with SELF_PROFILER.stage("export flush"):
+                        self._flush()
+            with SELF_PROFILER.stage("export flush"):
+                self._flush()
+        except BaseException as error:  # noqa: BLE001 - surfaced to the caller on write/close
+            self._error = error
+        finally:
+            # Closing can fail in a compressor as well as in the OS (a rotated segment's gzip/zstd
+            # error comes back through its future), and either is kept for `close` to raise.
+            try:
+                self._close_sink()
+            except Exception as error:  # noqa: BLE001 - surfaced to the caller on close
+                self._error = self._error or error
@@ -1,34 +1,54 @@
 from __future__ import annotations
 
 import csv
+import io
 from pathlib import Path
 
 from system_monitor.models import SystemSnapshot
+from system_monitor.services.buffered_exporter import BufferedExporter, FlushPolicy
+from system_monitor.services.metric_vectors import VectorLayout, aligned_values, layout_columns
+from system_monitor.services.rotating_sink import RotatingFileSink, RotationPolicy
 
+CSV_COLUMNS = [
+    "captured_at",
+    "elapsed_seconds",
+    "uptime_seconds",
+    "cpu_percent",
+    "ram_percent",
+    "disk_percent",
+    "process_count",
+    "net_sent_bps",
+    "net_recv_bps",
+]
 
-class CsvMetricsExporter:
-    def __init__(self, output_path: Path) -> None:
+
+class CsvMetricsExporter(BufferedExporter):
+    def __init__(
+        self,
+        output_path: Path,
+        flush_policy: FlushPolicy | None = None,
+        rotation: RotationPolicy | None = None,
+        append: bool = False,
+        vector_layout: VectorLayout | None = None,
+    ) -> None:
         self.output_path = output_path
-        self.output_path.parent.mkdir(parents=True, exist_ok=True)
-        self._handle = self.output_path.open("w", newline="", encoding="utf-8")
-        self._writer = csv.writer(self._handle)
-        self._writer.writerow(
-            [
-                "captured_at",
-                "elapsed_seconds",
-                "uptime_seconds",
-                "cpu_percent",
-                "ram_percent",
-                "disk_percent",
-                "process_count",
-                "net_sent_bps",
-                "net_recv_bps",
-            ]
-        )
+        # Vector metrics get one column per label, e.g. "cpu_core_percent[cpu3]", fixed when the file opens.
+        self.vector_layout = dict(vector_layout or {})
+        self._text = io.StringIO()
+        self._writer = csv.writer(self._text)
+        header = self._format_row(CSV_COLUMNS + layout_columns(self.vector_layout))
+        sink = RotatingFileSink(output_path, header=header, policy=rotation, append=append)
+        super().__init__(sink, policy=flush_policy)
 
-    def write(self, snapshot: SystemSnapshot) -> None:
-        self._writer.writerow(snapshot.csv_row())
-        self._handle.flush()
+    def _format_row(self, row) -> bytes:
+        self._text.seek(0)
+        self._text.truncate()
+        self._writer.writerow(row)
+        return self._text.getvalue().encode("utf-8")
 
-    def close(self) -> None:
-        self._handle.close()
+    def _encode(self, snapshot: SystemSnapshot) -> bytes:
+        row = snapshot.csv_row()
+        for name, labels in self.vector_layout.items():
+            # str() of float32 values is their shortest round-trip form, so 3.9 does not become 3.9000001.
+            row += tuple(aligned_values(snapshot, name, labels).astype(str))
+        return self._format_row(row)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import numpy as np
+
+from system_monitor.services.history_tiers import SeriesView
+
+# M4 keeps at most four points per pixel column, so I only decimate once a series has more than that.
+POINTS_PER_PIXEL = 4
+
+
+def m4_decimate(x: np.ndarray, y: np.ndarray, pixels: int) -> tuple[np.ndarray, np.ndarray]:
+    # For every pixel column I keep the first, last, min and max sample in index order. The
+    # rasterized line is then identical to the full series, spikes included, at O(n) NumPy cost.
+    count = len(x)
+    pixels = max(int(pixels), 1)
+    if count <= POINTS_PER_PIXEL * pixels:
+        return x, y
+
+    x_first = float(x[0])
+    x_span = float(x[-1]) - x_first
+    if x_span <= 0.0:
+        columns = np.zeros(count, dtype=np.intp)
+    else:
+        columns = ((x - x_first) * (pixels / x_span)).astype(np.intp)
+        np.minimum(columns, pixels - 1, out=columns)
+
+    starts = np.flatnonzero(np.r_[True, columns[1:] != columns[:-1]])
+    ends = np.r_[starts[1:], count] - 1
+    lengths = ends - starts + 1
+    segment = np.repeat(np.arange(len(starts)), lengths)
+
+    mins = np.minimum.reduceat(y, starts)
+    maxs = np.maximum.reduceat(y, starts)
+    argmins = _first_match(y == mins[segment], segment)
+    argmaxs = _first_match(y == maxs[segment], segment)
+
+    keep = np.unique(np.concatenate((starts, argmins, argmaxs, ends)))
+    return x[keep], y[keep]
+
+
+def _first_match(mask: np.ndarray, segment: np.ndarray) -> np.ndarray:
+    # Index of the first True per segment; segments whose extreme is NaN simply contribute nothing.
+    hits = np.flatnonzero(mask)
+    hit_segments = segment[hits]
+    return hits[np.r_[True, hit_segments[1:] != hit_segments[:-1]]]
+
+
+def decimate_view(view: SeriesView, pixels: int) -> tuple[np.ndarray, np.ndarray]:
+    if view.is_raw:
+        return m4_decimate(view.time, view.mean, pixels)
+
+    # Rollup buckets already carry their extremes, so I draw each bucket as a min->max stroke
+    # instead of its mean; a one-second spike then survives a week-long window.
+    x = np.repeat(view.time, 2)
+    y = np.empty(len(x), dtype=view.minimum.dtype)
+    y[0::2] = view.minimum
+    y[1::2] = view.maximum
+    return m4_decimate(x, y, pixels)
+
+
+def max_pool_rows(matrix: np.ndarray, rows: int) -> np.ndarray:
+    # Heatmap counterpart of M4: collapse consecutive samples into at most `rows` rows, keeping
+    # each column's peak so a one-sample spike on a single core still shows up. NaN gaps are ignored.
+    rows = max(int(rows), 1)
+    count = len(matrix)
+    if count <= rows:
+        return matrix
+    factor = -(-count // rows)
+    # Blocks are aligned to the newest sample; the oldest partial block is dropped.
+    head = count % factor
+    blocks = matrix[head:].reshape(-1, factor, matrix.shape[1])
+    return np.fmax.reduce(blocks, axis=1)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from system_monitor.services.buffered_exporter import BufferedExporter, FlushPolicy
+from system_monitor.services.metric_vectors import VectorLayout
+from system_monitor.services.rotating_sink import RotationPolicy
+
+EXPORT_FORMATS = ("csv", "bin", "parquet")
+_SUFFIX_FORMATS = {".csv": "csv", ".bin": "bin", ".smbin": "bin", ".parquet": "parquet", ".pq": "parquet"}
+
+
+def infer_export_format(output_path: Path) -> str:
+    return _SUFFIX_FORMATS.get(output_path.suffix.lower(), "csv")
+
+
+def check_export_options(export_format: str, rotation: RotationPolicy | None = None, append: bool = False) -> None:
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"unknown export format {export_format!r}; choose from {', '.join(EXPORT_FORMATS)}")
+    # A Parquet footer is only written on close, so segments can't be appended to or cut mid-file.
+    if export_format == "parquet" and (append or (rotation is not None and rotation.rotates)):
+        raise ValueError("parquet export does not support --export-append or rotation; use csv or bin")
+
+
+def create_exporter(
+    output_path: Path,
+    export_format: str | None = None,
+    flush_policy: FlushPolicy | None = None,
+    rotation: RotationPolicy | None = None,
+    append: bool = False,
+    vector_layout: VectorLayout | None = None,
+) -> BufferedExporter:
+    export_format = export_format or infer_export_format(output_path)
+    check_export_options(export_format, rotation, append)
+    if export_format == "csv":
+        from system_monitor.services.csv_exporter import CsvMetricsExporter
+
+        return CsvMetricsExporter(
+            output_path, flush_policy=flush_policy, rotation=rotation, append=append, vector_layout=vector_layout
+        )
+    if export_format == "bin":
+        from system_monitor.services.binary_exporter import BinaryMetricsExporter
+
+        return BinaryMetricsExporter(
+            output_path, flush_policy=flush_policy, rotation=rotation, append=append, vector_layout=vector_layout
+        )
+    if export_format == "parquet":
+        from system_monitor.services.parquet_exporter import ParquetMetricsExporter
+
+        return ParquetMetricsExporter(output_path, flush_policy=flush_policy, vector_layout=vector_layout)
+    raise ValueError(f"unknown export format {export_format!r}; choose from {', '.join(EXPORT_FORMATS)}")
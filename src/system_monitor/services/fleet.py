@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import socket
+import stat
+import threading
+import time
+
+import numpy as np
+
+from system_monitor.services.fleet_protocol import (
+    FRAME_HEADER,
+    HELLO,
+    RECORDS,
+    ProtocolError,
+    decode_hello,
+    decode_records,
+    frame_length,
+)
+from system_monitor.services.history_buffer import HistoryBuffer
+from system_monitor.services.quantile_sketch import PERCENT_RANGE, QuantileSketch, WindowedSketch
+
+# Hundreds of agents may (re)connect at once when the aggregator restarts.
+LISTEN_BACKLOG = 1024
+MAX_HOST_POINTS = 3600
+# A connected host that has not sent anything for this many of its intervals is shown as stale.
+STALE_INTERVALS = 3.0
+# Per-host CPU sketches are coarser than the dashboard's (2%, 10 slices, about 20KB a host) because
+# there are hundreds of them; they only feed the fleet-wide percentiles.
+FLEET_SKETCH_ACCURACY = 0.02
+FLEET_SKETCH_SLICES = 10
+
+
+class FleetHost:
+    # One agent's stream. `history` holds (time, cpu, ram) rows with time in epoch seconds and is
+    # sized from the agent's own interval. The aggregator thread appends and the GUI copies windows
+    # out, both under `lock`, because `HistoryBuffer` views are only valid until the next append.
+    # `cpu_window` sketches the host's CPU over the same window for the fleet-wide percentiles.
+    def __init__(self, name: str, interval_seconds: float, history_seconds: float) -> None:
+        self.name = name
+        self.interval_seconds = interval_seconds
+        points = min(MAX_HOST_POINTS, max(2, math.ceil(history_seconds / interval_seconds)))
+        self.history = HistoryBuffer(points)
+        self.cpu_window = WindowedSketch(
+            history_seconds, *PERCENT_RANGE, relative_accuracy=FLEET_SKETCH_ACCURACY, slices=FLEET_SKETCH_SLICES
+        )
+        self.lock = threading.Lock()
+        self.latest: np.void | None = None
+        self.peer = ""
+        self.connected = True
+        self.records = 0
+        self.last_seen = time.monotonic()
+
+    @property
+    def span_seconds(self) -> float:
+        return self.history.capacity * self.interval_seconds
+
+    def append(self, records: np.ndarray) -> None:
+        rows = np.column_stack((records["captured_at_ns"] / 1e9, records["cpu_percent"], records["ram_percent"]))
+        with self.lock:
+            self.history.extend(rows)
+            self.cpu_window.extend(rows[:, 0], rows[:, 1])
+            self.latest = records[-1].copy()
+            self.records += len(records)
+            self.last_seen = time.monotonic()
+
+    def series(self) -> np.ndarray:
+        # An (n x 3) copy of the (time, cpu, ram) history.
+        with self.lock:
+            return np.column_stack([self.history.column(name) for name in self.history.columns])
+
+    def stale(self, now: float | None = None) -> bool:
+        if not self.connected:
+            return True
+        elapsed = (time.monotonic() if now is None else now) - self.last_seen
+        return elapsed > STALE_INTERVALS * self.interval_seconds
+
+
+def _remove_stale_socket(path: str) -> None:
+    # A socket file left by an aggregator that crashed refuses connections; a live one answers.
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            raise RuntimeError(f"{path} exists and is not a socket")
+    except FileNotFoundError:
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"another fleet aggregator is listening on {path}")
+
+
+def _listen(address: str | tuple[str, int]) -> socket.socket:
+    if isinstance(address, str):
+        _remove_stale_socket(address)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(address)
+        listener.listen(LISTEN_BACKLOG)
+    else:
+        listener = socket.create_server(address, backlog=LISTEN_BACKLOG)
+    listener.setblocking(False)
+    return listener
+
+
+class FleetAggregator:
+    # `--fleet ADDR`: accepts `--push-to` agents on a TCP or Unix socket and keeps a `FleetHost`
+    # per host name. One asyncio loop on a daemon thread multiplexes every connection, so hundreds
+    # of agents cost one thread, and each frame is read with two `readexactly` calls. The view
+    # polls `take_changed()` on its frame timer and redraws only the hosts that received records
+    # (or connected/disconnected) since the last frame, however many frames arrived in between.
+    # A host that reconnects under its name keeps its history; a second live agent with the same
+    # name gets a "#2" suffix.
+    def __init__(self, address: str | tuple[str, int], history_seconds: float = 60.0) -> None:
+        self.history_seconds = history_seconds
+        self.rejected = 0
+        self._hosts: dict[str, FleetHost] = {}
+        self._changed: set[str] = set()
+        self._lock = threading.Lock()
+        self._listener = _listen(address)
+        self._path = address if isinstance(address, str) else None
+        self._loop = asyncio.new_event_loop()
+        # Made on the loop's thread in `_run`: before 3.10 an Event binds to the loop current where it is created.
+        self._stopping: asyncio.Event | None = None
+        self._connections: dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._thread = threading.Thread(target=self._run, name="system-monitor-fleet", daemon=True)
+
+    @property
+    def address(self) -> str | tuple[str, int]:
+        return self._path if self._path is not None else self._listener.getsockname()[:2]
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._request_stop)
+            self._thread.join()
+        else:
+            self._listener.close()
+        if not self._loop.is_closed():
+            self._loop.close()
+        if self._path is not None:
+            try:
+                os.unlink(self._path)
+            except FileNotFoundError:
+                pass
+
+    def hosts(self) -> list[FleetHost]:
+        with self._lock:
+            return [self._hosts[name] for name in sorted(self._hosts)]
+
+    def cpu_quantiles(self, fractions) -> np.ndarray:
+        # Fleet-wide CPU percentiles over the history window: every live host's sketch merged into
+        # one, which costs one array add per host however many samples they hold. A stale host's
+        # window stops moving, so it is left out.
+        merged = QuantileSketch(*PERCENT_RANGE, relative_accuracy=FLEET_SKETCH_ACCURACY)
+        now = time.monotonic()
+        for host in self.hosts():
+            if host.stale(now):
+                continue
+            with host.lock:
+                merged.merge(host.cpu_window.sketch)
+        return merged.quantiles(fractions)
+
+    def take_changed(self) -> list[FleetHost]:
+        with self._lock:
+            names, self._changed = self._changed, set()
+            return [self._hosts[name] for name in sorted(names)]
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._stopping = asyncio.Event()
+        self._loop.run_until_complete(self._serve_forever())
+
+    def _request_stop(self) -> None:
+        # Runs on the loop, which only starts after `_run` has made the event.
+        self._stopping.set()
+
+    async def _serve_forever(self) -> None:
+        # start_server listens again, with a backlog of 100 unless told otherwise.
+        server = await asyncio.start_server(self._serve, sock=self._listener, backlog=LISTEN_BACKLOG)
+        await self._stopping.wait()
+        server.close()
+        for writer in list(self._connections):
+            writer.close()
+        await asyncio.gather(*self._connections.values(), return_exceptions=True)
+        await server.wait_closed()
+
+    def _register(self, name: str, interval_seconds: float, peer: str) -> FleetHost:
+        with self._lock:
+            unique, suffix = name, 2
+            while unique in self._hosts and self._hosts[unique].connected:
+                unique, suffix = f"{name}#{suffix}", suffix + 1
+            host = self._hosts.get(unique)
+            if host is None:
+                host = self._hosts[unique] = FleetHost(unique, interval_seconds, self.history_seconds)
+            host.interval_seconds = interval_seconds
+            host.connected = True
+            host.last_seen = time.monotonic()
+            host.peer = peer
+            self._changed.add(unique)
+            return host
+
+    def _mark_changed(self, host: FleetHost) -> None:
+        with self._lock:
+            self._changed.add(host.name)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections[writer] = asyncio.current_task()
+        peer = writer.get_extra_info("peername")
+        host: FleetHost | None = None
+        try:
+            length, kind = frame_length(await reader.readexactly(FRAME_HEADER.size))
+            if kind != HELLO:
+                raise ProtocolError("an agent must start with a hello frame")
+            name, interval_seconds = decode_hello(await reader.readexactly(length))
+            host = self._register(name, interval_seconds, f"{peer[0]}:{peer[1]}" if isinstance(peer, tuple) else "")
+            while True:
+                length, kind = frame_length(await reader.readexactly(FRAME_HEADER.size))
+                payload = await reader.readexactly(length)
+                # Other kinds are skipped, so newer agents can add frames without breaking this view.
+                if kind == RECORDS and payload:
+                    host.append(decode_records(payload))
+                    self._mark_changed(host)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ProtocolError:
+            self.rejected += 1
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+            if host is not None:
+                host.connected = False
+                self._mark_changed(host)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import socket
+import time
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.binary_exporter import encode_record
+from system_monitor.services.fleet_protocol import RECORDS, encode_frame, encode_hello
+
+# A connect or send that takes longer than this gives up; it runs on the sampler thread.
+SOCKET_TIMEOUT_SECONDS = 1.0
+RETRY_SECONDS = 1.0
+MAX_RETRY_SECONDS = 30.0
+
+
+def open_fleet_socket(address: str | tuple[str, int], timeout: float = SOCKET_TIMEOUT_SECONDS) -> socket.socket:
+    # A str is a Unix socket path, a (host, port) tuple a TCP endpoint.
+    if isinstance(address, str):
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(timeout)
+        try:
+            connection.connect(address)
+        except OSError:
+            connection.close()
+            raise
+        return connection
+    host, port = address
+    connection = socket.create_connection((host or "localhost", port), timeout=timeout)
+    # Frames are tiny and one per sample, so I send them now rather than let Nagle hold them back.
+    connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return connection
+
+
+class FleetAgent:
+    # `--push-to ADDR`: a sampler listener that streams every snapshot to a fleet aggregator as a
+    # 5-byte frame header plus one packed binary-export record. The sampler keeps its cadence when
+    # the aggregator is down or slow: a failed connect or send drops that snapshot (counted in
+    # `dropped`) and the next attempt waits 1s, doubling up to 30s.
+    def __init__(
+        self,
+        address: str | tuple[str, int],
+        host_name: str,
+        interval_seconds: float,
+        retry_seconds: float = RETRY_SECONDS,
+    ) -> None:
+        self.address = address
+        self.host_name = host_name
+        self.interval_seconds = interval_seconds
+        self.retry_seconds = retry_seconds
+        self.sent = 0
+        self.dropped = 0
+        self.connects = 0
+        self._socket: socket.socket | None = None
+        self._backoff = retry_seconds
+        self._next_attempt = 0.0
+
+    @property
+    def connected(self) -> bool:
+        return self._socket is not None
+
+    def write(self, snapshot: SystemSnapshot) -> None:
+        if self._socket is None and not self._connect():
+            self.dropped += 1
+            return
+        try:
+            self._socket.sendall(encode_frame(RECORDS, encode_record(snapshot)))
+        except OSError:
+            self._disconnect()
+            self.dropped += 1
+            return
+        self.sent += 1
+
+    def _connect(self) -> bool:
+        now = time.monotonic()
+        if now < self._next_attempt:
+            return False
+        try:
+            connection = open_fleet_socket(self.address)
+        except OSError:
+            self._retry_later(now)
+            return False
+        try:
+            connection.sendall(encode_hello(self.host_name, self.interval_seconds))
+        except OSError:
+            connection.close()
+            self._retry_later(now)
+            return False
+        self._socket = connection
+        self._backoff = self.retry_seconds
+        self.connects += 1
+        return True
+
+    def _retry_later(self, now: float) -> None:
+        self._next_attempt = now + self._backoff
+        self._backoff = min(self._backoff * 2, MAX_RETRY_SECONDS)
+
+    def _disconnect(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        self._next_attempt = time.monotonic() + self._backoff
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import struct
+
+import numpy as np
+
+from system_monitor.services.binary_exporter import RECORD_DTYPE
+
+PROTOCOL_VERSION = 1
+# Every frame is a little-endian uint32 payload length, a one-byte kind and the payload.
+FRAME_HEADER = struct.Struct("<IB")
+# The first frame on a connection: UTF-8 JSON with the protocol version, host name, sampling
+# interval and record size.
+HELLO = 1
+# Then any number of frames carrying one or more packed binary-export records (56 bytes each).
+RECORDS = 2
+# Anything larger is a corrupt or hostile stream, not a batch of snapshots.
+MAX_FRAME_BYTES = 1 << 20
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+def encode_frame(kind: int, payload: bytes) -> bytes:
+    if len(payload) > MAX_FRAME_BYTES:
+        raise ProtocolError(f"frame of {len(payload)} bytes exceeds {MAX_FRAME_BYTES}")
+    return FRAME_HEADER.pack(len(payload), kind) + payload
+
+
+def encode_hello(host: str, interval_seconds: float) -> bytes:
+    hello = {
+        "version": PROTOCOL_VERSION,
+        "host": host,
+        "interval": interval_seconds,
+        "record_size": RECORD_DTYPE.itemsize,
+    }
+    return encode_frame(HELLO, json.dumps(hello, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_hello(payload: bytes) -> tuple[str, float]:
+    try:
+        hello = json.loads(payload.decode("utf-8"))
+        version, host, interval = hello["version"], str(hello["host"]), float(hello["interval"])
+        record_size = hello["record_size"]
+    except (UnicodeDecodeError, ValueError, KeyError, TypeError) as error:
+        raise ProtocolError(f"malformed hello: {error}") from None
+    if version != PROTOCOL_VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ProtocolError(f"unsupported agent (protocol {version}, {record_size}-byte records)")
+    if not host or interval <= 0:
+        raise ProtocolError("a hello needs a host name and a positive interval")
+    return host, interval
+
+
+def decode_records(payload: bytes) -> np.ndarray:
+    if len(payload) % RECORD_DTYPE.itemsize:
+        raise ProtocolError(f"{len(payload)} bytes is not a whole number of records")
+    return np.frombuffer(payload, dtype=RECORD_DTYPE)
+
+
+def frame_length(header: bytes) -> tuple[int, int]:
+    length, kind = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise ProtocolError(f"frame of {length} bytes exceeds {MAX_FRAME_BYTES}")
+    return length, kind
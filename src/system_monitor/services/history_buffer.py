@@ -1,37 +1,107 @@
 from __future__ import annotations
 
-from collections import deque
-from typing import Deque, Iterable
+from typing import Sequence
+
+import numpy as np
+
+DEFAULT_COLUMNS = ("time", "cpu", "ram")
 
 
 class HistoryBuffer:
-    def __init__(self, max_points: int) -> None:
-        self._time: Deque[float] = deque(maxlen=max_points)
-        self._cpu: Deque[float] = deque(maxlen=max_points)
-        self._ram: Deque[float] = deque(maxlen=max_points)
+    # I store every column in one preallocated (columns x 2*capacity) array and write rows
+    # linearly. When the write cursor hits the end I slide the newest `capacity` rows back to
+    # the front in a single copy, so every read is a contiguous zero-copy view and appends stay
+    # amortized O(1). Views are read-only and only valid until the next append.
+    def __init__(
+        self,
+        max_points: int,
+        columns: Sequence[str] = DEFAULT_COLUMNS,
+        dtype: np.dtype | type = np.float64,
+    ) -> None:
+        if max_points < 1:
+            raise ValueError("max_points must be at least 1")
+        if not columns:
+            raise ValueError("HistoryBuffer needs at least one column")
+        self._capacity = int(max_points)
+        self._columns = tuple(columns)
+        self._column_index = {name: index for index, name in enumerate(self._columns)}
+        if len(self._column_index) != len(self._columns):
+            raise ValueError("column names must be unique")
+        self._data = np.zeros((len(self._columns), 2 * self._capacity), dtype=dtype)
+        self._end = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return self._columns
+
+    def append(self, *values: float) -> None:
+        if len(values) != len(self._columns):
+            raise ValueError(f"expected {len(self._columns)} values, got {len(values)}")
+        if self._end == self._data.shape[1]:
+            self._data[:, : self._capacity - 1] = self._data[:, self._end - self._capacity + 1 : self._end]
+            self._end = self._capacity - 1
+        self._data[:, self._end] = values
+        self._end += 1
+        if self._size < self._capacity:
+            self._size += 1
+
+    def extend(self, rows: np.ndarray) -> None:
+        # Bulk append of an (n x columns) array; only the newest `capacity` rows can survive anyway.
+        rows = np.asarray(rows, dtype=self._data.dtype)
+        if rows.ndim != 2 or rows.shape[1] != len(self._columns):
+            raise ValueError(f"expected an (n x {len(self._columns)}) array, got shape {rows.shape}")
+        rows = rows[-self._capacity :]
+        count = len(rows)
+        if count == 0:
+            return
+        if self._end + count > self._data.shape[1]:
+            keep = min(self._size, self._capacity - count)
+            self._data[:, :keep] = self._data[:, self._end - keep : self._end]
+            self._end = self._size = keep
+        self._data[:, self._end : self._end + count] = rows.T
+        self._end += count
+        self._size = min(self._size + count, self._capacity)
+
+    def update_last(self, *values: float) -> None:
+        if self._size == 0:
+            raise IndexError("update_last on an empty HistoryBuffer")
+        if len(values) != len(self._columns):
+            raise ValueError(f"expected {len(self._columns)} values, got {len(values)}")
+        self._data[:, self._end - 1] = values
+
+    def column(self, name: str, size: int | None = None) -> np.ndarray:
+        count = self._size if size is None else max(0, min(int(size), self._size))
+        view = self._data[self._column_index[name], self._end - count : self._end]
+        view.flags.writeable = False
+        return view
 
-    def append(self, elapsed_seconds: float, cpu_percent: float, ram_percent: float) -> None:
-        self._time.append(elapsed_seconds)
-        self._cpu.append(cpu_percent)
-        self._ram.append(ram_percent)
+    def latest(self, name: str) -> float | None:
+        if self._size == 0:
+            return None
+        return float(self._data[self._column_index[name], self._end - 1])
 
     @property
-    def time_points(self) -> list[float]:
-        return list(self._time)
+    def time_points(self) -> np.ndarray:
+        return self.column("time")
 
     @property
-    def cpu_points(self) -> list[float]:
-        return list(self._cpu)
+    def cpu_points(self) -> np.ndarray:
+        return self.column("cpu")
 
     @property
-    def ram_points(self) -> list[float]:
-        return list(self._ram)
+    def ram_points(self) -> np.ndarray:
+        return self.column("ram")
 
     def __len__(self) -> int:
-        return len(self._time)
+        return self._size
 
-    def cpu_window(self, size: int) -> Iterable[float]:
-        return list(self._cpu)[-size:]
+    def cpu_window(self, size: int) -> np.ndarray:
+        return self.column("cpu", size)
 
-    def ram_window(self, size: int) -> Iterable[float]:
-        return list(self._ram)[-size:]
+    def ram_window(self, size: int) -> np.ndarray:
+        return self.column("ram", size)
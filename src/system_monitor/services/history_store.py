@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sqlite3
+import time
+
+import numpy as np
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.binary_exporter import RECORD_DTYPE, captured_at_ns, encode_record
+from system_monitor.services.buffered_exporter import BufferedExporter, FlushPolicy
+from system_monitor.services.history_tiers import TieredHistory
+
+DEFAULT_RETENTION_DAYS = 7.0
+# Pruning deletes a range of whole chunks, so an hourly pass keeps the file near its retention size.
+PRUNE_INTERVAL_SECONDS = 3600.0
+# Each flush becomes one chunk row; a crash loses at most this much, and a 24h backfill reads ~17k rows.
+DEFAULT_STORE_FLUSH_POLICY = FlushPolicy(max_seconds=5.0)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS chunks (
+        start_ns INTEGER PRIMARY KEY,
+        end_ns INTEGER NOT NULL,
+        row_count INTEGER NOT NULL,
+        records BLOB NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS chunks_end ON chunks (end_ns)",
+)
+_INSERT = "INSERT INTO chunks VALUES (?, ?, ?, ?)"
+_CHUNK = "SELECT records FROM chunks WHERE start_ns = ?"
+_MERGE = "UPDATE chunks SET end_ns = ?, row_count = ?, records = ? WHERE start_ns = ?"
+_SELECT = "SELECT records FROM chunks WHERE end_ns >= ? AND start_ns < ? ORDER BY start_ns"
+_PRUNE = "DELETE FROM chunks WHERE end_ns < ?"
+
+
+class HistoryStore(BufferedExporter):
+    # `--history-store PATH`: an SQLite database in WAL mode holding time-keyed chunks. Every flush
+    # of the BufferedExporter writer thread inserts one row: the batch's first and last capture time
+    # in epoch ns plus its samples as packed binary-export records. A range query therefore reads
+    # a few BLOBs through the (start, end) indexes and hands them to NumPy without a Python object
+    # per sample. Readers open their own connection, and WAL lets them run while the writer commits.
+    def __init__(
+        self,
+        path: Path,
+        retention_days: float | None = DEFAULT_RETENTION_DAYS,
+        flush_policy: FlushPolicy | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.retention_ns = None if not retention_days else int(retention_days * 86400 * 1e9)
+        self._last_prune = float("-inf")
+        # Only the writer thread touches this connection once the constructor returns.
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            connection.execute(statement)
+        self._connection = connection
+        super().__init__(connection, policy=flush_policy or DEFAULT_STORE_FLUSH_POLICY)
+
+    def _encode(self, snapshot: SystemSnapshot) -> bytes:
+        return encode_record(snapshot)
+
+    def _write_buffer(self) -> None:
+        if not self._buffer:
+            return
+        size = RECORD_DTYPE.itemsize
+        # captured_at_ns is the first field of every record.
+        start_ns = int.from_bytes(self._buffer[:8], "little", signed=True)
+        end_ns = int.from_bytes(self._buffer[-size : 8 - size], "little", signed=True)
+        connection = self._connection
+        connection.execute("BEGIN")
+        try:
+            try:
+                connection.execute(_INSERT, (start_ns, end_ns, len(self._buffer) // size, bytes(self._buffer)))
+            except sqlite3.IntegrityError:
+                self._merge_chunk(start_ns)
+            if self.retention_ns is not None and time.monotonic() - self._last_prune >= PRUNE_INTERVAL_SECONDS:
+                connection.execute(_PRUNE, (end_ns - self.retention_ns,))
+                self._last_prune = time.monotonic()
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _merge_chunk(self, start_ns: int) -> None:
+        # A chunk already starts at this nanosecond (a restart or a clock step landed on it), so the two
+        # become one chunk in capture order rather than one replacing the other.
+        (existing,) = self._connection.execute(_CHUNK, (start_ns,)).fetchone()
+        records = np.concatenate(
+            (np.frombuffer(existing, dtype=RECORD_DTYPE), np.frombuffer(bytes(self._buffer), dtype=RECORD_DTYPE))
+        )
+        records = records[np.argsort(records["captured_at_ns"], kind="stable")]
+        end_ns = int(records["captured_at_ns"][-1])
+        self._connection.execute(_MERGE, (end_ns, len(records), records.tobytes(), start_ns))
+
+    def query(self, start_ns: int, end_ns: int | None = None) -> np.ndarray:
+        # Samples with start_ns <= captured_at_ns < end_ns as a RECORD_DTYPE array, oldest first.
+        return query_history(self.path, start_ns, end_ns)
+
+    def recent(self, seconds: float) -> np.ndarray:
+        now_ns = time.time_ns()
+        return self.query(now_ns - int(seconds * 1e9), now_ns + 1)
+
+
+def query_history(path: Path, start_ns: int, end_ns: int | None = None) -> np.ndarray:
+    if not Path(path).exists():
+        return np.empty(0, dtype=RECORD_DTYPE)
+    end_ns = 2**63 - 1 if end_ns is None else end_ns
+    connection = sqlite3.connect(f"file:{Path(path).resolve()}?mode=ro", uri=True)
+    try:
+        blobs = [blob for (blob,) in connection.execute(_SELECT, (start_ns, end_ns))]
+    finally:
+        connection.close()
+    if not blobs:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    records = np.frombuffer(b"".join(blobs), dtype=RECORD_DTYPE)
+    captured = records["captured_at_ns"]
+    # Only the first and last chunk can stick out of the range.
+    records = records[(captured >= start_ns) & (captured < end_ns)]
+    # Chunks from overlapping sessions interleave in time, so ordering them by start is not enough.
+    return records[np.argsort(records["captured_at_ns"], kind="stable")]
+
+
+def backfill_history(history: TieredHistory, records: np.ndarray, first: SystemSnapshot) -> int:
+    # Stored samples come from earlier sessions whose elapsed clocks mean nothing now, so I place them on
+    # this session's timeline by capture time relative to its first live sample: they land at negative
+    # elapsed seconds, just before it. Returns how many were added.
+    first_ns = captured_at_ns(first)
+    records = records[records["captured_at_ns"] < first_ns]
+    if not len(records):
+        return 0
+    elapsed = first.elapsed_seconds + (records["captured_at_ns"] - first_ns) / 1e9
+    history.extend(elapsed, np.column_stack((records["cpu_percent"], records["ram_percent"])))
+    return len(records)
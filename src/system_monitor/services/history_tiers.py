@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+import threading
+from typing import Sequence
+
+import numpy as np
+
+from system_monitor.services.history_buffer import HistoryBuffer
+from system_monitor.services.window_extrema import SlidingWindowExtrema
+
+ROLLUP_RESOLUTIONS = (1.0, 10.0, 60.0, 600.0)
+DEFAULT_TIER_POINTS = 10_000
+MAX_RAW_POINTS = 100_000
+
+
+@dataclass(frozen=True)
+class SeriesView:
+    time: np.ndarray
+    mean: np.ndarray
+    minimum: np.ndarray
+    maximum: np.ndarray
+    resolution_seconds: float
+
+    @property
+    def is_raw(self) -> bool:
+        return self.resolution_seconds == 0.0
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+
+class RollupTier:
+    # Each row is one bucket: (bucket start, then min/max/mean per metric). The bucket that is
+    # still filling is always the last row and is rewritten in place on every sample, so reads
+    # stay zero-copy views into the ring buffer.
+    def __init__(self, resolution_seconds: float, metrics: Sequence[str], max_points: int) -> None:
+        self.resolution_seconds = float(resolution_seconds)
+        self.metrics = tuple(metrics)
+        columns = ["time"]
+        for metric in self.metrics:
+            columns.extend((f"{metric}_min", f"{metric}_max", f"{metric}_mean"))
+        self.buffer = HistoryBuffer(max_points=max_points, columns=columns)
+        self._bucket: int | None = None
+        self._count = 0
+        self._mins: list[float] = []
+        self._maxs: list[float] = []
+        self._sums: list[float] = []
+
+    def add(self, timestamp: float, values: Sequence[float]) -> None:
+        bucket = math.floor(timestamp / self.resolution_seconds)
+        if bucket != self._bucket:
+            self._bucket = bucket
+            self._count = 1
+            self._mins = list(values)
+            self._maxs = list(values)
+            self._sums = list(values)
+            self.buffer.append(*self._row())
+            return
+
+        self._count += 1
+        for index, value in enumerate(values):
+            if value < self._mins[index]:
+                self._mins[index] = value
+            if value > self._maxs[index]:
+                self._maxs[index] = value
+            self._sums[index] += value
+        self.buffer.update_last(*self._row())
+
+    def extend(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        # Bulk form of `add` for (n x metrics) values: rows continuing the open bucket go through
+        # `add`, and every later bucket is reduced with one reduceat per statistic.
+        buckets = np.floor(timestamps / self.resolution_seconds).astype(np.int64)
+        if self._bucket is not None:
+            continuing = int(np.searchsorted(buckets, self._bucket, side="right"))
+            for timestamp, row in zip(timestamps[:continuing].tolist(), values[:continuing].tolist()):
+                self.add(timestamp, row)
+            buckets, values = buckets[continuing:], values[continuing:]
+        if not len(buckets):
+            return
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        counts = np.diff(np.r_[starts, len(buckets)])
+        mins = np.minimum.reduceat(values, starts, axis=0)
+        maxs = np.maximum.reduceat(values, starts, axis=0)
+        sums = np.add.reduceat(values, starts, axis=0)
+        rows = np.empty((len(starts), 1 + 3 * len(self.metrics)))
+        rows[:, 0] = buckets[starts] * self.resolution_seconds
+        rows[:, 1::3] = mins
+        rows[:, 2::3] = maxs
+        rows[:, 3::3] = sums / counts[:, None]
+        self.buffer.extend(rows)
+        self._bucket = int(buckets[-1])
+        self._count = int(counts[-1])
+        self._mins = mins[-1].tolist()
+        self._maxs = maxs[-1].tolist()
+        self._sums = sums[-1].tolist()
+
+    def _row(self) -> list[float]:
+        row = [self._bucket * self.resolution_seconds]
+        for low, high, total in zip(self._mins, self._maxs, self._sums):
+            row.extend((low, high, total / self._count))
+        return row
+
+    def covers(self, start: float) -> bool:
+        if len(self.buffer) < self.buffer.capacity:
+            return True
+        oldest = self.buffer.column("time", self.buffer.capacity)[0]
+        return oldest <= start
+
+    def view(self, metric: str, start: float) -> SeriesView:
+        times = self.buffer.time_points
+        first = max(int(np.searchsorted(times, start, side="right")) - 1, 0)
+        return SeriesView(
+            time=times[first:],
+            mean=self.buffer.column(f"{metric}_mean")[first:],
+            minimum=self.buffer.column(f"{metric}_min")[first:],
+            maximum=self.buffer.column(f"{metric}_max")[first:],
+            resolution_seconds=self.resolution_seconds,
+        )
+
+
+class TieredHistory:
+    # I keep raw samples for short windows plus 1s/10s/1min/10min rollups for long ones. Every
+    # tier has a fixed number of rows, so memory is bounded however long the retention is, and
+    # `query` hands back roughly one point per pixel no matter how wide the window gets.
+    # Appends take a lock so `raw_since` can copy rows out from another thread (the metrics server).
+    # Views returned by `query` are unlocked and only safe on the thread that appends.
+    def __init__(
+        self,
+        metrics: Sequence[str] = ("cpu", "ram"),
+        raw_points: int = 1_000,
+        retention_seconds: float = 3600.0,
+        resolutions: Sequence[float] = ROLLUP_RESOLUTIONS,
+        tier_points: int = DEFAULT_TIER_POINTS,
+        extrema_window_seconds: float | None = None,
+    ) -> None:
+        self.metrics = tuple(metrics)
+        self._lock = threading.Lock()
+        window_seconds = retention_seconds if extrema_window_seconds is None else extrema_window_seconds
+        self._extrema = {metric: SlidingWindowExtrema(window_seconds) for metric in self.metrics}
+        self.raw = HistoryBuffer(
+            max_points=max(1, min(int(raw_points), MAX_RAW_POINTS)),
+            columns=("time",) + self.metrics,
+        )
+        self.tiers = [
+            RollupTier(
+                resolution,
+                self.metrics,
+                max_points=max(2, min(int(tier_points), math.ceil(retention_seconds / resolution) + 2)),
+            )
+            for resolution in sorted(resolutions)
+        ]
+
+    @classmethod
+    def for_window(cls, history_seconds: float, interval_ms: int, metrics: Sequence[str] = ("cpu", "ram")) -> TieredHistory:
+        raw_points = max(int((history_seconds * 1000) / max(interval_ms, 1)) + 20, 40)
+        return cls(
+            metrics=metrics,
+            raw_points=raw_points,
+            retention_seconds=history_seconds,
+            extrema_window_seconds=history_seconds,
+        )
+
+    def append(self, elapsed_seconds: float, *values: float) -> None:
+        with self._lock:
+            self.raw.append(elapsed_seconds, *values)
+            for tier in self.tiers:
+                tier.add(elapsed_seconds, values)
+            for metric, value in zip(self.metrics, values):
+                self._extrema[metric].push(elapsed_seconds, value)
+
+    def extend(self, elapsed_seconds: np.ndarray, values: np.ndarray) -> None:
+        # Bulk append of ascending times with an (n x metrics) value array, e.g. a backfill from disk.
+        times = np.asarray(elapsed_seconds, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64).reshape(len(times), len(self.metrics))
+        with self._lock:
+            self.raw.extend(np.column_stack((times, values)))
+            for tier in self.tiers:
+                tier.extend(times, values)
+            for index, metric in enumerate(self.metrics):
+                self._extrema[metric].extend(times, values[:, index])
+
+    def raw_since(self, start: float) -> np.ndarray:
+        # A (rows x columns) copy of the raw samples at or after `start`, columns as in `raw.columns`.
+        with self._lock:
+            times = self.raw.time_points
+            first = int(np.searchsorted(times, start, side="left"))
+            return np.stack([self.raw.column(name)[first:] for name in self.raw.columns], axis=1)
+
+    def bounds(self, metric: str) -> tuple[float, float] | None:
+        return self._extrema[metric].bounds()
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    @property
+    def latest_time(self) -> float | None:
+        return self.raw.latest("time")
+
+    def raw_covers(self, start: float) -> bool:
+        if len(self.raw) < self.raw.capacity:
+            return True
+        return self.raw.column("time", self.raw.capacity)[0] <= start
+
+    def _raw_view(self, metric: str, start: float) -> SeriesView:
+        times = self.raw.time_points
+        first = max(int(np.searchsorted(times, start, side="left")) - 1, 0)
+        values = self.raw.column(metric)[first:]
+        return SeriesView(
+            time=times[first:],
+            mean=values,
+            minimum=values,
+            maximum=values,
+            resolution_seconds=0.0,
+        )
+
+    def query(self, metric: str, span_seconds: float, pixels: int) -> SeriesView:
+        end = self.latest_time
+        if end is None:
+            empty = np.empty(0)
+            return SeriesView(empty, empty, empty, empty, 0.0)
+
+        start = end - span_seconds
+        target_resolution = span_seconds / max(int(pixels), 1)
+        candidates: list[tuple[float, RollupTier | None]] = [(0.0, None)]
+        candidates.extend((tier.resolution_seconds, tier) for tier in self.tiers)
+
+        chosen: RollupTier | None = self.tiers[-1] if self.tiers else None
+        for resolution, tier in reversed(candidates):
+            if resolution > target_resolution:
+                continue
+            covered = self.raw_covers(start) if tier is None else tier.covers(start)
+            if covered:
+                chosen = tier
+                break
+        else:
+            # Nothing fine enough covers the window, so I take the finest coarser tier that does.
+            for resolution, tier in candidates:
+                if resolution > target_resolution and tier is not None and tier.covers(start):
+                    chosen = tier
+                    break
+
+        if chosen is None:
+            return self._raw_view(metric, start)
+        return chosen.view(metric, start)
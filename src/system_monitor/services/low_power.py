@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from system_monitor.models import SystemSnapshot
+
+IDLE_CPU_PERCENT = 10.0
+IDLE_SAMPLES = 5
+MAX_STRETCH = 8
+
+
+class IdleBackoff:
+    # `--low-power`: after IDLE_SAMPLES quiet samples in a row the interval doubles, up to MAX_STRETCH
+    # times the configured one. The first busy sample snaps straight back, so load spikes are still
+    # sampled at full rate while an idle machine is mostly left asleep.
+    def __init__(
+        self,
+        base_seconds: float,
+        idle_cpu_percent: float = IDLE_CPU_PERCENT,
+        idle_samples: int = IDLE_SAMPLES,
+        max_stretch: int = MAX_STRETCH,
+    ) -> None:
+        self.base_seconds = base_seconds
+        self.idle_cpu_percent = idle_cpu_percent
+        self.idle_samples = max(1, idle_samples)
+        self.max_seconds = base_seconds * max(1, max_stretch)
+        self.interval_seconds = base_seconds
+        self._quiet = 0
+
+    def __call__(self, snapshot: SystemSnapshot) -> float:
+        if snapshot.cpu_percent >= self.idle_cpu_percent:
+            self._quiet = 0
+            self.interval_seconds = self.base_seconds
+            return self.interval_seconds
+        self._quiet += 1
+        if self._quiet >= self.idle_samples:
+            self._quiet = 0
+            self.interval_seconds = min(self.interval_seconds * 2, self.max_seconds)
+        return self.interval_seconds
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import math
+import os
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from system_monitor.models import MetricVector, SystemSnapshot
+
+CPU_CORE_PERCENT = "cpu_core_percent"
+NET_IF_RECV_BPS = "net_if_recv_bps"
+NET_IF_SENT_BPS = "net_if_sent_bps"
+MOUNT_PERCENT = "mount_percent"
+MOUNT_READ_BPS = "mount_read_bps"
+MOUNT_WRITE_BPS = "mount_write_bps"
+VECTOR_METRICS = (
+    CPU_CORE_PERCENT,
+    NET_IF_RECV_BPS,
+    NET_IF_SENT_BPS,
+    MOUNT_PERCENT,
+    MOUNT_READ_BPS,
+    MOUNT_WRITE_BPS,
+)
+# Mount tables rarely change, so I rescan them on this cadence instead of every sample.
+MOUNT_REFRESH_SECONDS = 30.0
+
+VectorLayout = Mapping[str, tuple[str, ...]]
+
+
+def make_vector(labels: tuple[str, ...], values) -> MetricVector:
+    array = np.asarray(values, dtype=np.float32)
+    array.flags.writeable = False
+    return MetricVector(labels=labels, values=array)
+
+
+def core_labels(count: int) -> tuple[str, ...]:
+    return tuple(f"cpu{index}" for index in range(count))
+
+
+def block_device_name(device: str) -> str:
+    # /dev/mapper/root and /dev/disk/by-uuid/... are symlinks; the kernel counts IO under the target name.
+    return os.path.basename(os.path.realpath(device))
+
+
+def aligned_values(snapshot: SystemSnapshot, name: str, labels: Sequence[str]) -> np.ndarray:
+    # Exporters write a fixed layout chosen when the file was opened. Labels that have since
+    # disappeared come out as NaN, and labels that appeared later are left out.
+    vector = snapshot.vectors.get(name)
+    if vector is not None and vector.labels == tuple(labels):
+        return vector.values
+    aligned = np.full(len(labels), np.nan, dtype=np.float32)
+    if vector is not None:
+        index = {label: position for position, label in enumerate(vector.labels)}
+        for position, label in enumerate(labels):
+            source = index.get(label)
+            if source is not None:
+                aligned[position] = vector.values[source]
+    return aligned
+
+
+def layout_width(layout: VectorLayout | None) -> int:
+    return sum(len(labels) for labels in (layout or {}).values())
+
+
+def layout_columns(layout: VectorLayout | None) -> list[str]:
+    return [f"{name}[{label}]" for name, labels in (layout or {}).items() for label in labels]
+
+
+class CounterRates:
+    # Turns monotonically increasing per-label counters into per-second rates. A label seen for the
+    # first time reports 0 until it has a previous reading, and counter resets are clamped to 0.
+    def __init__(self) -> None:
+        self._labels: tuple[str, ...] = ()
+        self._counters = np.empty(0, dtype=np.float64)
+        self._time: float | None = None
+
+    def update(self, labels: tuple[str, ...], counters: Sequence[float], now: float) -> np.ndarray:
+        current = np.asarray(counters, dtype=np.float64)
+        if self._time is None:
+            previous = current
+        elif labels == self._labels:
+            previous = self._counters
+        else:
+            known = dict(zip(self._labels, self._counters.tolist()))
+            previous = np.array([known.get(label, value) for label, value in zip(labels, current.tolist())])
+        window = max(now - self._time, 1e-6) if self._time is not None else math.inf
+        rates = np.maximum(current - previous, 0.0) / window
+        self._labels = labels
+        self._counters = current
+        self._time = now
+        return rates
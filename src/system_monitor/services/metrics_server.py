@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+import math
+import os
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import psutil
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.self_metrics import PERCENTILES, SELF_PROFILER
+from system_monitor.services.history_tiers import TieredHistory
+from system_monitor.services.metric_vectors import (
+    CPU_CORE_PERCENT,
+    MOUNT_PERCENT,
+    MOUNT_READ_BPS,
+    MOUNT_WRITE_BPS,
+    NET_IF_RECV_BPS,
+    NET_IF_SENT_BPS,
+)
+from system_monitor.services.quantile_sketch import QUANTILE_SUFFIX
+from system_monitor.services.sampler import BackgroundSampler
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+HISTORY_CHUNK_ROWS = 4096
+# (metric name, help, snapshot attribute)
+SCALAR_METRICS = (
+    ("system_monitor_cpu_percent", "Total CPU utilisation in percent.", "cpu_percent"),
+    ("system_monitor_ram_percent", "Used RAM in percent.", "ram_percent"),
+    ("system_monitor_disk_percent", "Used space on the root volume in percent.", "disk_percent"),
+    ("system_monitor_processes", "Number of processes.", "process_count"),
+    ("system_monitor_net_sent_bytes_per_second", "Network upload rate.", "net_sent_bps"),
+    ("system_monitor_net_recv_bytes_per_second", "Network download rate.", "net_recv_bps"),
+    ("system_monitor_uptime_seconds", "Host uptime.", "uptime_seconds"),
+)
+# Vector metric -> (Prometheus label name for its labels, help).
+VECTOR_METRICS = {
+    CPU_CORE_PERCENT: ("core", "CPU utilisation per core in percent."),
+    NET_IF_RECV_BPS: ("interface", "Download rate per network interface."),
+    NET_IF_SENT_BPS: ("interface", "Upload rate per network interface."),
+    MOUNT_PERCENT: ("mount", "Used space per mount in percent."),
+    MOUNT_READ_BPS: ("mount", "Read rate per mount."),
+    MOUNT_WRITE_BPS: ("mount", "Write rate per mount."),
+}
+
+
+def _number(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_prometheus(snapshot: SystemSnapshot | None, sampler: BackgroundSampler | None = None) -> str:
+    out = io.StringIO()
+    if snapshot is not None:
+        for name, help_text, attribute in SCALAR_METRICS:
+            out.write(f"# HELP {name} {help_text}\n# TYPE {name} gauge\n{name} {_number(getattr(snapshot, attribute))}\n")
+        out.write(
+            "# HELP system_monitor_last_sample_timestamp_seconds When the latest sample was captured.\n"
+            "# TYPE system_monitor_last_sample_timestamp_seconds gauge\n"
+            f"system_monitor_last_sample_timestamp_seconds {_number(snapshot.captured_at.timestamp())}\n"
+        )
+        for vector_name, vector in snapshot.vectors.items():
+            name = f"system_monitor_{vector_name}"
+            if vector_name.endswith(QUANTILE_SUFFIX):
+                # Rolling percentiles as gauges, e.g. ..._cpu_percent_quantiles{percentile="p95",window="1m"}:
+                # `quantile` is reserved for summaries, and these have no _sum or _count per window.
+                metric = vector_name[: -len(QUANTILE_SUFFIX)]
+                out.write(f"# HELP {name} Rolling percentiles of {metric} over trailing windows.\n# TYPE {name} gauge\n")
+                for label, value in zip(vector.labels, vector.values.tolist()):
+                    percentile, _, window = label.partition("_")
+                    labels = f'percentile="{_label_value(percentile)}"'
+                    if window:
+                        labels += f',window="{_label_value(window)}"'
+                    out.write(f"{name}{{{labels}}} {_number(value)}\n")
+                continue
+            key, help_text = VECTOR_METRICS.get(vector_name, ("label", f"Labelled {vector_name} values."))
+            out.write(f"# HELP {name} {help_text}\n# TYPE {name} gauge\n")
+            for label, value in zip(vector.labels, vector.values.tolist()):
+                out.write(f'{name}{{{key}="{_label_value(label)}"}} {_number(value)}\n')
+
+    if sampler is not None:
+        scheduler = sampler.scheduler
+        out.write(
+            "# HELP system_monitor_sampler_ticks_total Samples taken.\n"
+            "# TYPE system_monitor_sampler_ticks_total counter\n"
+            f"system_monitor_sampler_ticks_total {scheduler.ticks}\n"
+            "# HELP system_monitor_sampler_missed_ticks_total Ticks skipped because sampling overran.\n"
+            "# TYPE system_monitor_sampler_missed_ticks_total counter\n"
+            f"system_monitor_sampler_missed_ticks_total {scheduler.missed_ticks}\n"
+            "# HELP system_monitor_sampler_interval_seconds Current sampling interval.\n"
+            "# TYPE system_monitor_sampler_interval_seconds gauge\n"
+            f"system_monitor_sampler_interval_seconds {_number(scheduler.interval_seconds)}\n"
+        )
+
+    if SELF_PROFILER.enabled:
+        out.write("# HELP system_monitor_stage_seconds Time the monitor spends in each hot path.\n")
+        out.write("# TYPE system_monitor_stage_seconds summary\n")
+        for stage, histogram in sorted(SELF_PROFILER.histograms().items()):
+            label = _label_value(stage)
+            for _, fraction in PERCENTILES:
+                quantile = _number(histogram.percentile(fraction))
+                out.write(f'system_monitor_stage_seconds{{stage="{label}",quantile="{fraction}"}} {quantile}\n')
+            out.write(f'system_monitor_stage_seconds_sum{{stage="{label}"}} {_number(histogram.total)}\n')
+            out.write(f'system_monitor_stage_seconds_count{{stage="{label}"}} {histogram.count}\n')
+    return out.getvalue()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    server: _MetricsHTTPServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+        url = urlsplit(self.path)
+        if url.path == "/metrics":
+            self._send_metrics()
+        elif url.path == "/history":
+            self._send_history(parse_qs(url.query))
+        else:
+            self._send_plain(404, "not found; try /metrics or /history?since=SECONDS\n")
+
+    def _send_plain(self, status: int, text: str) -> None:
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_metrics(self) -> None:
+        # The body was rendered once on the sampler thread; every scrape just writes the cached bytes.
+        body = self.server.metrics.payload()
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_history(self, query: dict[str, list[str]]) -> None:
+        history = self.server.metrics.history
+        if history is None:
+            self._send_plain(404, "no history store attached\n")
+            return
+        try:
+            since = float(query.get("since", ["0"])[0])
+        except ValueError:
+            self._send_plain(400, "since must be a number of elapsed seconds\n")
+            return
+        rows = history.raw_since(since)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        columns = ("elapsed_seconds",) + tuple(f"{metric}_percent" for metric in history.metrics)
+        self._write_chunk((",".join(columns) + "\n").encode("utf-8"))
+        for start in range(0, len(rows), HISTORY_CHUNK_ROWS):
+            text = io.StringIO()
+            np.savetxt(text, rows[start : start + HISTORY_CHUNK_ROWS], delimiter=",", fmt="%.6g")
+            self._write_chunk(text.getvalue().encode("utf-8"))
+        self._write_chunk(b"")
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - http.server signature
+        return
+
+
+class _MetricsHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], metrics: MetricsServer) -> None:
+        self.metrics = metrics
+        super().__init__(address, _MetricsHandler)
+
+
+class MetricsServer:
+    # `--serve-metrics`: a threaded HTTP server on its own daemon thread. `update` is a sampler
+    # listener that renders the Prometheus payload once per sample; scrapes only copy those bytes out,
+    # so neither many scrapers nor a slow one can hold up sampling. Process CPU and RSS are refreshed
+    # at render time as well.
+    def __init__(self, address: tuple[str, int]) -> None:
+        self.history: TieredHistory | None = None
+        self.sampler: BackgroundSampler | None = None
+        self._process = psutil.Process(os.getpid())
+        self._payload = self._render(None)
+        self._httpd = _MetricsHTTPServer(address, self)
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="system-monitor-metrics-http", daemon=True
+        )
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._httpd.server_address[:2]
+
+    def attach(self, sampler: BackgroundSampler, history: TieredHistory | None = None) -> None:
+        self.sampler = sampler
+        self.history = history
+        sampler.add_listener(self.update)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def payload(self) -> bytes:
+        return self._payload
+
+    def update(self, snapshot: SystemSnapshot) -> None:
+        # Swapping the bytes reference is atomic, so handler threads never see a half-built payload.
+        self._payload = self._render(snapshot)
+
+    def _render(self, snapshot: SystemSnapshot | None) -> bytes:
+        text = render_prometheus(snapshot, self.sampler if snapshot is not None else None)
+        text += (
+            "# TYPE process_cpu_seconds_total counter\n"
+            f"process_cpu_seconds_total {_number(time.process_time())}\n"
+            "# TYPE process_resident_memory_bytes gauge\n"
+            f"process_resident_memory_bytes {self._process.memory_info().rss}\n"
+        )
+        return text.encode("utf-8")
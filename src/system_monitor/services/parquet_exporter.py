@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.binary_exporter import RECORD_DTYPE, captured_at_ns
+from system_monitor.services.buffered_exporter import BufferedExporter, FlushPolicy
+from system_monitor.services.metric_vectors import VectorLayout, aligned_values, layout_width
+
+# One row group per flush, so I default to a time-based policy that yields reasonably sized groups.
+DEFAULT_PARQUET_FLUSH_POLICY = FlushPolicy(max_seconds=10.0)
+
+
+def _parquet_schema(vector_layout: VectorLayout | None = None):
+    # Vector metrics are fixed-size float32 list columns; their labels live in the schema metadata.
+    vector_layout = vector_layout or {}
+    vector_fields = [(name, pa.list_(pa.float32(), len(labels))) for name, labels in vector_layout.items()]
+    metadata = {"vector_labels": json.dumps({name: list(labels) for name, labels in vector_layout.items()})}
+    return pa.schema(
+        [
+            # Epoch nanoseconds like the binary format's, so readers in any time zone agree on the instant.
+            ("captured_at", pa.timestamp("ns", tz="UTC")),
+            ("elapsed_seconds", pa.float64()),
+            ("uptime_seconds", pa.float64()),
+            ("cpu_percent", pa.float32()),
+            ("ram_percent", pa.float32()),
+            ("disk_percent", pa.float32()),
+            ("process_count", pa.uint32()),
+            ("net_sent_bps", pa.float64()),
+            ("net_recv_bps", pa.float64()),
+        ]
+        + vector_fields,
+        metadata=metadata if vector_layout else None,
+    )
+
+
+class ParquetMetricsExporter(BufferedExporter):
+    def __init__(
+        self,
+        output_path: Path,
+        flush_policy: FlushPolicy | None = None,
+        vector_layout: VectorLayout | None = None,
+    ) -> None:
+        if pa is None:
+            raise RuntimeError(
+                "pyarrow is not installed. I install Parquet support with: pip install 'system-monitor-app[parquet]'"
+            )
+        self.output_path = output_path
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        # A fixed-size list of width 0 is not a useful column, so labels-less vectors (no mounts) are dropped.
+        self.vector_layout = {name: labels for name, labels in (vector_layout or {}).items() if labels}
+        self._schema = _parquet_schema(self.vector_layout)
+        self._columns: dict[str, list] = {field.name: [] for field in self._schema}
+        handle = self.output_path.open("wb")
+        self._parquet_writer = pq.ParquetWriter(handle, self._schema, compression="zstd")
+        super().__init__(handle, policy=flush_policy or DEFAULT_PARQUET_FLUSH_POLICY)
+
+    def _encode(self, snapshot: SystemSnapshot) -> bytes:
+        # The column lists are this exporter's buffer, so a row is staged there and no bytes come back.
+        columns = self._columns
+        columns["captured_at"].append(captured_at_ns(snapshot))
+        columns["elapsed_seconds"].append(snapshot.elapsed_seconds)
+        columns["uptime_seconds"].append(snapshot.uptime_seconds)
+        columns["cpu_percent"].append(snapshot.cpu_percent)
+        columns["ram_percent"].append(snapshot.ram_percent)
+        columns["disk_percent"].append(snapshot.disk_percent)
+        columns["process_count"].append(snapshot.process_count)
+        columns["net_sent_bps"].append(snapshot.net_sent_bps)
+        columns["net_recv_bps"].append(snapshot.net_recv_bps)
+        for name, labels in self.vector_layout.items():
+            columns[name].append(aligned_values(snapshot, name, labels))
+        return b""
+
+    def _buffered_bytes(self) -> int:
+        return self._rows * (RECORD_DTYPE.itemsize + 4 * layout_width(self.vector_layout))
+
+    def _write_buffer(self) -> None:
+        if not self._rows:
+            return
+        columns: dict[str, object] = dict(self._columns)
+        for name, labels in self.vector_layout.items():
+            flat = pa.array(np.concatenate(self._columns[name]), type=pa.float32())
+            columns[name] = pa.FixedSizeListArray.from_arrays(flat, len(labels))
+        table = pa.table(columns, schema=self._schema)
+        self._parquet_writer.write_table(table, row_group_size=self._rows)
+        for values in self._columns.values():
+            values.clear()
+
+    def _close_sink(self) -> None:
+        self._parquet_writer.close()
+        super()._close_sink()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+import heapq
+import time
+
+try:
+    import psutil
+except ModuleNotFoundError:  # pragma: no cover - handled at runtime on launch
+    psutil = None
+
+from system_monitor.models import ProcessInfo, ProcessTable
+
+DEFAULT_TOP_N = 10
+# Wall-clock spent refreshing processes per tick; on hosts with thousands of processes the rest waits its turn.
+DEFAULT_BUDGET_SECONDS = 0.02
+
+ProcessKey = tuple[int, float]
+
+
+@dataclass
+class _TrackedProcess:
+    handle: object
+    name: str
+    cpu_percent: float = 0.0
+    rss_bytes: int = 0
+
+    def info(self, pid: int) -> ProcessInfo:
+        return ProcessInfo(pid=pid, name=self.name, cpu_percent=self.cpu_percent, rss_bytes=self.rss_bytes)
+
+
+class ProcessSampler:
+    def __init__(self, top_n: int = DEFAULT_TOP_N, budget_seconds: float = DEFAULT_BUDGET_SECONDS) -> None:
+        if psutil is None:
+            raise RuntimeError(
+                "psutil is not installed. I install dependencies with: pip install -r requirements.txt"
+            )
+        if top_n < 1:
+            raise ValueError("top_n must be at least 1")
+        self.top_n = top_n
+        self.budget_seconds = max(0.0, budget_seconds)
+        # Handles are keyed by (pid, create_time) so a recycled pid never inherits another process's CPU delta.
+        self._tracked: dict[ProcessKey, _TrackedProcess] = {}
+        self._keys_by_pid: dict[int, ProcessKey] = {}
+        self._rotation: deque[ProcessKey] = deque()
+        self._hot: list[ProcessKey] = []
+
+    def __len__(self) -> int:
+        return len(self._tracked)
+
+    def sample(self) -> ProcessTable:
+        started = time.perf_counter()
+        deadline = started + self.budget_seconds
+        live_pids = set(psutil.pids())
+
+        for pid in [pid for pid in self._keys_by_pid if pid not in live_pids]:
+            self._evict(self._keys_by_pid[pid])
+
+        # New processes are discovered lazily too: creating a handle costs a /proc read per pid.
+        new_pids = [pid for pid in live_pids if pid not in self._keys_by_pid]
+        refreshed: set[ProcessKey] = set()
+        for pid in new_pids:
+            if refreshed and time.perf_counter() >= deadline:
+                break
+            key = self._track(pid)
+            if key is not None and self._refresh(key):
+                refreshed.add(key)
+
+        # The current leaders are refreshed every tick so the table never shows stale top rows;
+        # everything else is revisited round-robin within whatever budget remains.
+        for key in self._hot:
+            if key in self._tracked and key not in refreshed and self._refresh(key):
+                refreshed.add(key)
+        # The rotation always advances at least one process so a tight budget cannot starve it.
+        rotated = 0
+        for _ in range(len(self._rotation)):
+            if rotated and time.perf_counter() >= deadline:
+                break
+            key = self._rotation.popleft()
+            if key not in self._tracked:
+                continue
+            self._rotation.append(key)
+            if key not in refreshed and self._refresh(key):
+                refreshed.add(key)
+                rotated += 1
+
+        top_cpu = heapq.nlargest(self.top_n, self._tracked.items(), key=lambda item: item[1].cpu_percent)
+        top_rss = heapq.nlargest(self.top_n, self._tracked.items(), key=lambda item: item[1].rss_bytes)
+        self._hot = list(dict.fromkeys(key for key, _ in top_cpu + top_rss))
+        return ProcessTable(
+            top_cpu=tuple(tracked.info(key[0]) for key, tracked in top_cpu),
+            top_rss=tuple(tracked.info(key[0]) for key, tracked in top_rss),
+            process_count=len(live_pids),
+            refreshed_count=len(refreshed),
+            sample_seconds=time.perf_counter() - started,
+        )
+
+    def _track(self, pid: int) -> ProcessKey | None:
+        try:
+            handle = psutil.Process(pid)
+            with handle.oneshot():
+                key = (pid, handle.create_time())
+                name = handle.name()
+        except (psutil.NoSuchProcess, psutil.ZombieProcess, psutil.AccessDenied):
+            return None
+        self._tracked[key] = _TrackedProcess(handle=handle, name=name)
+        self._keys_by_pid[pid] = key
+        self._rotation.append(key)
+        return key
+
+    def _refresh(self, key: ProcessKey) -> bool:
+        tracked = self._tracked[key]
+        try:
+            # psutil reads CPU and memory by pid alone, so a pid reused since the last tick would report
+            # the new process's usage under the old handle; is_running() compares create_time.
+            if not tracked.handle.is_running():
+                self._evict(key)
+                replacement = self._track(key[0])
+                return replacement is not None and self._refresh(replacement)
+            with tracked.handle.oneshot():
+                # The first call per handle primes psutil's CPU-time baseline and reports 0.0.
+                tracked.cpu_percent = tracked.handle.cpu_percent(interval=None)
+                tracked.rss_bytes = tracked.handle.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            self._evict(key)
+            return False
+        except psutil.AccessDenied:
+            return False
+        return True
+
+    def _evict(self, key: ProcessKey) -> None:
+        # The rotation queue drops evicted keys lazily when it reaches them.
+        self._tracked.pop(key, None)
+        if self._keys_by_pid.get(key[0]) == key:
+            del self._keys_by_pid[key[0]]
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+from datetime import datetime
+import os
+from pathlib import Path
+import re
+import time
+
+import numpy as np
+
+from system_monitor.models import MetricVector, SystemSnapshot
+from system_monitor.services.metric_vectors import (
+    CPU_CORE_PERCENT,
+    MOUNT_PERCENT,
+    MOUNT_READ_BPS,
+    MOUNT_REFRESH_SECONDS,
+    MOUNT_WRITE_BPS,
+    NET_IF_RECV_BPS,
+    NET_IF_SENT_BPS,
+    CounterRates,
+    VectorLayout,
+    block_device_name,
+    core_labels,
+    make_vector,
+)
+
+PROC_ROOT = Path("/proc")
+# The aggregate "cpu" line is first in /proc/stat; reading only this much skips the per-cpu and intr lines.
+STAT_READ_BYTES = 512
+# Upper bound for one "cpuN ..." line, used to size the read when per-core vectors are on.
+STAT_BYTES_PER_CORE = 256
+INITIAL_BUFFER_BYTES = 16 * 1024
+DISKSTATS_SECTOR_BYTES = 512
+_MOUNT_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+
+def _usage_percent(used: float, total: float) -> float:
+    return round(used / total * 100.0, 1) if total > 0 else 0.0
+
+
+def _statvfs_percent(path: str) -> float:
+    stats = os.statvfs(path)
+    used = (stats.f_blocks - stats.f_bfree) * stats.f_frsize
+    return _usage_percent(used, used + stats.f_bavail * stats.f_frsize)
+
+
+def _cpu_fields(line: bytes) -> list[int]:
+    # user nice system idle iowait irq softirq steal guest guest_nice
+    fields = [int(value) for value in line.split()[1:11]]
+    return fields + [0] * (10 - len(fields))
+
+
+class ProcfsStatsService:
+    # Linux-only fast path: the /proc files stay open and each sample rereads them with pread into one
+    # reused buffer, parsing only the fields the snapshot needs. The numbers match SystemStatsService.
+    def __init__(
+        self,
+        proc_root: Path = PROC_ROOT,
+        disk_path: str | None = None,
+        collect_vectors: bool = False,
+    ) -> None:
+        self.proc_root = Path(proc_root)
+        if not (self.proc_root / "stat").exists():
+            raise RuntimeError(f"{self.proc_root} is not a procfs mount. I use --backend psutil on this platform.")
+        self.disk_path = disk_path or str(Path.home().anchor)
+        self.collect_vectors = collect_vectors
+        self._buffer = bytearray(INITIAL_BUFFER_BYTES)
+        self._stat_fd = os.open(self.proc_root / "stat", os.O_RDONLY)
+        self._meminfo_fd = os.open(self.proc_root / "meminfo", os.O_RDONLY)
+        self._net_dev_fd = os.open(self.proc_root / "net" / "dev", os.O_RDONLY)
+        self._root_fd = os.open(self.proc_root, os.O_RDONLY | os.O_DIRECTORY)
+        self._diskstats_fd = -1
+        self._stat_read_bytes = STAT_READ_BYTES
+        if collect_vectors:
+            self._diskstats_fd = os.open(self.proc_root / "diskstats", os.O_RDONLY)
+            self._stat_read_bytes += STAT_BYTES_PER_CORE * (os.cpu_count() or 1)
+
+        self._started_monotonic = time.monotonic()
+        self._boot_time = self._read_boot_time()
+        self._core_labels: tuple[str, ...] = ()
+        self._last_core_times = np.zeros((0, 2), dtype=np.int64)
+        self._net_recv_rates = CounterRates()
+        self._net_sent_rates = CounterRates()
+        self._disk_read_rates = CounterRates()
+        self._disk_write_rates = CounterRates()
+        self._physical_filesystems: frozenset[str] | None = None
+        self._mounts: list[tuple[str, str]] = []
+        self._mounts_scanned_at: float | None = None
+
+        cpu_lines = self._read_cpu_lines()
+        self._last_cpu_times = self._cpu_times(cpu_lines[0])
+        self._last_net_time = self._started_monotonic
+        self._last_net_counters = self._net_totals(self._read_net_dev())
+        if collect_vectors:
+            self._collect_vectors(self._started_monotonic, cpu_lines)
+
+    def close(self) -> None:
+        for fd in (self._stat_fd, self._meminfo_fd, self._net_dev_fd, self._root_fd, self._diskstats_fd):
+            if fd >= 0:
+                os.close(fd)
+        self._stat_fd = self._meminfo_fd = self._net_dev_fd = self._root_fd = self._diskstats_fd = -1
+
+    def __del__(self) -> None:
+        if getattr(self, "_root_fd", -1) >= 0:
+            self.close()
+
+    def vector_layout(self) -> VectorLayout:
+        interfaces = self._read_net_dev()[0]
+        mount_labels = tuple(mountpoint for mountpoint, _ in self._current_mounts(time.monotonic()))
+        return {
+            CPU_CORE_PERCENT: core_labels(len(self._read_cpu_lines()) - 1),
+            NET_IF_RECV_BPS: interfaces,
+            NET_IF_SENT_BPS: interfaces,
+            MOUNT_PERCENT: mount_labels,
+            MOUNT_READ_BPS: mount_labels,
+            MOUNT_WRITE_BPS: mount_labels,
+        }
+
+    def sample(self) -> SystemSnapshot:
+        now_monotonic = time.monotonic()
+        elapsed_seconds = now_monotonic - self._started_monotonic
+        uptime_seconds = max(0.0, time.time() - self._boot_time)
+
+        cpu_lines = self._read_cpu_lines()
+        cpu_times = self._cpu_times(cpu_lines[0])
+        cpu_percent = self._cpu_percent(self._last_cpu_times, cpu_times)
+        self._last_cpu_times = cpu_times
+
+        net_dev = self._read_net_dev()
+        net_counters = self._net_totals(net_dev)
+        window_seconds = max(now_monotonic - self._last_net_time, 1e-6)
+        net_sent_bps = (net_counters[0] - self._last_net_counters[0]) / window_seconds
+        net_recv_bps = (net_counters[1] - self._last_net_counters[1]) / window_seconds
+        self._last_net_time = now_monotonic
+        self._last_net_counters = net_counters
+        vectors = self._collect_vectors(now_monotonic, cpu_lines, net_dev) if self.collect_vectors else {}
+
+        return SystemSnapshot(
+            captured_at=datetime.now(),
+            elapsed_seconds=elapsed_seconds,
+            uptime_seconds=uptime_seconds,
+            cpu_percent=cpu_percent,
+            ram_percent=self._read_ram_percent(),
+            disk_percent=_statvfs_percent(self.disk_path),
+            process_count=self._process_count(),
+            net_sent_bps=max(0.0, net_sent_bps),
+            net_recv_bps=max(0.0, net_recv_bps),
+            vectors=vectors,
+        )
+
+    def _pread(self, fd: int, limit: int | None = None) -> memoryview:
+        while True:
+            view = memoryview(self._buffer)
+            if limit is not None:
+                view = view[:limit]
+            size = os.preadv(fd, [view], 0)
+            if size < len(view) or (limit is not None and limit <= len(self._buffer)):
+                return view[:size]
+            # The file outgrew the buffer (many interfaces): grow once and keep the larger buffer.
+            self._buffer = bytearray(len(self._buffer) * 2)
+
+    def _read_boot_time(self) -> float:
+        with (self.proc_root / "stat").open("rb") as handle:
+            for line in handle:
+                if line.startswith(b"btime "):
+                    return float(line.split()[1])
+        return time.time() - time.monotonic()
+
+    def _read_cpu_lines(self) -> list[bytes]:
+        # The aggregate line first, then one line per core; a line cut off by the read limit is dropped.
+        lines = self._pread(self._stat_fd, self._stat_read_bytes).tobytes().split(b"\n")[:-1]
+        cpu_lines = []
+        for line in lines:
+            if not line.startswith(b"cpu"):
+                break
+            cpu_lines.append(line)
+        return cpu_lines
+
+    @staticmethod
+    def _cpu_times(line: bytes) -> tuple[int, int]:
+        fields = _cpu_fields(line)
+        # Like psutil on Linux: guest time is already counted in user/nice, and idle includes iowait.
+        total = sum(fields) - fields[8] - fields[9]
+        idle = fields[3] + fields[4]
+        return total, total - idle
+
+    @staticmethod
+    def _cpu_percent(before: tuple[int, int], after: tuple[int, int]) -> float:
+        total_delta = after[0] - before[0]
+        if total_delta <= 0:
+            return 0.0
+        busy_delta = after[1] - before[1]
+        return round(min(100.0, max(0.0, busy_delta / total_delta * 100.0)), 1)
+
+    def _read_ram_percent(self) -> float:
+        data = self._pread(self._meminfo_fd).tobytes()
+        total = self._meminfo_field(data, b"MemTotal:")
+        available = self._meminfo_field(data, b"MemAvailable:")
+        return _usage_percent(total - available, total)
+
+    @staticmethod
+    def _meminfo_field(data: bytes, key: bytes) -> int:
+        start = data.index(key) + len(key)
+        return int(data[start : data.index(b"\n", start)].split()[0])
+
+    def _read_net_dev(self) -> tuple[tuple[str, ...], list[int], list[int]]:
+        data = self._pread(self._net_dev_fd).tobytes()
+        names: list[str] = []
+        recv: list[int] = []
+        sent: list[int] = []
+        # Two header lines, then "iface: rx_bytes ... (8 rx fields) tx_bytes ..." per interface.
+        for line in data.splitlines()[2:]:
+            name, _, counters = line.partition(b":")
+            fields = counters.split()
+            if len(fields) >= 9:
+                names.append(name.strip().decode())
+                recv.append(int(fields[0]))
+                sent.append(int(fields[8]))
+        return tuple(names), recv, sent
+
+    @staticmethod
+    def _net_totals(net_dev: tuple[tuple[str, ...], list[int], list[int]]) -> tuple[int, int]:
+        return sum(net_dev[2]), sum(net_dev[1])
+
+    def _process_count(self) -> int:
+        # listdir on the open directory fd rewinds it instead of resolving the path again.
+        return sum(1 for name in os.listdir(self._root_fd) if name.isdigit())
+
+    def _collect_vectors(
+        self,
+        now_monotonic: float,
+        cpu_lines: list[bytes],
+        net_dev: tuple[tuple[str, ...], list[int], list[int]] | None = None,
+    ) -> dict[str, MetricVector]:
+        core_times = np.array([_cpu_fields(line) for line in cpu_lines[1:]], dtype=np.int64).reshape(-1, 10)
+        total = core_times.sum(axis=1) - core_times[:, 8] - core_times[:, 9]
+        current = np.column_stack((total, total - core_times[:, 3] - core_times[:, 4]))
+        if len(current) != len(self._core_labels):
+            self._core_labels = core_labels(len(current))
+            self._last_core_times = current
+        delta = current - self._last_core_times
+        self._last_core_times = current
+        with np.errstate(divide="ignore", invalid="ignore"):
+            per_core = np.where(delta[:, 0] > 0, delta[:, 1] / delta[:, 0] * 100.0, 0.0)
+        per_core = np.round(np.clip(per_core, 0.0, 100.0), 1)
+
+        interfaces, recv, sent = net_dev if net_dev is not None else self._read_net_dev()
+        mounts = self._current_mounts(now_monotonic)
+        mount_labels = tuple(mountpoint for mountpoint, _ in mounts)
+        usage: list[float] = []
+        for mountpoint, _ in mounts:
+            try:
+                usage.append(_statvfs_percent(mountpoint))
+            except OSError:
+                usage.append(float("nan"))
+        disks = self._read_diskstats()
+        reads = [disks.get(device, (0, 0))[0] for _, device in mounts]
+        writes = [disks.get(device, (0, 0))[1] for _, device in mounts]
+
+        return {
+            CPU_CORE_PERCENT: make_vector(self._core_labels, per_core),
+            NET_IF_RECV_BPS: make_vector(interfaces, self._net_recv_rates.update(interfaces, recv, now_monotonic)),
+            NET_IF_SENT_BPS: make_vector(interfaces, self._net_sent_rates.update(interfaces, sent, now_monotonic)),
+            MOUNT_PERCENT: make_vector(mount_labels, usage),
+            MOUNT_READ_BPS: make_vector(mount_labels, self._disk_read_rates.update(mount_labels, reads, now_monotonic)),
+            MOUNT_WRITE_BPS: make_vector(mount_labels, self._disk_write_rates.update(mount_labels, writes, now_monotonic)),
+        }
+
+    def _current_mounts(self, now_monotonic: float) -> list[tuple[str, str]]:
+        # Same filter as psutil.disk_partitions(all=False): only filesystems not flagged "nodev".
+        if self._mounts_scanned_at is not None and now_monotonic - self._mounts_scanned_at < MOUNT_REFRESH_SECONDS:
+            return self._mounts
+        if self._physical_filesystems is None:
+            filesystems = (self.proc_root / "filesystems").read_text().splitlines()
+            physical = {line.split()[-1] for line in filesystems if line.strip() and not line.startswith("nodev")}
+            physical.add("zfs")
+            self._physical_filesystems = frozenset(physical)
+        mounts: list[tuple[str, str]] = []
+        for line in (self.proc_root / "self" / "mounts").read_text().splitlines():
+            fields = line.split()
+            if len(fields) < 3 or not fields[0] or fields[2] not in self._physical_filesystems:
+                continue
+            mountpoint = _MOUNT_ESCAPE.sub(lambda match: chr(int(match.group(1), 8)), fields[1])
+            mounts.append((mountpoint, block_device_name(fields[0])))
+        self._mounts = mounts
+        self._mounts_scanned_at = now_monotonic
+        return mounts
+
+    def _read_diskstats(self) -> dict[str, tuple[int, int]]:
+        # major minor name reads merged sectors_read ms writes merged sectors_written ...
+        disks: dict[str, tuple[int, int]] = {}
+        for line in self._pread(self._diskstats_fd).tobytes().splitlines():
+            fields = line.split()
+            if len(fields) >= 10:
+                disks[fields[2].decode()] = (
+                    int(fields[5]) * DISKSTATS_SECTOR_BYTES,
+                    int(fields[9]) * DISKSTATS_SECTOR_BYTES,
+                )
+        return disks
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import dataclasses
+from functools import lru_cache
+import math
+from typing import TYPE_CHECKING, Mapping, Sequence
+
+import numpy as np
+
+from system_monitor.models import MetricVector, SystemSnapshot
+from system_monitor.services.metric_vectors import VectorLayout, make_vector
+from system_monitor.services.sliced_window import WINDOW_SLICES, SlicedWindow
+
+if TYPE_CHECKING:
+    from system_monitor.services.sampler import SnapshotSource
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+QUANTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+QUANTILE_WINDOWS = (("1m", 60.0), ("1h", 3600.0))
+# Snapshot attribute -> (min_value, max_value) of its sketches. Smaller values count as 0 and
+# larger ones land in the top bin.
+PERCENT_RANGE = (0.01, 100.0)
+RATE_RANGE = (1.0, 1e12)
+QUANTILE_METRICS = {
+    "cpu_percent": PERCENT_RANGE,
+    "ram_percent": PERCENT_RANGE,
+    "net_sent_bps": RATE_RANGE,
+    "net_recv_bps": RATE_RANGE,
+}
+QUANTILE_SUFFIX = "_quantiles"
+
+
+def quantile_vector_name(metric: str) -> str:
+    return f"{metric}{QUANTILE_SUFFIX}"
+
+
+def quantile_label(quantile: str, window: str) -> str:
+    return f"{quantile}_{window}"
+
+
+QUANTILE_VECTORS = tuple(quantile_vector_name(metric) for metric in QUANTILE_METRICS)
+
+
+@lru_cache(maxsize=None)
+def _bin_values(relative_accuracy: float, min_value: float, max_value: float) -> np.ndarray:
+    gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+    log_gamma = math.log(gamma)
+    keys = np.arange(math.ceil(math.log(min_value) / log_gamma), math.ceil(math.log(max_value) / log_gamma) + 1)
+    # Every value in (gamma^(k-1), gamma^k] is within relative_accuracy of 2 * gamma^k / (gamma + 1).
+    values = np.concatenate(([0.0], 2.0 * gamma**keys / (gamma + 1.0)))
+    values.flags.writeable = False
+    return values
+
+
+class QuantileSketch:
+    # A DDSketch over a fixed value range: one counter per logarithmic bin, so any quantile read
+    # back is within `relative_accuracy` of the exact nearest-rank quantile, adding a value is one
+    # log and one increment, and memory is fixed by the range (463 bins for 0.01-100 at 1%, 1384
+    # for 1 B/s-1 TB/s) however many values go in. Sketches with the same parameters merge by
+    # adding their counters, so windows, hosts and tiers combine without the raw samples.
+    __slots__ = ("relative_accuracy", "min_value", "max_value", "counts", "count", "_log_gamma", "_offset", "_values")
+
+    def __init__(self, min_value: float, max_value: float, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        if not 0.0 < min_value < max_value:
+            raise ValueError("the sketch range needs 0 < min_value < max_value")
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+        self._log_gamma = math.log((1.0 + relative_accuracy) / (1.0 - relative_accuracy))
+        # Bin 0 counts values below min_value; bin i > 0 holds key i + offset.
+        self._offset = math.ceil(math.log(min_value) / self._log_gamma) - 1
+        self._values = _bin_values(relative_accuracy, min_value, max_value)
+        self.counts = np.zeros(len(self._values), dtype=np.int64)
+        self.count = 0
+
+    def _index(self, value: float) -> int:
+        if not value >= self.min_value:
+            return 0
+        return min(math.ceil(math.log(value) / self._log_gamma) - self._offset, len(self.counts) - 1)
+
+    def add(self, value: float) -> None:
+        self.counts[self._index(value)] += 1
+        self.count += 1
+
+    def extend(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        indices = np.zeros(len(values), dtype=np.int64)
+        indexed = values >= self.min_value
+        keys = np.ceil(np.log(values[indexed]) / self._log_gamma).astype(np.int64) - self._offset
+        indices[indexed] = np.minimum(keys, len(self.counts) - 1)
+        self.counts += np.bincount(indices, minlength=len(self.counts))
+        self.count += len(values)
+
+    def compatible(self, other: QuantileSketch) -> bool:
+        return (self.relative_accuracy, self.min_value, self.max_value) == (
+            other.relative_accuracy,
+            other.min_value,
+            other.max_value,
+        )
+
+    def merge(self, other: QuantileSketch) -> None:
+        if not self.compatible(other):
+            raise ValueError("only sketches with the same accuracy and range can be merged")
+        self.counts += other.counts
+        self.count += other.count
+
+    def copy(self) -> QuantileSketch:
+        clone = QuantileSketch(self.min_value, self.max_value, self.relative_accuracy)
+        clone.counts[:] = self.counts
+        clone.count = self.count
+        return clone
+
+    def clear(self) -> None:
+        self.counts[:] = 0
+        self.count = 0
+
+    def quantiles(self, fractions: Sequence[float]) -> np.ndarray:
+        # Nearest rank, like `Histogram.percentile`: the value at rank ceil(fraction * count).
+        count = self.count
+        if count == 0:
+            return np.full(len(fractions), np.nan)
+        ranks = [max(1, math.ceil(fraction * count)) for fraction in fractions]
+        return self._values[self.counts.cumsum().searchsorted(ranks)]
+
+    def quantile(self, fraction: float) -> float:
+        return float(self.quantiles((fraction,))[0])
+
+
+class WindowedSketch(SlicedWindow):
+    # A sketch of the trailing `window_seconds`: one sketch per slice, and `sketch` is their
+    # running sum, so a read is one pass over the bins.
+    __slots__ = ("window_seconds", "sketch", "_parts")
+
+    def __init__(
+        self,
+        window_seconds: float,
+        min_value: float,
+        max_value: float,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        slices: int = WINDOW_SLICES,
+    ) -> None:
+        super().__init__(window_seconds, slices)
+        self.window_seconds = window_seconds
+        self.sketch = QuantileSketch(min_value, max_value, relative_accuracy)
+        self._parts = [QuantileSketch(min_value, max_value, relative_accuracy) for _ in range(slices)]
+
+    def add(self, timestamp: float, value: float) -> None:
+        part = self._parts[self._slot(timestamp)]
+        # Every slice shares the window's parameters, so one bin index serves both.
+        total = self.sketch
+        index = total._index(value)
+        part.counts[index] += 1
+        part.count += 1
+        total.counts[index] += 1
+        total.count += 1
+
+    def extend(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        for timestamp, value in zip(np.asarray(timestamps).tolist(), np.asarray(values).tolist()):
+            self.add(timestamp, value)
+
+    def _reset(self) -> None:
+        for part in self._parts:
+            part.clear()
+        self.sketch.clear()
+
+    def _expire(self, slot: int) -> None:
+        part = self._parts[slot]
+        if part.count:
+            self.sketch.counts -= part.counts
+            self.sketch.count -= part.count
+            part.clear()
+
+    @property
+    def nbytes(self) -> int:
+        return self.sketch.counts.nbytes * (len(self._parts) + 1)
+
+    def quantiles(self, fractions: Sequence[float]) -> np.ndarray:
+        return self.sketch.quantiles(fractions)
+
+
+class QuantileTracker:
+    # Rolling p50/p95/p99 per metric and window, as snapshot vectors named "<metric>_quantiles"
+    # with labels like "p95_1m", so exporters, the shared ring and the metrics endpoint carry
+    # them like any other vector.
+    def __init__(
+        self,
+        metrics: Mapping[str, tuple[float, float]] = QUANTILE_METRICS,
+        windows: Sequence[tuple[str, float]] = QUANTILE_WINDOWS,
+        quantiles: Sequence[tuple[str, float]] = QUANTILES,
+    ) -> None:
+        self.fractions = tuple(fraction for _, fraction in quantiles)
+        self.labels = tuple(quantile_label(quantile, window) for window, _ in windows for quantile, _ in quantiles)
+        self.windows = {
+            metric: {label: WindowedSketch(seconds, *value_range) for label, seconds in windows}
+            for metric, value_range in metrics.items()
+        }
+
+    def layout(self) -> VectorLayout:
+        return {quantile_vector_name(metric): self.labels for metric in self.windows}
+
+    def sketch(self, metric: str, window: str) -> QuantileSketch:
+        return self.windows[metric][window].sketch
+
+    def observe(self, snapshot: SystemSnapshot) -> dict[str, MetricVector]:
+        timestamp = snapshot.elapsed_seconds
+        vectors = {}
+        for metric, windows in self.windows.items():
+            value = getattr(snapshot, metric)
+            for window in windows.values():
+                window.add(timestamp, value)
+            values = np.concatenate([window.quantiles(self.fractions) for window in windows.values()])
+            vectors[quantile_vector_name(metric)] = make_vector(self.labels, values)
+        return vectors
+
+
+class QuantileSource:
+    # Wraps a snapshot source and adds the tracker's vectors to every snapshot it returns. The
+    # sampler, exporters and UI see an ordinary source whose layout has four more vectors.
+    def __init__(self, source: SnapshotSource, tracker: QuantileTracker | None = None) -> None:
+        self.source = source
+        self.tracker = tracker or QuantileTracker()
+
+    def vector_layout(self) -> VectorLayout:
+        layout = dict(self.source.vector_layout())
+        layout.update(self.tracker.layout())
+        return layout
+
+    def next_interval(self, snapshot: SystemSnapshot) -> float:
+        return self.source.next_interval(snapshot)
+
+    def sample(self) -> SystemSnapshot | None:
+        snapshot = self.source.sample()
+        if snapshot is None:
+            return None
+        vectors = dict(snapshot.vectors)
+        vectors.update(self.tracker.observe(snapshot))
+        return dataclasses.replace(snapshot, vectors=vectors)
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import csv
+from dataclasses import replace
+from datetime import datetime
+import gzip
+import json
+from pathlib import Path
+import re
+from typing import Iterator
+
+import numpy as np
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.binary_exporter import RECORD_DTYPE, load_binary_metrics, read_vector_labels
+from system_monitor.services.csv_exporter import CSV_COLUMNS
+from system_monitor.services.exporters import infer_export_format
+from system_monitor.services.metric_vectors import VectorLayout, make_vector
+
+REPLAY_CHUNK_ROWS = 4096
+# "As fast as possible" still goes through the deadline scheduler; every tick is simply overdue.
+MAX_SPEED_INTERVAL_SECONDS = 1e-6
+_VECTOR_COLUMN = re.compile(r"^(?P<name>[a-z_]+)\[(?P<label>.*)\]$")
+
+
+def parse_replay_speed(spec: str) -> float | None:
+    # "1x", "10x", "100", "0.5x" or "max"; None means as fast as possible.
+    text = spec.strip().lower()
+    if text in ("max", "fast", "0", "0x"):
+        return None
+    try:
+        speed = float(text[:-1] if text.endswith("x") else text)
+    except ValueError:
+        raise ValueError(f"invalid replay speed {spec!r}; use e.g. 1x, 10x, 100x or max") from None
+    if speed <= 0:
+        raise ValueError(f"invalid replay speed {spec!r}; use e.g. 1x, 10x, 100x or max")
+    return speed
+
+
+def _replay_format(path: Path) -> str:
+    return infer_export_format(path.with_suffix("") if path.suffix.lower() == ".gz" else path)
+
+
+def _snapshot(captured_at: datetime, values: tuple, vectors: dict) -> SystemSnapshot:
+    elapsed, uptime, cpu, ram, disk, processes, sent, recv = values
+    return SystemSnapshot(
+        captured_at=captured_at,
+        elapsed_seconds=float(elapsed),
+        uptime_seconds=float(uptime),
+        cpu_percent=float(cpu),
+        ram_percent=float(ram),
+        disk_percent=float(disk),
+        process_count=int(processes),
+        net_sent_bps=float(sent),
+        net_recv_bps=float(recv),
+        vectors=vectors,
+    )
+
+
+def _read_binary(path: Path, layout: VectorLayout) -> Iterator[SystemSnapshot]:
+    # The records are memory-mapped, so opening costs nothing and only the chunk being replayed is paged in.
+    records = load_binary_metrics(path)
+    scalar_names = RECORD_DTYPE.names[1:]
+    for start in range(0, len(records), REPLAY_CHUNK_ROWS):
+        chunk = records[start : start + REPLAY_CHUNK_ROWS]
+        captured = chunk["captured_at_ns"].tolist()
+        columns = [chunk[name].tolist() for name in scalar_names]
+        vectors = {name: np.array(chunk[name]) for name in layout}
+        for row, values in enumerate(zip(*columns)):
+            yield _snapshot(
+                datetime.fromtimestamp(captured[row] / 1e9),
+                values,
+                {name: make_vector(labels, vectors[name][row]) for name, labels in layout.items()},
+            )
+
+
+def _open_text(path: Path):
+    if path.suffix.lower() == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return path.open(encoding="utf-8", newline="")
+
+
+def _csv_layout(path: Path) -> VectorLayout:
+    with _open_text(path) as handle:
+        header = next(csv.reader(handle), [])
+    layout: dict[str, list[str]] = {}
+    for column in header[len(CSV_COLUMNS) :]:
+        match = _VECTOR_COLUMN.match(column)
+        if match:
+            layout.setdefault(match["name"], []).append(match["label"])
+    return {name: tuple(labels) for name, labels in layout.items()}
+
+
+def _read_csv(path: Path, layout: VectorLayout) -> Iterator[SystemSnapshot]:
+    # Rows are parsed as they are replayed; nothing beyond the reader's buffer is loaded up front.
+    with _open_text(path) as handle:
+        reader = csv.reader(handle)
+        next(reader, None)
+        scalar_count = len(CSV_COLUMNS)
+        for row in reader:
+            if len(row) < scalar_count:
+                continue
+            vectors = {}
+            position = scalar_count
+            for name, labels in layout.items():
+                values = [float(value) if value else np.nan for value in row[position : position + len(labels)]]
+                vectors[name] = make_vector(labels, values)
+                position += len(labels)
+            yield _snapshot(datetime.fromisoformat(row[0]), tuple(row[1:scalar_count]), vectors)
+
+
+def _parquet_file(path: Path):
+    try:
+        import pyarrow.parquet as pq
+    except ModuleNotFoundError:
+        raise RuntimeError(
+            "pyarrow is not installed. I install Parquet support with: pip install 'system-monitor-app[parquet]'"
+        ) from None
+    return pq.ParquetFile(path)
+
+
+def _parquet_layout(path: Path) -> VectorLayout:
+    metadata = _parquet_file(path).schema_arrow.metadata or {}
+    labels = json.loads(metadata.get(b"vector_labels", b"{}"))
+    return {name: tuple(values) for name, values in labels.items()}
+
+
+def _read_parquet(path: Path, layout: VectorLayout) -> Iterator[SystemSnapshot]:
+    # One record batch at a time, so only the row groups being replayed are decoded.
+    parquet = _parquet_file(path)
+    scalar_names = CSV_COLUMNS[1:]
+    for batch in parquet.iter_batches(batch_size=REPLAY_CHUNK_ROWS):
+        captured_at = batch.column("captured_at")
+        if captured_at.type.tz is None:
+            # Files written before the column was UTC hold naive local times.
+            captured = captured_at.to_pylist()
+        else:
+            captured = [datetime.fromtimestamp(ns / 1e9) for ns in captured_at.cast("int64").to_pylist()]
+        columns = [batch.column(name).to_pylist() for name in scalar_names]
+        vectors = {
+            name: batch.column(name).flatten().to_numpy(zero_copy_only=False).reshape(-1, len(labels))
+            for name, labels in layout.items()
+        }
+        for row, values in enumerate(zip(*columns)):
+            yield _snapshot(
+                captured[row],
+                values,
+                {name: make_vector(labels, vectors[name][row]) for name, labels in layout.items()},
+            )
+
+
+_READERS = {
+    "bin": (read_vector_labels, _read_binary),
+    "csv": (_csv_layout, _read_csv),
+    "parquet": (_parquet_layout, _read_parquet),
+}
+
+
+class ReplaySource:
+    # Streams an export back through the same `sample()` interface as the live stats services.
+    # `next_interval` is the sampler's interval policy: the recorded gap to the next snapshot divided
+    # by the speed, so 10x replays ten recorded seconds per second and speed=None replays flat out.
+    # When the recording runs out `sample()` raises EOFError, which ends the sampler's worker.
+    def __init__(self, path: Path, speed: float | None = 1.0, replay_format: str | None = None) -> None:
+        self.path = Path(path)
+        self.speed = speed
+        self.replay_format = replay_format or _replay_format(self.path)
+        if self.replay_format not in _READERS:
+            raise ValueError(f"cannot replay {self.path}: unknown format {self.replay_format!r}")
+        if self.replay_format == "bin" and self.path.suffix.lower() == ".gz":
+            raise ValueError(f"cannot replay {self.path}: decompress binary segments before replaying them")
+        read_layout, read_records = _READERS[self.replay_format]
+        self._layout = read_layout(self.path)
+        self._records = read_records(self.path, self._layout)
+        self._offset = 0.0
+        self._last_recorded: float | None = None
+        self.replayed = 0
+        self._next = self._advance()
+
+    def vector_layout(self) -> VectorLayout:
+        return dict(self._layout)
+
+    def _advance(self) -> SystemSnapshot | None:
+        snapshot = next(self._records, None)
+        if snapshot is None:
+            return None
+        recorded = snapshot.elapsed_seconds
+        # An appended recording restarts elapsed time at zero; I shift it so replayed time never runs backwards.
+        if self._last_recorded is not None and recorded + self._offset < self._last_recorded:
+            self._offset = self._last_recorded - recorded
+        self._last_recorded = recorded + self._offset
+        if self._offset:
+            return replace(snapshot, elapsed_seconds=recorded + self._offset)
+        return snapshot
+
+    @property
+    def finished(self) -> bool:
+        return self._next is None
+
+    def sample(self) -> SystemSnapshot:
+        snapshot = self._next
+        if snapshot is None:
+            raise EOFError(f"end of replay {self.path}")
+        self._next = self._advance()
+        self.replayed += 1
+        return snapshot
+
+    def next_interval(self, snapshot: SystemSnapshot) -> float:
+        if self.speed is None or self._next is None:
+            return MAX_SPEED_INTERVAL_SECONDS
+        gap = self._next.elapsed_seconds - snapshot.elapsed_seconds
+        return max(gap / self.speed, MAX_SPEED_INTERVAL_SECONDS)
+
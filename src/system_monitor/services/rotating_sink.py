@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+import gzip
+import os
+from pathlib import Path
+import re
+import shutil
+from typing import BinaryIO
+
+try:
+    import zstandard
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+ROTATION_INTERVALS = ("hourly", "daily")
+COMPRESSIONS = ("gzip", "zstd")
+_COMPRESSED_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+_SEGMENT_STAMP = "%Y%m%d-%H%M%S"
+_COPY_CHUNK = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class RotationPolicy:
+    max_bytes: int | None = None
+    interval: str | None = None
+    compression: str | None = None
+    keep: int | None = None
+
+    @property
+    def rotates(self) -> bool:
+        return self.max_bytes is not None or self.interval is not None
+
+
+def _period_start(moment: datetime, interval: str | None) -> datetime | None:
+    if interval == "hourly":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    if interval == "daily":
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return None
+
+
+def compress_segment(path: Path, compression: str) -> Path:
+    # I write to a `.part` file and rename at the end, so shippers never pick up a half-written archive.
+    target = path.with_name(path.name + _COMPRESSED_SUFFIXES[compression])
+    partial = target.with_name(target.name + ".part")
+    with path.open("rb") as source:
+        if compression == "gzip":
+            with gzip.open(partial, "wb") as destination:
+                shutil.copyfileobj(source, destination, _COPY_CHUNK)
+        else:
+            with partial.open("wb") as raw, zstandard.ZstdCompressor().stream_writer(raw) as destination:
+                shutil.copyfileobj(source, destination, _COPY_CHUNK)
+    os.replace(partial, target)
+    path.unlink()
+    return target
+
+
+class RotatingFileSink:
+    # The live segment always sits at `path` (e.g. metrics.csv). Closed segments are renamed to
+    # `<stem>.<YYYYmmdd-HHMMSS><suffix>` from the time they were opened, then compressed and pruned on a
+    # background worker so the export writer never waits on gzip. Every segment starts with `header`.
+    def __init__(
+        self,
+        path: Path,
+        header: bytes = b"",
+        policy: RotationPolicy | None = None,
+        append: bool = False,
+    ) -> None:
+        self.path = Path(path)
+        self.header = header
+        self.policy = policy or RotationPolicy()
+        if self.policy.interval not in (None, *ROTATION_INTERVALS):
+            raise ValueError(f"unknown rotation interval {self.policy.interval!r}")
+        if self.policy.compression not in (None, *COMPRESSIONS):
+            raise ValueError(f"unknown compression {self.policy.compression!r}")
+        if self.policy.compression == "zstd" and zstandard is None:
+            raise RuntimeError("zstandard is not installed. I install it with: pip install zstandard")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="system-monitor-rotate")
+        self._pending: list[Future] = []
+        self._handle: BinaryIO | None = None
+        self._size = 0
+        self._opened_at = datetime.now()
+        self._open(append)
+
+    @property
+    def segment_size(self) -> int:
+        return self._size
+
+    def _open(self, append: bool) -> None:
+        existing_size = self.path.stat().st_size if self.path.exists() else 0
+        if existing_size and (not append or not self._starts_with_header()):
+            if self.policy.rotates or append:
+                opened_at = datetime.fromtimestamp(self.path.stat().st_mtime)
+                self._retire(self._segment_path(opened_at))
+            existing_size = 0
+        elif existing_size:
+            self._opened_at = datetime.fromtimestamp(self.path.stat().st_mtime)
+
+        if existing_size:
+            self._handle = self.path.open("ab")
+            self._size = existing_size
+        else:
+            self._handle = self.path.open("wb")
+            self._handle.write(self.header)
+            self._size = len(self.header)
+
+    def _starts_with_header(self) -> bool:
+        with self.path.open("rb") as handle:
+            return handle.read(len(self.header)) == self.header
+
+    def _segment_path(self, opened_at: datetime) -> Path:
+        stamp = opened_at.strftime(_SEGMENT_STAMP)
+        candidate = self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}")
+        counter = 1
+        while candidate.exists() or self._compressed_exists(candidate):
+            candidate = self.path.with_name(f"{self.path.stem}.{stamp}-{counter}{self.path.suffix}")
+            counter += 1
+        return candidate
+
+    def _compressed_exists(self, candidate: Path) -> bool:
+        return any(candidate.with_name(candidate.name + suffix).exists() for suffix in _COMPRESSED_SUFFIXES.values())
+
+    def _should_rotate(self, incoming: int, now: datetime) -> bool:
+        if self._size <= len(self.header):
+            return False
+        if self.policy.max_bytes is not None and self._size + incoming > self.policy.max_bytes:
+            return True
+        period = _period_start(now, self.policy.interval)
+        return period is not None and period > self._opened_at
+
+    def write(self, data: bytes) -> int:
+        now = datetime.now()
+        if self._should_rotate(len(data), now):
+            self.rotate(now)
+        written = self._handle.write(data)
+        self._size += len(data)
+        return written
+
+    def flush(self) -> None:
+        self._handle.flush()
+
+    def rotate(self, now: datetime | None = None) -> None:
+        closed_path = self._segment_path(self._opened_at)
+        self._handle.close()
+        self._retire(closed_path)
+        self._handle = self.path.open("wb")
+        self._handle.write(self.header)
+        self._size = len(self.header)
+        self._opened_at = now or datetime.now()
+
+    def _retire(self, closed_path: Path) -> None:
+        os.replace(self.path, closed_path)
+        self._pending = [future for future in self._pending if not future.done()]
+        self._pending.append(self._executor.submit(self._finish_segment, closed_path))
+
+    def _finish_segment(self, closed_path: Path) -> None:
+        # A burst of rotations can queue segments that retention already pruned before I reach them.
+        if self.policy.compression and closed_path.exists():
+            compress_segment(closed_path, self.policy.compression)
+        if self.policy.keep is not None:
+            self._prune(self.policy.keep)
+
+    def closed_segments(self) -> list[Path]:
+        pattern = re.compile(
+            rf"^{re.escape(self.path.stem)}\.(\d{{8}}-\d{{6}})(?:-(\d+))?{re.escape(self.path.suffix)}(?:\.gz|\.zst)?$"
+        )
+        segments = []
+        for candidate in self.path.parent.iterdir():
+            match = pattern.match(candidate.name)
+            if match:
+                segments.append((match.group(1), int(match.group(2) or 0), candidate))
+        return [candidate for _, _, candidate in sorted(segments)]
+
+    def _prune(self, keep: int) -> None:
+        segments = self.closed_segments()
+        for stale in segments[: max(0, len(segments) - keep)]:
+            stale.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        if self._handle is not None and not self._handle.closed:
+            self._handle.close()
+        self._executor.shutdown(wait=True)
+        for future in self._pending:
+            future.result()
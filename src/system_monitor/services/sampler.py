@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from collections import deque
+import sys
+import threading
+import time
+from typing import Callable, Deque, Protocol
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.self_metrics import SELF_PROFILER
+from system_monitor.services.scheduler import DeadlineScheduler
+
+SnapshotListener = Callable[[SystemSnapshot], None]
+# Called on the worker after every sample; returns the interval in seconds until the next one.
+IntervalPolicy = Callable[[SystemSnapshot], float]
+
+
+class SnapshotSource(Protocol):
+    # A source that only relays snapshots (an attached shared ring) returns None when nothing new has arrived.
+    def sample(self) -> SystemSnapshot | None: ...
+
+
+# I keep psutil off the GUI thread: the worker samples on its own cadence, listeners (exporters)
+# run on the worker for every snapshot, and the UI drains a bounded queue that drops the oldest
+# entries when it falls behind, so it only ever renders the latest state. With max_pending=0 the
+# listeners are the only consumers. A listener that raises is reported once on stderr and counted, and
+# the others and the sampling keep going; a source that raises anything but EOFError ends the run.
+class BackgroundSampler:
+    def __init__(
+        self,
+        source: SnapshotSource,
+        interval_ms: int,
+        max_pending: int = 4,
+        interval_policy: IntervalPolicy | None = None,
+        label: str = "sample",
+    ) -> None:
+        self.source = source
+        self.label = label
+        self._listeners_label = f"{label} listeners"
+        self.interval_seconds = max(interval_ms, 1) / 1000.0
+        self._pending: Deque[SystemSnapshot] = deque(maxlen=max(0, max_pending))
+        self._lock = threading.Lock()
+        self._listeners: list[SnapshotListener] = []
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._dropped = 0
+        self.interval_policy = interval_policy
+        # Set when a finite source (a replay) raised EOFError; the worker then ends on its own.
+        self.exhausted = False
+        # The exception that stopped the worker, if the source failed.
+        self.error: Exception | None = None
+        self.listener_errors = 0
+        self._failed_listeners: set[int] = set()
+        self.on_exhausted: Callable[[], None] | None = None
+        self.scheduler = DeadlineScheduler(self.interval_seconds)
+
+    def add_listener(self, listener: SnapshotListener) -> None:
+        self._listeners.append(listener)
+
+    @property
+    def dropped_count(self) -> int:
+        return self._dropped
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="system-monitor-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 2.0) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def drain(self) -> list[SystemSnapshot]:
+        with self._lock:
+            snapshots = list(self._pending)
+            self._pending.clear()
+        return snapshots
+
+    def _publish(self, snapshot: SystemSnapshot) -> None:
+        if self._listeners:
+            with SELF_PROFILER.stage(self._listeners_label):
+                for index, listener in enumerate(self._listeners):
+                    try:
+                        listener(snapshot)
+                    except Exception as error:
+                        self._listener_failed(index, listener, error)
+        if self._pending.maxlen == 0:
+            return
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self._dropped += 1
+            self._pending.append(snapshot)
+
+    def _listener_failed(self, index: int, listener: SnapshotListener, error: Exception) -> None:
+        self.listener_errors += 1
+        if index not in self._failed_listeners:
+            self._failed_listeners.add(index)
+            name = getattr(listener, "__qualname__", repr(listener))
+            print(f"{self.label} listener {name} failed: {error!r}", file=sys.stderr)
+
+    @property
+    def missed_ticks(self) -> int:
+        return self.scheduler.missed_ticks
+
+    def _run(self) -> None:
+        scheduler = self.scheduler
+        scheduler.start()
+        while scheduler.wait(self._stop_event):
+            started = time.monotonic()
+            try:
+                with SELF_PROFILER.stage(self.label):
+                    snapshot = self.source.sample()
+            except EOFError:
+                self.exhausted = True
+                if self.on_exhausted is not None:
+                    self.on_exhausted()
+                return
+            except Exception as error:
+                self.error = error
+                print(f"{self.label} source failed: {error!r}", file=sys.stderr)
+                if self.on_exhausted is not None:
+                    self.on_exhausted()
+                return
+            scheduler.sample_duration.record(time.monotonic() - started)
+            if snapshot is None:
+                scheduler.advance()
+                continue
+            self._publish(snapshot)
+            scheduler.advance()
+            if self.interval_policy is not None:
+                interval = self.interval_policy(snapshot)
+                if interval != scheduler.interval_seconds:
+                    scheduler.set_interval(interval)
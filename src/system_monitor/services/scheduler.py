@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Callable, TextIO
+
+import numpy as np
+
+# Histogram buckets are log-spaced from 1us to ~16s with four buckets per doubling, so relative
+# resolution is ~19% everywhere and recording is one log2 and one increment.
+HISTOGRAM_FLOOR_SECONDS = 1e-6
+HISTOGRAM_BUCKETS_PER_DOUBLING = 4
+HISTOGRAM_BUCKETS = 24 * HISTOGRAM_BUCKETS_PER_DOUBLING
+
+Clock = Callable[[], float]
+
+
+class Histogram:
+    def __init__(self) -> None:
+        self._counts = np.zeros(HISTOGRAM_BUCKETS + 1, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    @staticmethod
+    def bucket_upper_bound(index: int) -> float:
+        return HISTOGRAM_FLOOR_SECONDS * 2.0 ** ((index + 1) / HISTOGRAM_BUCKETS_PER_DOUBLING)
+
+    def record(self, seconds: float) -> None:
+        seconds = max(seconds, 0.0)
+        if seconds <= HISTOGRAM_FLOOR_SECONDS:
+            index = 0
+        else:
+            index = min(
+                int(math.log2(seconds / HISTOGRAM_FLOOR_SECONDS) * HISTOGRAM_BUCKETS_PER_DOUBLING),
+                HISTOGRAM_BUCKETS,
+            )
+        self._counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        # Upper bound of the bucket holding the requested rank, capped at the largest value seen.
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self.count))
+        index = int(np.searchsorted(np.cumsum(self._counts), rank))
+        return min(self.bucket_upper_bound(index), self.maximum)
+
+    def buckets(self) -> list[tuple[float, int]]:
+        # Non-empty (upper bound seconds, count) pairs, for rendering or export.
+        return [(self.bucket_upper_bound(int(index)), int(self._counts[index])) for index in np.flatnonzero(self._counts)]
+
+    def summary(self) -> str:
+        return (
+            f"n={self.count} mean={self.mean * 1e3:.3f}ms p50={self.percentile(0.5) * 1e3:.3f}ms "
+            f"p99={self.percentile(0.99) * 1e3:.3f}ms max={self.maximum * 1e3:.3f}ms"
+        )
+
+
+class DeadlineScheduler:
+    # Tick k is due at origin + k * interval on the monotonic clock, so lateness never accumulates
+    # into drift. If a tick overruns past later deadlines, those ticks are counted as missed and
+    # skipped rather than fired back to back, and the schedule stays on the original grid.
+    def __init__(self, interval_seconds: float, clock: Clock = time.monotonic) -> None:
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive")
+        self.interval_seconds = float(interval_seconds)
+        self._clock = clock
+        self._origin: float | None = None
+        self._tick = 0
+        self.ticks = 0
+        self.missed_ticks = 0
+        self.jitter = Histogram()
+        self.sample_duration = Histogram()
+
+    def start(self) -> None:
+        self._origin = self._clock()
+        self._tick = 0
+
+    @property
+    def next_deadline(self) -> float:
+        if self._origin is None:
+            self.start()
+        return self._origin + self._tick * self.interval_seconds
+
+    def wait(self, stop_event: threading.Event) -> bool:
+        # Returns False when stopped; otherwise records how late we woke relative to the deadline.
+        deadline = self.next_deadline
+        delay = deadline - self._clock()
+        if delay > 0 and stop_event.wait(delay):
+            return False
+        if stop_event.is_set():
+            return False
+        self.jitter.record(self._clock() - deadline)
+        return True
+
+    def advance(self) -> None:
+        self.ticks += 1
+        due = math.floor((self._clock() - self._origin) / self.interval_seconds)
+        skipped = max(0, due - self._tick)
+        self.missed_ticks += skipped
+        self._tick += skipped + 1
+
+    def set_interval(self, interval_seconds: float) -> None:
+        # The grid is rebased on the deadline just served, so the next tick is one new interval after it.
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive")
+        if self._origin is not None and self._tick > 0:
+            self._origin += (self._tick - 1) * self.interval_seconds
+            self._tick = 1
+        self.interval_seconds = float(interval_seconds)
+
+    def summary(self) -> str:
+        return (
+            f"ticks={self.ticks} missed={self.missed_ticks} interval={self.interval_seconds * 1e3:g}ms\n"
+            f"  wake jitter: {self.jitter.summary()}\n"
+            f"  sample time: {self.sample_duration.summary()}"
+        )
+
+    def report(self, stream: TextIO, label: str = "sampler") -> None:
+        stream.write(f"{label} {self.summary()}\n")
+        stream.flush()
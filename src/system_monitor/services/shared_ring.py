@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+from datetime import datetime
+from multiprocessing import resource_tracker, shared_memory
+import os
+import sys
+import time
+
+import numpy as np
+import psutil
+
+from system_monitor.constants import SHARED_RING_NAME
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.binary_exporter import decode_header, encode_header, encode_record_with_vectors, record_dtype
+from system_monitor.services.metric_vectors import VectorLayout, make_vector
+
+DEFAULT_RING_CAPACITY = 16_384
+# A reader that is caught up polls at half the publisher's interval, but never faster than this.
+MIN_POLL_SECONDS = 0.01
+# An overdue tick, so a reader behind the writer catches up back to back.
+CATCH_UP_INTERVAL_SECONDS = 1e-6
+
+# The control block follows the schema header as 64-bit words: head (records ever published),
+# capacity, publisher pid, closed flag, publisher interval (a float64) and the last publish in epoch ns.
+_CONTROL_WORDS = 8
+_HEAD, _CAPACITY, _PID, _CLOSED, _INTERVAL, _PUBLISHED = range(6)
+
+
+def _offsets(header_size: int, capacity: int) -> tuple[int, int]:
+    # (sequence array offset, record array offset); the header is padded to 64 bytes and so is each part.
+    sequences = header_size + 8 * _CONTROL_WORDS
+    return sequences, sequences + -(-8 * capacity // 64) * 64
+
+
+def _control(buffer: memoryview, header_size: int) -> tuple[np.ndarray, np.ndarray]:
+    words = np.ndarray((_CONTROL_WORDS,), dtype="<u8", buffer=buffer, offset=header_size)
+    interval = np.ndarray((1,), dtype="<f8", buffer=buffer, offset=header_size + 8 * _INTERVAL)
+    return words, interval
+
+
+# Before Python 3.13 attaching registers the segment with this process's resource tracker, which
+# unlinks it when the reader exits and pulls the ring out from under the collector. I unregister
+# such attachments again, except for rings this process publishes: the tracker keeps one entry per
+# name, and that entry belongs to the publisher.
+_CAN_SKIP_TRACKING = sys.version_info >= (3, 13)
+_PUBLISHED_HERE: set[str] = set()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    if _CAN_SKIP_TRACKING:
+        return shared_memory.SharedMemory(name=name, track=False)
+    segment = shared_memory.SharedMemory(name=name)
+    if name not in _PUBLISHED_HERE:
+        resource_tracker.unregister(segment._name, "shared_memory")  # noqa: SLF001 - see above
+    return segment
+
+
+def _unlink(segment: shared_memory.SharedMemory, name: str) -> None:
+    # Before 3.13 `unlink` also unregisters the name, so the tracker has to know it first.
+    if not _CAN_SKIP_TRACKING and name not in _PUBLISHED_HERE:
+        resource_tracker.register(segment._name, "shared_memory")  # noqa: SLF001 - see above
+    segment.unlink()
+    _PUBLISHED_HERE.discard(name)
+
+
+class SharedSnapshotRing:
+    # `--share-ring NAME`: the publishing side. The segment holds the binary export header (record
+    # dtype and vector labels), a control block, one sequence word per slot and the fixed-size
+    # records. Each slot is a seqlock: the writer makes its word odd, writes the record, then
+    # stores 2*k+2 for record k, so a reader that sees the same even word before and after its
+    # copy knows the copy is whole. There is one writer (a sampler listener) and no lock at all.
+    def __init__(
+        self,
+        name: str = SHARED_RING_NAME,
+        capacity: int = DEFAULT_RING_CAPACITY,
+        vector_layout: VectorLayout | None = None,
+        interval_seconds: float = 1.0,
+    ) -> None:
+        if capacity < 2:
+            raise ValueError("a shared ring needs at least two slots")
+        self.name = name
+        self.capacity = int(capacity)
+        self.vector_layout = {name: labels for name, labels in (vector_layout or {}).items() if labels}
+        self.dtype = record_dtype(self.vector_layout)
+        header = encode_header(self.dtype, self.vector_layout)
+        sequences, records = _offsets(len(header), self.capacity)
+        self._segment = self._create(name, records + self.dtype.itemsize * self.capacity)
+        buffer = self._segment.buf
+        buffer[: len(header)] = header
+        self._control, interval = _control(buffer, len(header))
+        self._control[:] = 0
+        self._control[_CAPACITY] = self.capacity
+        self._control[_PID] = os.getpid()
+        interval[0] = interval_seconds
+        del interval
+        self._sequences = np.ndarray((self.capacity,), dtype="<u8", buffer=buffer, offset=sequences)
+        self._sequences[:] = 0
+        self._records_offset = records
+        self._record_size = self.dtype.itemsize
+        self._head = 0
+        self._closed = False
+
+    @staticmethod
+    def _create(name: str, size: int) -> shared_memory.SharedMemory:
+        try:
+            segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            segment = SharedSnapshotRing._replace_stale(name, size)
+        _PUBLISHED_HERE.add(name)
+        return segment
+
+    @staticmethod
+    def _replace_stale(name: str, size: int) -> shared_memory.SharedMemory:
+        # A collector that crashed leaves its segment behind; a live one (this process included) keeps it.
+        stale = _attach(name)
+        try:
+            words, interval = _control(stale.buf, decode_header(stale.buf)[2])
+            pid = int(words[_PID])
+            del words, interval
+        except ValueError:
+            pid = 0
+        finally:
+            stale.close()
+        if pid and psutil.pid_exists(pid):
+            raise RuntimeError(f"shared ring {name!r} is already published by pid {pid}; attach to it with --attach")
+        _unlink(stale, name)
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+
+    @property
+    def head(self) -> int:
+        return self._head
+
+    def write(self, snapshot: SystemSnapshot) -> None:
+        if self._closed:
+            return
+        sequence = self._head
+        slot = sequence % self.capacity
+        start = self._records_offset + slot * self._record_size
+        record = encode_record_with_vectors(snapshot, self.vector_layout)
+        self._sequences[slot] = 2 * sequence + 1
+        self._segment.buf[start : start + self._record_size] = record
+        self._sequences[slot] = 2 * sequence + 2
+        self._head = sequence + 1
+        self._control[_PUBLISHED] = time.time_ns()
+        self._control[_HEAD] = self._head
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        # Readers drain what is left and then see the flag; the name goes away now, the memory
+        # once the last reader detaches.
+        self._control[_CLOSED] = 1
+        del self._control, self._sequences
+        self._segment.close()
+        _unlink(self._segment, self.name)
+
+
+class SharedRingReader:
+    # Read-only view of a ring. `records` is a zero-copy structured array over every slot for
+    # scripts that want to look without copying; `read(k)` returns a checked copy of record k,
+    # or None when it has not been written yet. It raises LookupError once k was overwritten.
+    def __init__(self, name: str = SHARED_RING_NAME) -> None:
+        self.name = name
+        try:
+            self._segment = _attach(name)
+        except FileNotFoundError:
+            raise RuntimeError(f"no shared ring named {name!r}; start a collector with --share-ring first") from None
+        buffer = self._segment.buf
+        self.dtype, self.vector_layout, header_size = decode_header(buffer)
+        self._control, self._interval = _control(buffer, header_size)
+        self.capacity = int(self._control[_CAPACITY])
+        sequences, records = _offsets(header_size, self.capacity)
+        self._sequences = np.ndarray((self.capacity,), dtype="<u8", buffer=buffer, offset=sequences)
+        self.records = np.ndarray((self.capacity,), dtype=self.dtype, buffer=buffer, offset=records)
+        self.records.flags.writeable = False
+        self.publisher_pid = int(self._control[_PID])
+
+    @property
+    def head(self) -> int:
+        return int(self._control[_HEAD])
+
+    @property
+    def closed(self) -> bool:
+        return bool(self._control[_CLOSED])
+
+    @property
+    def publisher_interval(self) -> float:
+        return float(self._interval[0])
+
+    @property
+    def oldest(self) -> int:
+        return max(0, self.head - self.capacity)
+
+    def publisher_alive(self) -> bool:
+        return not self.closed and psutil.pid_exists(self.publisher_pid)
+
+    def read(self, sequence: int) -> np.void | None:
+        slot = sequence % self.capacity
+        expected = 2 * sequence + 2
+        before = int(self._sequences[slot])
+        if before < expected:
+            return None
+        if before == expected:
+            record = self.records[slot].copy()
+            if int(self._sequences[slot]) == expected:
+                return record
+        raise LookupError(f"record {sequence} was overwritten")
+
+    def latest(self) -> np.void | None:
+        head = self.head
+        if head == 0:
+            return None
+        try:
+            return self.read(head - 1)
+        except LookupError:
+            return self.latest()
+
+    def close(self) -> None:
+        del self._control, self._interval, self._sequences, self.records
+        self._segment.close()
+
+
+def record_snapshot(record: np.void, vector_layout: VectorLayout) -> SystemSnapshot:
+    return SystemSnapshot(
+        captured_at=datetime.fromtimestamp(int(record["captured_at_ns"]) / 1e9),
+        elapsed_seconds=float(record["elapsed_seconds"]),
+        uptime_seconds=float(record["uptime_seconds"]),
+        cpu_percent=float(record["cpu_percent"]),
+        ram_percent=float(record["ram_percent"]),
+        disk_percent=float(record["disk_percent"]),
+        process_count=int(record["process_count"]),
+        net_sent_bps=float(record["net_sent_bps"]),
+        net_recv_bps=float(record["net_recv_bps"]),
+        vectors={name: make_vector(labels, record[name]) for name, labels in vector_layout.items()},
+    )
+
+
+class SharedRingSource:
+    # `--attach NAME`: a snapshot source that follows a published ring instead of sampling the host.
+    # It starts at the newest record, so a dashboard shows the current state at once.
+    # `sample()` returns None when nothing new has arrived, and `next_interval` is the sampler's
+    # interval policy: back to back while behind, otherwise half the publisher's interval. A reader
+    # that gets lapped skips ahead and counts the records in `lost`. Once the publisher closes the
+    # ring or exits, the rest is drained and `sample()` raises EOFError.
+    def __init__(self, name: str = SHARED_RING_NAME) -> None:
+        self.reader = SharedRingReader(name)
+        self._cursor = max(self.reader.oldest, self.reader.head - 1)
+        self.lost = 0
+        self.received = 0
+
+    def vector_layout(self) -> VectorLayout:
+        return dict(self.reader.vector_layout)
+
+    def sample(self) -> SystemSnapshot | None:
+        reader = self.reader
+        while True:
+            try:
+                record = reader.read(self._cursor)
+            except LookupError:
+                oldest = reader.oldest
+                self.lost += max(oldest - self._cursor, 1)
+                self._cursor = max(oldest, self._cursor + 1)
+                continue
+            if record is not None:
+                self._cursor += 1
+                self.received += 1
+                return record_snapshot(record, reader.vector_layout)
+            if not reader.publisher_alive():
+                raise EOFError(f"shared ring {reader.name!r} was closed by its publisher")
+            return None
+
+    def next_interval(self, snapshot: SystemSnapshot) -> float:
+        if self._cursor < self.reader.head:
+            return CATCH_UP_INTERVAL_SECONDS
+        return max(self.reader.publisher_interval / 2, MIN_POLL_SECONDS)
+
+    def close(self) -> None:
+        self.reader.close()
+
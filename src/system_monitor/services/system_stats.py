@@ -9,11 +9,27 @@ try:
 except ModuleNotFoundError:  # pragma: no cover - handled at runtime on launch
     psutil = None
 
-from system_monitor.models import SystemSnapshot
+from system_monitor.models import MetricVector, SystemSnapshot
+from system_monitor.services.metric_vectors import (
+    CPU_CORE_PERCENT,
+    MOUNT_PERCENT,
+    MOUNT_READ_BPS,
+    MOUNT_REFRESH_SECONDS,
+    MOUNT_WRITE_BPS,
+    NET_IF_RECV_BPS,
+    NET_IF_SENT_BPS,
+    CounterRates,
+    VectorLayout,
+    block_device_name,
+    core_labels,
+    make_vector,
+)
+
+STATS_BACKENDS = ("psutil", "procfs")
 
 
 class SystemStatsService:
-    def __init__(self) -> None:
+    def __init__(self, collect_vectors: bool = False) -> None:
         if psutil is None:
             raise RuntimeError(
                 "psutil is not installed. I install dependencies with: pip install -r requirements.txt"
@@ -23,6 +39,31 @@ class SystemStatsService:
         self._last_net_time = self._started_monotonic
         self._last_net_counters = psutil.net_io_counters()
 
+        # Per-core, per-interface and per-mount vectors are opt-in: they cost a few extra psutil calls.
+        self.collect_vectors = collect_vectors
+        self._core_labels: tuple[str, ...] = ()
+        self._net_recv_rates = CounterRates()
+        self._net_sent_rates = CounterRates()
+        self._disk_read_rates = CounterRates()
+        self._disk_write_rates = CounterRates()
+        self._mounts: list[tuple[str, str]] = []
+        self._mounts_scanned_at: float | None = None
+        if collect_vectors:
+            psutil.cpu_percent(interval=None, percpu=True)
+            self._collect_vectors(self._started_monotonic)
+
+    def vector_layout(self) -> VectorLayout:
+        mount_labels = tuple(mountpoint for mountpoint, _ in self._current_mounts(time.monotonic()))
+        interfaces = tuple(psutil.net_io_counters(pernic=True))
+        return {
+            CPU_CORE_PERCENT: core_labels(psutil.cpu_count() or 1),
+            NET_IF_RECV_BPS: interfaces,
+            NET_IF_SENT_BPS: interfaces,
+            MOUNT_PERCENT: mount_labels,
+            MOUNT_READ_BPS: mount_labels,
+            MOUNT_WRITE_BPS: mount_labels,
+        }
+
     def sample(self) -> SystemSnapshot:
         now_monotonic = time.monotonic()
         elapsed_seconds = now_monotonic - self._started_monotonic
@@ -39,6 +80,7 @@ class SystemStatsService:
         net_recv_bps = (net_counters.bytes_recv - self._last_net_counters.bytes_recv) / window_seconds
         self._last_net_time = now_monotonic
         self._last_net_counters = net_counters
+        vectors = self._collect_vectors(now_monotonic) if self.collect_vectors else {}
 
         return SystemSnapshot(
             captured_at=datetime.now(),
@@ -50,4 +92,55 @@ class SystemStatsService:
             process_count=process_count,
             net_sent_bps=max(0.0, net_sent_bps),
             net_recv_bps=max(0.0, net_recv_bps),
+            vectors=vectors,
         )
+
+    def _current_mounts(self, now_monotonic: float) -> list[tuple[str, str]]:
+        if self._mounts_scanned_at is None or now_monotonic - self._mounts_scanned_at >= MOUNT_REFRESH_SECONDS:
+            self._mounts = [
+                (partition.mountpoint, block_device_name(partition.device))
+                for partition in psutil.disk_partitions(all=False)
+            ]
+            self._mounts_scanned_at = now_monotonic
+        return self._mounts
+
+    def _collect_vectors(self, now_monotonic: float) -> dict[str, MetricVector]:
+        per_core = psutil.cpu_percent(interval=None, percpu=True)
+        if len(per_core) != len(self._core_labels):
+            self._core_labels = core_labels(len(per_core))
+
+        nics = psutil.net_io_counters(pernic=True)
+        interfaces = tuple(nics)
+        recv = self._net_recv_rates.update(interfaces, [nics[name].bytes_recv for name in interfaces], now_monotonic)
+        sent = self._net_sent_rates.update(interfaces, [nics[name].bytes_sent for name in interfaces], now_monotonic)
+
+        mounts = self._current_mounts(now_monotonic)
+        mount_labels = tuple(mountpoint for mountpoint, _ in mounts)
+        usage: list[float] = []
+        for mountpoint, _ in mounts:
+            try:
+                usage.append(psutil.disk_usage(mountpoint).percent)
+            except OSError:
+                usage.append(float("nan"))
+        disks = psutil.disk_io_counters(perdisk=True) or {}
+        reads = [disks[device].read_bytes if device in disks else 0 for _, device in mounts]
+        writes = [disks[device].write_bytes if device in disks else 0 for _, device in mounts]
+
+        return {
+            CPU_CORE_PERCENT: make_vector(self._core_labels, per_core),
+            NET_IF_RECV_BPS: make_vector(interfaces, recv),
+            NET_IF_SENT_BPS: make_vector(interfaces, sent),
+            MOUNT_PERCENT: make_vector(mount_labels, usage),
+            MOUNT_READ_BPS: make_vector(mount_labels, self._disk_read_rates.update(mount_labels, reads, now_monotonic)),
+            MOUNT_WRITE_BPS: make_vector(mount_labels, self._disk_write_rates.update(mount_labels, writes, now_monotonic)),
+        }
+
+
+def create_stats_service(backend: str = "psutil", collect_vectors: bool = False):
+    if backend == "procfs":
+        from system_monitor.services.procfs_stats import ProcfsStatsService
+
+        return ProcfsStatsService(collect_vectors=collect_vectors)
+    if backend == "psutil":
+        return SystemStatsService(collect_vectors=collect_vectors)
+    raise ValueError(f"Unknown stats backend {backend!r}; expected one of {', '.join(STATS_BACKENDS)}")
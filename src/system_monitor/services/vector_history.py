@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from typing import Collection, Mapping
+
+import numpy as np
+
+from system_monitor.models import MetricVector
+
+
+class VectorRing:
+    # The vector counterpart of HistoryBuffer: one preallocated (2*capacity x width) float32 matrix
+    # written row by row and slid back in one copy when full, so reads are contiguous views. When the
+    # label set changes (a NIC or mount appears), I re-lay the matrix out by label and fill the gaps
+    # with NaN instead of dropping the history.
+    def __init__(self, max_points: int) -> None:
+        if max_points < 1:
+            raise ValueError("max_points must be at least 1")
+        self._capacity = int(max_points)
+        self._times = np.zeros(2 * self._capacity, dtype=np.float64)
+        self._data = np.zeros((2 * self._capacity, 0), dtype=np.float32)
+        self._labels: tuple[str, ...] = ()
+        self._end = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def labels(self) -> tuple[str, ...]:
+        return self._labels
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: float, vector: MetricVector) -> None:
+        if vector.labels != self._labels:
+            self._relayout(vector.labels)
+        if self._end == len(self._times):
+            keep = self._capacity - 1
+            self._times[:keep] = self._times[self._end - keep : self._end]
+            self._data[:keep] = self._data[self._end - keep : self._end]
+            self._end = keep
+        self._times[self._end] = timestamp
+        self._data[self._end] = vector.values
+        self._end += 1
+        if self._size < self._capacity:
+            self._size += 1
+
+    def _relayout(self, labels: tuple[str, ...]) -> None:
+        data = np.full((len(self._times), len(labels)), np.nan, dtype=np.float32)
+        old_index = {label: position for position, label in enumerate(self._labels)}
+        for position, label in enumerate(labels):
+            source = old_index.get(label)
+            if source is not None:
+                data[: self._end, position] = self._data[: self._end, source]
+        self._data = data
+        self._labels = labels
+
+    def times(self, size: int | None = None) -> np.ndarray:
+        count = self._size if size is None else max(0, min(int(size), self._size))
+        view = self._times[self._end - count : self._end]
+        view.flags.writeable = False
+        return view
+
+    def matrix(self, size: int | None = None) -> np.ndarray:
+        # Rows are samples (oldest first), columns follow `labels`.
+        count = self._size if size is None else max(0, min(int(size), self._size))
+        view = self._data[self._end - count : self._end]
+        view.flags.writeable = False
+        return view
+
+    def window(self, start: float) -> tuple[np.ndarray, np.ndarray]:
+        times = self.times()
+        first = int(np.searchsorted(times, start, side="left"))
+        return times[first:], self.matrix()[first:]
+
+
+class VectorHistory:
+    # One ring per vector metric, because widths differ and change independently. Vectors named in
+    # `ignore` (derived ones nothing plots, like the rolling percentiles) get no ring.
+    def __init__(self, max_points: int, ignore: Collection[str] = ()) -> None:
+        self.max_points = max_points
+        self.ignore = frozenset(ignore)
+        self._rings: dict[str, VectorRing] = {}
+
+    def append(self, timestamp: float, vectors: Mapping[str, MetricVector]) -> None:
+        for name, vector in vectors.items():
+            if name in self.ignore:
+                continue
+            ring = self._rings.get(name)
+            if ring is None:
+                ring = self._rings[name] = VectorRing(self.max_points)
+            ring.append(timestamp, vector)
+
+    def ring(self, name: str) -> VectorRing | None:
+        return self._rings.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._rings
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque
+
+import numpy as np
+
+
+class SlidingWindowExtrema:
+    # Monotonic deques of (timestamp, value): `_min` is increasing and `_max` decreasing in
+    # value, so the window's extremes always sit at the left end. Every sample is pushed and
+    # popped at most once per deque, which makes updates amortized O(1) and reads O(1).
+    def __init__(self, window_seconds: float) -> None:
+        self.window_seconds = float(window_seconds)
+        self._min: Deque[tuple[float, float]] = deque()
+        self._max: Deque[tuple[float, float]] = deque()
+
+    def push(self, timestamp: float, value: float) -> None:
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((timestamp, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((timestamp, value))
+
+        cutoff = timestamp - self.window_seconds
+        while self._min[0][0] < cutoff:
+            self._min.popleft()
+        while self._max[0][0] < cutoff:
+            self._max.popleft()
+
+    def extend(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        # Same result as pushing every sample in order. A new sample survives in `_min` only if it is
+        # below everything after it, so a reversed running minimum picks the survivors in one pass.
+        if not len(values):
+            return
+        values = np.asarray(values, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        later_min = np.append(np.minimum.accumulate(values[::-1])[::-1][1:], np.inf)
+        later_max = np.append(np.maximum.accumulate(values[::-1])[::-1][1:], -np.inf)
+        lowest, highest = float(values.min()), float(values.max())
+        while self._min and self._min[-1][1] >= lowest:
+            self._min.pop()
+        while self._max and self._max[-1][1] <= highest:
+            self._max.pop()
+        keep_min = values < later_min
+        keep_max = values > later_max
+        self._min.extend(zip(timestamps[keep_min].tolist(), values[keep_min].tolist()))
+        self._max.extend(zip(timestamps[keep_max].tolist(), values[keep_max].tolist()))
+
+        cutoff = float(timestamps[-1]) - self.window_seconds
+        while self._min[0][0] < cutoff:
+            self._min.popleft()
+        while self._max[0][0] < cutoff:
+            self._max.popleft()
+
+    @property
+    def minimum(self) -> float | None:
+        return self._min[0][1] if self._min else None
+
+    @property
+    def maximum(self) -> float | None:
+        return self._max[0][1] if self._max else None
+
+    def bounds(self) -> tuple[float, float] | None:
+        if not self._min:
+            return None
+        return self._min[0][1], self._max[0][1]
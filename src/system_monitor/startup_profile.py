@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+import sys
+import time
+from typing import Iterator, TextIO
+
+
+class StartupProfiler:
+    # Disabled by default so the hooks cost one attribute check; `--profile-startup` enables it.
+    def __init__(self) -> None:
+        self.enabled = False
+        self._origin = time.perf_counter()
+        self._entries: list[tuple[str, float, float]] = []
+        self._reported = False
+
+    def enable(self) -> None:
+        # The origin stays at module import, which is as close to interpreter start as the app gets.
+        self.enabled = True
+
+    @contextmanager
+    def stage(self, label: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._entries.append((label, started - self._origin, time.perf_counter() - started))
+
+    def mark(self, label: str) -> None:
+        if self.enabled:
+            self._entries.append((label, time.perf_counter() - self._origin, 0.0))
+
+    def finish(self, label: str, stream: TextIO | None = None) -> None:
+        if not self.enabled or self._reported:
+            return
+        self.mark(label)
+        self._reported = True
+        self.report(stream or sys.stderr)
+
+    def report(self, stream: TextIO) -> None:
+        stream.write(f"{'startup stage':<36} {'at ms':>9} {'took ms':>9}\n")
+        for label, offset, duration in self._entries:
+            took = f"{duration * 1e3:9.1f}" if duration else f"{'':>9}"
+            stream.write(f"{label:<36} {offset * 1e3:9.1f} {took}\n")
+        stream.flush()
+
+
+STARTUP_PROFILER = StartupProfiler()
@@ -1,4 +1,16 @@
-from system_monitor.ui.main_window import MainWindow
-from system_monitor.ui.splash_screen import SplashScreen
+from __future__ import annotations
 
 __all__ = ["MainWindow", "SplashScreen"]
+
+
+def __getattr__(name: str):
+    # Lazy so importing one window doesn't drag in the other (MainWindow pulls in pyqtgraph).
+    if name == "MainWindow":
+        from system_monitor.ui.main_window import MainWindow
+
+        return MainWindow
+    if name == "SplashScreen":
+        from system_monitor.ui.splash_screen import SplashScreen
+
+        return SplashScreen
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
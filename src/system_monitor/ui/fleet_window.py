@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from PyQt5 import QtCore
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen, QPolygonF
+from PyQt5.QtWidgets import QGridLayout, QMainWindow, QScrollArea, QWidget
+
+from system_monitor.constants import APP_NAME
+from system_monitor.services.fleet import FleetAggregator
+from system_monitor.services.quantile_sketch import QUANTILES
+
+# The dashboard's trace colors; importing them from main_window would pull in pyqtgraph.
+CPU_COLOR = (85, 170, 255)
+RAM_COLOR = (255, 0, 127)
+TILE_WIDTH = 240
+TILE_HEIGHT = 120
+TILE_SPACING = 8
+DEFAULT_FPS = 10.0
+# Hosts that stop sending without disconnecting produce no changes, so I recheck staleness on a timer.
+STALE_CHECK_MS = 1000
+
+
+def _polyline(times: np.ndarray, values: np.ndarray, bounds: QtCore.QRectF, start: float, span: float) -> QPolygonF:
+    # Written straight into the polygon's QPointF storage (two doubles each) instead of one
+    # QPointF object per sample.
+    polygon = QPolygonF(len(times))
+    if not len(times):
+        return polygon
+    pointer = polygon.data()
+    pointer.setsize(len(times) * 2 * 8)
+    points = np.frombuffer(pointer, dtype=np.float64).reshape(-1, 2)
+    points[:, 0] = bounds.left() + (times - start) / span * bounds.width()
+    points[:, 1] = bounds.bottom() - np.clip(values, 0.0, 100.0) / 100.0 * bounds.height()
+    return polygon
+
+
+class SparklineTile(QWidget):
+    # One host: name, latest CPU/RAM and both sparklines over the host's history window, all
+    # painted by hand. With hundreds of tiles a child label or a plot widget per tile would cost
+    # far more than the drawing. `set_series` only keeps the data and schedules a repaint; Qt
+    # coalesces those into one paint pass per frame, and tiles scrolled out of view never build
+    # their polylines at all.
+    def __init__(self, name: str, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.name = name
+        self.stale = False
+        self._series: np.ndarray | None = None
+        self._span_seconds = 1.0
+        self._polylines: tuple[QPolygonF, QPolygonF] | None = None
+        self._latest: tuple[float, float] | None = None
+        self.setFixedSize(TILE_WIDTH, TILE_HEIGHT)
+
+    def _plot_bounds(self) -> QtCore.QRectF:
+        return QtCore.QRectF(6.0, 46.0, TILE_WIDTH - 12.0, TILE_HEIGHT - 52.0)
+
+    def set_series(self, series: np.ndarray, span_seconds: float, stale: bool) -> None:
+        self.stale = stale
+        if len(series):
+            self._series = series
+            self._span_seconds = span_seconds
+            self._polylines = None
+            self._latest = (float(series[-1, 1]), float(series[-1, 2]))
+        self.update()
+
+    def polylines(self) -> tuple[QPolygonF, QPolygonF]:
+        # (cpu, ram), built on the first paint after new data.
+        if self._polylines is None:
+            series = self._series
+            if series is None:
+                return QPolygonF(), QPolygonF()
+            bounds = self._plot_bounds()
+            start = series[-1, 0] - self._span_seconds
+            self._polylines = (
+                _polyline(series[:, 0], series[:, 1], bounds, start, self._span_seconds),
+                _polyline(series[:, 0], series[:, 2], bounds, start, self._span_seconds),
+            )
+        return self._polylines
+
+    def set_stale(self, stale: bool) -> bool:
+        if stale == self.stale:
+            return False
+        self.stale = stale
+        self.update()
+        return True
+
+    def paintEvent(self, event) -> None:  # noqa: N802 (Qt naming)
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(40, 40, 40) if self.stale else QColor(28, 30, 36))
+        painter.setPen(QColor(140, 140, 140) if self.stale else QColor(230, 230, 230))
+        font = QFont(painter.font())
+        font.setBold(True)
+        painter.setFont(font)
+        line = QtCore.QRectF(6, 4, TILE_WIDTH - 12, 20)
+        name = painter.fontMetrics().elidedText(self.name, QtCore.Qt.ElideMiddle, int(line.width()))
+        painter.drawText(line, QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter, name)
+        if self._latest is not None:
+            font.setBold(False)
+            painter.setFont(font)
+            line.translate(0, 20)
+            for text, color, alignment in (
+                (f"CPU {self._latest[0]:.0f}%", CPU_COLOR, QtCore.Qt.AlignLeft),
+                (f"RAM {self._latest[1]:.0f}%", RAM_COLOR, QtCore.Qt.AlignRight),
+            ):
+                painter.setPen(QColor(140, 140, 140) if self.stale else QColor(*color))
+                painter.drawText(line, alignment | QtCore.Qt.AlignVCenter, text)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        cpu, ram = self.polylines()
+        for polyline, color in ((ram, RAM_COLOR), (cpu, CPU_COLOR)):
+            pen = QPen(QColor(*color) if not self.stale else QColor(110, 110, 110), 1.5)
+            painter.setPen(pen)
+            painter.drawPolyline(polyline)
+        painter.end()
+
+
+class FleetWindow(QMainWindow):
+    # `--fleet`: a scrolling grid of `SparklineTile`s, one per agent, sorted by name. Redraws are
+    # batched on one frame timer capped by `--fps`: each frame takes the hosts that changed since
+    # the previous one from the aggregator and touches only their tiles. While minimized nothing
+    # is taken, so the changes pile up as one set and the first frame after restoring draws them.
+    def __init__(self, aggregator: FleetAggregator, fps: float = DEFAULT_FPS) -> None:
+        super().__init__()
+        self.aggregator = aggregator
+        self.tiles: dict[str, SparklineTile] = {}
+        self._columns = 0
+        self._fleet_cpu = ""
+        address = aggregator.address
+        self._listening = address if isinstance(address, str) else f"{address[0] or '*'}:{address[1]}"
+        self.setWindowTitle(f"{APP_NAME} fleet ({self._listening})")
+        self.resize(4 * (TILE_WIDTH + TILE_SPACING) + 40, 4 * (TILE_HEIGHT + TILE_SPACING) + 60)
+
+        self._scroll = QScrollArea(self)
+        self._scroll.setWidgetResizable(True)
+        container = QWidget()
+        self._grid = QGridLayout(container)
+        self._grid.setSpacing(TILE_SPACING)
+        self._grid.setAlignment(QtCore.Qt.AlignTop | QtCore.Qt.AlignLeft)
+        self._scroll.setWidget(container)
+        self.setCentralWidget(self._scroll)
+        self.statusBar().showMessage(f"Waiting for agents on {self._listening}")
+
+        self.frame_timer = QtCore.QTimer(self)
+        self.frame_timer.timeout.connect(self.render_frame)
+        self.frame_timer.start(max(1, int(1000 / max(fps, 0.1))))
+        self.stale_timer = QtCore.QTimer(self)
+        self.stale_timer.timeout.connect(self.refresh_stale)
+        self.stale_timer.start(STALE_CHECK_MS)
+
+    def render_frame(self) -> None:
+        if self.isMinimized():
+            return
+        changed = self.aggregator.take_changed()
+        if not changed:
+            return
+        now = time.monotonic()
+        added = False
+        for host in changed:
+            tile = self.tiles.get(host.name)
+            if tile is None:
+                tile = self.tiles[host.name] = SparklineTile(host.name)
+                added = True
+            tile.set_series(host.series(), host.span_seconds, host.stale(now))
+        if added:
+            self._relayout(force=True)
+        self._refresh_status()
+
+    def refresh_stale(self) -> None:
+        # Also the cadence of the fleet-wide percentiles, which merge a sketch per host.
+        now = time.monotonic()
+        hosts = {host.name: host for host in self.aggregator.hosts()}
+        changed = False
+        for name, tile in self.tiles.items():
+            host = hosts.get(name)
+            if host is not None:
+                changed |= tile.set_stale(host.stale(now))
+        fleet_cpu = self._fleet_cpu
+        if hosts:
+            values = self.aggregator.cpu_quantiles([fraction for _, fraction in QUANTILES])
+            if not np.isnan(values[0]):
+                fleet_cpu = "fleet CPU " + " ".join(
+                    f"{quantile} {value:.0f}%" for (quantile, _), value in zip(QUANTILES, values.tolist())
+                )
+        if changed or fleet_cpu != self._fleet_cpu:
+            self._fleet_cpu = fleet_cpu
+            self._refresh_status()
+
+    def _refresh_status(self) -> None:
+        live = sum(not tile.stale for tile in self.tiles.values())
+        status = f"{len(self.tiles)} hosts, {live} live, "
+        if self._fleet_cpu:
+            status += f"{self._fleet_cpu}, "
+        status += f"listening on {self._listening}"
+        if self.statusBar().currentMessage() != status:
+            self.statusBar().showMessage(status)
+
+    def _relayout(self, force: bool = False) -> None:
+        width = self._scroll.viewport().width()
+        columns = max(1, (width - TILE_SPACING) // (TILE_WIDTH + TILE_SPACING))
+        if columns == self._columns and not force:
+            return
+        self._columns = columns
+        for tile in self.tiles.values():
+            self._grid.removeWidget(tile)
+        for index, name in enumerate(sorted(self.tiles)):
+            self._grid.addWidget(self.tiles[name], index // columns, index % columns)
+
+    def resizeEvent(self, event) -> None:  # noqa: N802 (Qt naming)
+        super().resizeEvent(event)
+        if self.tiles:
+            self._relayout()
@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import math
 import platform
-from typing import Literal
+from typing import Callable, Literal
 
-from PyQt5 import QtCore, uic
+import numpy as np
+
+from PyQt5 import QtCore
+from PyQt5.QtGui import QColor, QKeySequence
 from PyQt5.QtWidgets import (
+    QAbstractItemView,
     QHBoxLayout,
+    QHeaderView,
     QLabel,
     QMainWindow,
     QPushButton,
+    QShortcut,
     QSizePolicy,
+    QSplitter,
+    QTableWidget,
+    QTableWidgetItem,
     QVBoxLayout,
     QWidget,
 )
@@ -17,43 +27,120 @@ from pyqtgraph import PlotWidget
 import pyqtgraph as pg
 
 from system_monitor.constants import APP_NAME, MAIN_UI_FILE
-from system_monitor.models import SystemSnapshot
-from system_monitor.services.csv_exporter import CsvMetricsExporter
-from system_monitor.services.history_buffer import HistoryBuffer
-from system_monitor.services.system_stats import SystemStatsService
-
-GraphMode = Literal["cpu", "ram", "both"]
+from system_monitor.models import ProcessTable, SystemSnapshot
+from system_monitor.services.alerts import AlertEngine
+from system_monitor.services.buffered_exporter import BufferedExporter
+from system_monitor.services.decimation import decimate_view, max_pool_rows
+from system_monitor.services.history_store import HistoryStore, backfill_history
+from system_monitor.services.history_tiers import TieredHistory
+from system_monitor.services.low_power import IdleBackoff
+from system_monitor.services.metric_vectors import CPU_CORE_PERCENT
+from system_monitor.services.process_sampler import ProcessSampler
+from system_monitor.services.quantile_sketch import QUANTILE_VECTORS, QUANTILE_WINDOWS, QUANTILES, quantile_label
+from system_monitor.services.sampler import BackgroundSampler, IntervalPolicy, SnapshotSource
+from system_monitor.services.vector_history import VectorHistory
+from system_monitor.self_metrics import SELF_PROFILER
+from system_monitor.startup_profile import STARTUP_PROFILER
+from system_monitor.ui.progress_ring import ProgressRing
+from system_monitor.ui.ui_loader import load_ui
+
+GraphMode = Literal["cpu", "ram", "both", "cores"]
+
+CPU_COLOR = (85, 170, 255)
+RAM_COLOR = (255, 0, 127)
+# Each graph mode maps to (trace name, history metric, pen color) entries.
+GRAPH_TRACES: dict[str, tuple[tuple[str, str, tuple[int, int, int]], ...]] = {
+    "cpu": (("cpu", "cpu", CPU_COLOR),),
+    "ram": (("ram", "ram", RAM_COLOR),),
+    "both": (("cpu", "cpu", CPU_COLOR), ("ram_combo", "ram", RAM_COLOR)),
+}
+MIN_POLL_INTERVAL_MS = 100
+# Rendering runs on its own clock: every frame drains new samples, and only widgets whose data
+# changed are touched, so a fast sampling rate does not turn into a fast repaint rate.
+DEFAULT_FPS = 10.0
+# While the window is hidden, minimized or unexposed, frames only move samples into the history at
+# this slower cadence; no widget is touched until the window is exposed again.
+HIDDEN_DRAIN_MS = 1000
+SELF_METRICS_INTERVAL_MS = 1000
+# The process table walks every pid, so I refresh it less often than the headline metrics.
+PROCESS_INTERVAL_MS = 2000
+PROCESS_COLUMNS = ("PID", "Name", "CPU %", "RSS MiB")
+# (quantile vector, label, is a rate) rows of the quick-stats percentiles; the strip shows the first window.
+QUANTILE_ROWS = (
+    ("cpu_percent_quantiles", "CPU", False),
+    ("ram_percent_quantiles", "RAM", False),
+    ("net_recv_bps_quantiles", "Down", True),
+    ("net_sent_bps_quantiles", "Up", True),
+)
 
 
 class MainWindow(QMainWindow):
     def __init__(
         self,
-        stats_service: SystemStatsService,
+        stats_service: SnapshotSource,
         history_seconds: int = 30,
         poll_interval_ms: int = 1000,
-        exporter: CsvMetricsExporter | None = None,
+        exporter: BufferedExporter | None = None,
         start_maximized: bool = False,
+        fps: float = DEFAULT_FPS,
+        low_power: bool = False,
+        interval_policy: IntervalPolicy | None = None,
+        history_store: HistoryStore | None = None,
+        alert_engine: AlertEngine | None = None,
+        staged: bool = False,
     ) -> None:
         super().__init__()
-        self.ui = uic.loadUi(str(MAIN_UI_FILE), self)
-        self.setWindowTitle(APP_NAME)
-
         self.stats_service = stats_service
         self.history_seconds = max(10, history_seconds)
-        self.poll_interval_ms = max(250, poll_interval_ms)
+        self.poll_interval_ms = max(MIN_POLL_INTERVAL_MS, poll_interval_ms)
+        self.frame_interval_ms = max(1, round(1000.0 / max(fps, 1.0)))
         self.exporter = exporter
+        self.history_store = history_store
+        self.alert_engine = alert_engine
+        self._alert_version = 0
         self.start_maximized = start_maximized
+        self._interval_policy = interval_policy
+        self._low_power = low_power
 
-        max_points = max(int((self.history_seconds * 1000) / self.poll_interval_ms) + 20, 40)
-        self.history = HistoryBuffer(max_points=max_points)
         self.current_snapshot: SystemSnapshot | None = None
+        self._graph_dirty = True
+        self._labels_dirty = False
+        self._rendering = False
+        self._watched_window = None
+        # The graphs start at zero unless earlier sessions are backfilled at negative elapsed times.
+        self._history_start = 0.0
 
         self.graph_traces: dict[str, pg.PlotDataItem] = {}
         self.graph_targets: dict[str, PlotWidget] = {}
         self.graph_window_seconds = self.history_seconds
-        self.graph_window_points = max(int((self.graph_window_seconds * 1000) / self.poll_interval_ms), 1)
         self.current_graph: GraphMode = "cpu"
 
+        # A staged window is built by whoever runs `build_steps`, one step per event loop turn, so
+        # the splash keeps animating in between; otherwise it is fully built here.
+        if not staged:
+            for _, step in self.build_steps():
+                step()
+
+    def build_steps(self) -> list[tuple[str, Callable[[], None]]]:
+        return [
+            ("load ui", self._build_ui),
+            ("load history", self._load_history),
+            ("build graphs", self._build_graphs),
+            ("build panels", self._build_panels),
+            ("start sampling", self._start_sampling),
+        ]
+
+    def _build_ui(self) -> None:
+        self.ui = load_ui(MAIN_UI_FILE, self)
+        self.setWindowTitle(APP_NAME)
+
+    def _load_history(self) -> None:
+        self.history = TieredHistory.for_window(self.history_seconds, self.poll_interval_ms)
+        self.vector_history = VectorHistory(self.history.raw.capacity, ignore=QUANTILE_VECTORS)
+        # Read before this session writes anything; placed on the timeline once the first live sample arrives.
+        self._backfill = self.history_store.recent(self.history_seconds) if self.history_store else None
+
+    def _build_graphs(self) -> None:
         self.cpu_graph = PlotWidget(title="CPU percent")
         self.ram_graph = PlotWidget(title="RAM percent")
         self._configure_graph(self.cpu_graph)
@@ -64,33 +151,183 @@ class MainWindow(QMainWindow):
             "ram_combo": self.cpu_graph,
         }
 
+        self._build_core_heatmap()
+
         self.ui.gridLayout.addWidget(self.cpu_graph, 0, 0, 1, 3)
         self.ui.gridLayout.addWidget(self.ram_graph, 0, 0, 1, 3)
+        self.ui.gridLayout.addWidget(self.core_heatmap, 0, 0, 1, 3)
 
         self.pushButton.clicked.connect(self.show_cpu_graph)
         self.pushButton_2.clicked.connect(self.show_ram_graph)
 
+    def _build_panels(self) -> None:
         self._build_extra_info_labels()
         self._enable_responsive_window()
         self._build_responsive_layout()
         self._set_static_labels()
+        self.cpu_ring = self._install_ring(self.ui.circularProgressCPU, self.ui.circularContainer, QColor(*CPU_COLOR))
+        self.ram_ring = self._install_ring(self.ui.circularProgressRAM, self.ui.circularContainer_3, QColor(*RAM_COLOR))
+
+    def _start_sampling(self) -> None:
+        # The queue must hold every sample taken between two drains, or the history would lose them.
+        samples_per_drain = math.ceil(max(self.frame_interval_ms, HIDDEN_DRAIN_MS) / self.poll_interval_ms)
+        self.sampler = BackgroundSampler(
+            self.stats_service,
+            self.poll_interval_ms,
+            max_pending=samples_per_drain + 4,
+            interval_policy=self._interval_policy
+            or (IdleBackoff(self.poll_interval_ms / 1000.0) if self._low_power else None),
+        )
+        if self.exporter:
+            self.sampler.add_listener(self.exporter.write)
+        if self.history_store:
+            self.sampler.add_listener(self.history_store.write)
+        if self.alert_engine is not None:
+            self.sampler.add_listener(self.alert_engine.observe)
+            self._build_alerts_label()
+        self.sampler.start()
+
+        # The process table is display-only, so its sampler runs only while the window is exposed.
+        self.process_sampler = BackgroundSampler(
+            ProcessSampler(),
+            max(self.poll_interval_ms, PROCESS_INTERVAL_MS),
+            max_pending=1,
+            label="process sample",
+        )
+        if SELF_PROFILER.enabled:
+            self._build_self_metrics_panel()
 
-        self.system_timer = QtCore.QTimer(self)
-        self.system_timer.timeout.connect(self.refresh_snapshot)
-        self.system_timer.start(self.poll_interval_ms)
-
-        self.graph_timer = QtCore.QTimer(self)
-        self.graph_timer.timeout.connect(self.refresh_graph)
-        self.graph_timer.start(self.poll_interval_ms)
+        self.frame_timer = QtCore.QTimer(self)
+        self.frame_timer.timeout.connect(self.render_frame)
+        # Until the window is exposed it only drains; showing it switches to the --fps cadence.
+        self.frame_timer.start(HIDDEN_DRAIN_MS)
 
         self.show_cpu_graph()
-        self.refresh_snapshot()
+        self._await_first_snapshot()
+
+    @staticmethod
+    def _install_ring(placeholder: QWidget, container: QWidget, color: QColor) -> ProgressRing:
+        # The .ui frame keeps its place in the layout; the painted ring takes over its geometry.
+        ring = ProgressRing(color, parent=placeholder.parentWidget())
+        ring.setGeometry(placeholder.geometry())
+        ring.stackUnder(container)
+        placeholder.hide()
+        ring.show()
+        return ring
+
+    def render_frame(self) -> None:
+        with SELF_PROFILER.stage("refresh_snapshot"):
+            self.refresh_snapshot()
+        if self._rendering and self._graph_dirty:
+            with SELF_PROFILER.stage("refresh_graph"):
+                self.refresh_graph()
+
+    def _build_self_metrics_panel(self) -> None:
+        # Only built with --self-metrics: a status bar toggle showing the monitor's own CPU and RSS,
+        # and an overlay with per-stage latency percentiles (F12 toggles it too).
+        self.self_metrics_button = QPushButton("Self", self)
+        self.self_metrics_button.setCheckable(True)
+        self.self_metrics_button.setFlat(True)
+        self.self_metrics_button.setToolTip("Show where the monitor itself spends its time (F12)")
+        self.statusBar().addPermanentWidget(self.self_metrics_button)
+
+        self.self_metrics_overlay = QLabel(self.ui.centralwidget)
+        self.self_metrics_overlay.setStyleSheet(
+            "QLabel { background-color: rgba(0, 0, 0, 190); color: white; font-family: monospace; "
+            "font-size: 11px; padding: 6px; border-radius: 4px; }"
+        )
+        self.self_metrics_overlay.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents, True)
+        self.self_metrics_overlay.hide()
+
+        self.self_metrics_button.toggled.connect(self._toggle_self_metrics_overlay)
+        QShortcut(QKeySequence("F12"), self, activated=self.self_metrics_button.toggle)
+        self.self_metrics_timer = QtCore.QTimer(self)
+        self.self_metrics_timer.timeout.connect(self.refresh_self_metrics)
+        self.self_metrics_timer.start(SELF_METRICS_INTERVAL_MS)
+
+    def _build_alerts_label(self) -> None:
+        # A permanent status bar badge listing the firing rules; hidden while nothing fires.
+        self.alerts_label = QLabel(self)
+        self.alerts_label.setStyleSheet(
+            "QLabel { background-color: rgb(200, 40, 40); color: white; font-weight: bold; padding: 1px 6px; border-radius: 3px; }"
+        )
+        self.alerts_label.hide()
+        self.statusBar().addPermanentWidget(self.alerts_label)
+
+    def refresh_alerts(self) -> None:
+        # The engine bumps `version` on the sampler thread; a frame only touches the badge after a transition.
+        engine = self.alert_engine
+        if engine is None or engine.version == self._alert_version:
+            return
+        self._alert_version = engine.version
+        firing = engine.firing
+        if not firing:
+            self.alerts_label.hide()
+            return
+        names = ", ".join(event.rule for event in firing)
+        self._set_text(self.alerts_label, f"\u26a0 {len(firing)} alert{'s' if len(firing) > 1 else ''}: {names}")
+        self.alerts_label.setToolTip("\n".join(event.message for event in firing))
+        self.alerts_label.show()
+
+    def _toggle_self_metrics_overlay(self, checked: bool) -> None:
+        self.self_metrics_overlay.setVisible(checked)
+        if checked:
+            self.refresh_self_metrics()
+
+    def refresh_self_metrics(self) -> None:
+        if not self._rendering:
+            return
+        cpu_percent, rss_bytes = SELF_PROFILER.process_usage()
+        self.self_metrics_button.setText(f"Self CPU {cpu_percent:.1f}% | RSS {rss_bytes / 1048576.0:.0f} MiB")
+        overlay = self.self_metrics_overlay
+        if overlay.isVisible():
+            overlay.setText(SELF_PROFILER.format_table())
+            overlay.adjustSize()
+            overlay.move(self.ui.centralwidget.width() - overlay.width() - 24, 24)
+            overlay.raise_()
+
+    def _is_exposed(self) -> bool:
+        if not self.isVisible() or self.isMinimized():
+            return False
+        handle = self.windowHandle()
+        return handle is None or handle.isExposed()
+
+    def _update_render_state(self) -> None:
+        rendering = self._is_exposed()
+        if rendering == self._rendering:
+            return
+        self._rendering = rendering
+        if rendering:
+            self.process_sampler.start()
+            self.frame_timer.setInterval(self.frame_interval_ms)
+            # One catch-up frame redraws the graph from history and the labels from the latest snapshot.
+            self._graph_dirty = True
+            self.render_frame()
+        else:
+            self.process_sampler.stop()
+            self.frame_timer.setInterval(HIDDEN_DRAIN_MS)
+
+    def _await_first_snapshot(self) -> None:
+        # I poll briefly until the sampler's first snapshot lands instead of waiting a full interval.
+        self.render_frame()
+        if self.current_snapshot is None:
+            QtCore.QTimer.singleShot(10, self._await_first_snapshot)
 
     def _configure_graph(self, graph_widget: PlotWidget) -> None:
         graph_widget.getAxis("bottom").setLabel(text="Time since launch (s)")
         graph_widget.getAxis("left").setLabel(text="Percent")
         graph_widget.showGrid(x=True, y=True, alpha=0.25)
 
+    def _build_core_heatmap(self) -> None:
+        # One ImageItem holds the whole (time x core) matrix, so a tick costs a single setImage.
+        self.core_heatmap = PlotWidget(title="Per-core CPU percent")
+        self.core_heatmap.getAxis("bottom").setLabel(text="Time since launch (s)")
+        self.core_heatmap.getAxis("left").setLabel(text="Core")
+        self.heatmap_image = pg.ImageItem()
+        self.heatmap_image.setLookupTable(pg.colormap.get("viridis").getLookupTable(nPts=256))
+        self.core_heatmap.addItem(self.heatmap_image)
+        self.core_heatmap.hide()
+
     def _build_extra_info_labels(self) -> None:
         self.quick_stats_label = QLabel(self.ui.centralwidget)
         self.quick_stats_label.setAlignment(QtCore.Qt.AlignCenter)
@@ -106,6 +343,20 @@ class MainWindow(QMainWindow):
         )
         self.runtime_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
 
+        self.process_table = QTableWidget(0, len(PROCESS_COLUMNS), self.ui.centralwidget)
+        self.process_table.setHorizontalHeaderLabels(PROCESS_COLUMNS)
+        self.process_table.verticalHeader().setVisible(False)
+        self.process_table.verticalHeader().setDefaultSectionSize(20)
+        self.process_table.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.process_table.setStyleSheet("font-size: 11px;")
+        self.process_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.process_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.process_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.process_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.process_table.setSortingEnabled(True)
+        self.process_table.sortByColumn(2, QtCore.Qt.DescendingOrder)
+        self.process_table.setMinimumWidth(340)
+
     def _enable_responsive_window(self) -> None:
         self.setWindowFlag(QtCore.Qt.WindowMinimizeButtonHint, True)
         self.setWindowFlag(QtCore.Qt.WindowMaximizeButtonHint, True)
@@ -148,6 +399,12 @@ class MainWindow(QMainWindow):
         )
         self.both_graph_button.clicked.connect(self.show_both_graph)
         controls_layout.addWidget(self.both_graph_button)
+        self.heatmap_button = QPushButton("Show Core Heatmap", controls_column)
+        self.heatmap_button.setStyleSheet(
+            "QPushButton { background-color: rgb(230, 150, 40); color: white; }"
+        )
+        self.heatmap_button.clicked.connect(self.show_core_heatmap)
+        controls_layout.addWidget(self.heatmap_button)
         controls_layout.addStretch(1)
 
         self.ui.circularProgressBar_Main.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
@@ -162,9 +419,15 @@ class MainWindow(QMainWindow):
         self.ui.gridLayoutWidget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.ui.gridLayoutWidget.setMinimumHeight(220)
 
+        bottom_splitter = QSplitter(QtCore.Qt.Horizontal, self.ui.centralwidget)
+        bottom_splitter.addWidget(self.ui.gridLayoutWidget)
+        bottom_splitter.addWidget(self.process_table)
+        bottom_splitter.setStretchFactor(0, 3)
+        bottom_splitter.setStretchFactor(1, 2)
+
         root_layout.addWidget(header_block)
         root_layout.addWidget(middle_block)
-        root_layout.addWidget(self.ui.gridLayoutWidget, 1)
+        root_layout.addWidget(bottom_splitter, 1)
 
     def _set_static_labels(self) -> None:
         self.ui.label_title.setText(APP_NAME)
@@ -172,60 +435,162 @@ class MainWindow(QMainWindow):
         processor_name = platform.processor().strip() or "Unavailable"
         self.ui.label_2.setText(f"Processor: {processor_name}")
 
-    def refresh_snapshot(self) -> None:
-        snapshot = self.stats_service.sample()
-        self.current_snapshot = snapshot
-        self.history.append(snapshot.elapsed_seconds, snapshot.cpu_percent, snapshot.ram_percent)
+    def _backfill_history(self, first: SystemSnapshot) -> None:
+        with STARTUP_PROFILER.stage("backfill history"):
+            if backfill_history(self.history, self._backfill, first):
+                self._history_start = min(0.0, float(self.history.raw.time_points[0]))
+        self._backfill = None
 
-        if self.exporter:
-            self.exporter.write(snapshot)
+    def refresh_snapshot(self) -> None:
+        snapshots = self.sampler.drain()
+        if snapshots:
+            if self._backfill is not None:
+                self._backfill_history(snapshots[0])
+            for snapshot in snapshots:
+                self.history.append(snapshot.elapsed_seconds, snapshot.cpu_percent, snapshot.ram_percent)
+                if snapshot.vectors:
+                    self.vector_history.append(snapshot.elapsed_seconds, snapshot.vectors)
+            self.current_snapshot = snapshots[-1]
+            self._graph_dirty = True
+            self._labels_dirty = True
+        if not self._rendering:
+            return
 
-        self._set_ring_value(snapshot.cpu_percent, self.ui.labelPercentageCPU, self.ui.circularProgressCPU, "rgba(85, 170, 255, 255)")
-        self._set_ring_value(snapshot.ram_percent, self.ui.labelPercentageRAM, self.ui.circularProgressRAM, "rgba(255, 0, 127, 255)")
-        self.quick_stats_label.setText(
+        process_tables = self.process_sampler.drain()
+        if process_tables:
+            with SELF_PROFILER.stage("process table"):
+                self.refresh_process_table(process_tables[-1])
+        if self._labels_dirty:
+            self._labels_dirty = False
+            self.refresh_labels(self.current_snapshot)
+            self.refresh_alerts()
+
+    def refresh_labels(self, snapshot: SystemSnapshot) -> None:
+        self._set_ring_value(snapshot.cpu_percent, self.ui.labelPercentageCPU, self.cpu_ring)
+        self._set_ring_value(snapshot.ram_percent, self.ui.labelPercentageRAM, self.ram_ring)
+        quick_stats = (
             f"Disk {snapshot.disk_percent:.1f}% | Processes {snapshot.process_count:,} | Net {self._format_rate(snapshot.net_recv_bps)} down"
         )
-        self.runtime_label.setText(
-            f"Uptime {self._format_duration(snapshot.uptime_seconds)} | Capture {snapshot.captured_at.strftime('%H:%M:%S')}"
+        percentiles = self._percentile_rows(snapshot)
+        if percentiles:
+            window = QUANTILE_WINDOWS[0][0]
+            cpu, ram, down = (percentiles[name][window] for name in ("CPU", "RAM", "Down"))
+            quick_stats += (
+                f"\nLast {window}: CPU p50/p95/p99 {'/'.join(f'{value:.0f}' for value in cpu)}%"
+                f" | RAM {'/'.join(f'{value:.0f}' for value in ram)}% | Down p95 {self._format_rate(down[1])}"
+            )
+            self.quick_stats_label.setToolTip(self._percentile_tooltip(percentiles))
+        self._set_text(self.quick_stats_label, quick_stats)
+        self._set_text(
+            self.runtime_label,
+            f"Uptime {self._format_duration(snapshot.uptime_seconds)} | Capture {snapshot.captured_at.strftime('%H:%M:%S')}",
         )
-        self.statusBar().showMessage(
-            f"Upload {self._format_rate(snapshot.net_sent_bps)} | Download {self._format_rate(snapshot.net_recv_bps)}"
+        status = f"Upload {self._format_rate(snapshot.net_sent_bps)} | Download {self._format_rate(snapshot.net_recv_bps)}"
+        if self.statusBar().currentMessage() != status:
+            self.statusBar().showMessage(status)
+        self.statusBar().setToolTip(self.sampler.scheduler.summary())
+        STARTUP_PROFILER.finish("first snapshot rendered")
+
+    @staticmethod
+    def _percentile_rows(snapshot: SystemSnapshot) -> dict[str, dict[str, list[float]]]:
+        # {"CPU": {"1m": [p50, p95, p99], ...}, ...}, empty when the source tracks no percentiles
+        # (an attached ring whose publisher does not).
+        rows: dict[str, dict[str, list[float]]] = {}
+        for vector_name, name, _ in QUANTILE_ROWS:
+            vector = snapshot.vectors.get(vector_name)
+            if vector is None:
+                return {}
+            values = dict(zip(vector.labels, vector.values.tolist()))
+            rows[name] = {
+                window: [values.get(quantile_label(quantile, window), math.nan) for quantile, _ in QUANTILES]
+                for window, _ in QUANTILE_WINDOWS
+            }
+        return rows
+
+    def _percentile_tooltip(self, percentiles: dict[str, dict[str, list[float]]]) -> str:
+        lines = []
+        for _, name, is_rate in QUANTILE_ROWS:
+            for window, values in percentiles[name].items():
+                shown = (self._format_rate(value) if is_rate else f"{value:.1f}%" for value in values)
+                quantiles = " ".join(f"{quantile} {text}" for (quantile, _), text in zip(QUANTILES, shown))
+                lines.append(f"{name} {window}: {quantiles}")
+        return "\n".join(lines)
+
+    def refresh_process_table(self, table: ProcessTable) -> None:
+        rows = table.rows()
+        # Sorting is suspended while filling so rows do not reshuffle under the inserts.
+        self.process_table.setSortingEnabled(False)
+        self.process_table.setRowCount(len(rows))
+        for row, info in enumerate(rows):
+            values = (info.pid, info.name, round(info.cpu_percent, 1), round(info.rss_bytes / 1048576.0, 1))
+            for column, value in enumerate(values):
+                item = QTableWidgetItem()
+                # Numbers go in as DisplayRole data so header clicks sort numerically, not as text.
+                item.setData(QtCore.Qt.DisplayRole, value)
+                if column != 1:
+                    item.setTextAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+                self.process_table.setItem(row, column, item)
+        self.process_table.setSortingEnabled(True)
+        self.process_table.setToolTip(
+            f"Top {len(rows)} of {table.process_count:,} processes by CPU and memory"
         )
 
+    def is_ready(self) -> bool:
+        return self.current_snapshot is not None
+
     def refresh_graph(self) -> None:
+        self._graph_dirty = False
         if len(self.history) == 0:
             return
+        if self.current_graph == "cores":
+            self.refresh_core_heatmap()
+            return
 
-        data_x = self.history.time_points
-        window: list[float]
-        if self.current_graph == "cpu":
-            data_y = self.history.cpu_points
-            self._set_plot_data("cpu", data_x, data_y, (85, 170, 255))
-            window = data_y[-min(len(data_y), self.graph_window_points):]
-        elif self.current_graph == "ram":
-            data_y = self.history.ram_points
-            self._set_plot_data("ram", data_x, data_y, (255, 0, 127))
-            window = data_y[-min(len(data_y), self.graph_window_points):]
-        else:
-            cpu_y = self.history.cpu_points
-            ram_y = self.history.ram_points
-            self._set_plot_data("cpu", data_x, cpu_y, (85, 170, 255))
-            self._set_plot_data("ram_combo", data_x, ram_y, (255, 0, 127))
-            cpu_window = cpu_y[-min(len(cpu_y), self.graph_window_points):]
-            ram_window = ram_y[-min(len(ram_y), self.graph_window_points):]
-            window = cpu_window + ram_window
-
-        if data_x:
-            x_end = data_x[-1]
-            x_start = max(0.0, x_end - self.graph_window_seconds)
-            y_min, y_max = self._tight_range(window)
-            target_graph = self.ram_graph if self.current_graph == "ram" else self.cpu_graph
-            target_graph.setRange(xRange=[x_start, x_end + 0.5], yRange=[y_min, y_max], padding=0.02)
+        target_graph = self.ram_graph if self.current_graph == "ram" else self.cpu_graph
+        pixels = self._plot_width_pixels(target_graph)
+        bounds: list[tuple[float, float]] = []
+        for trace, metric, color in GRAPH_TRACES[self.current_graph]:
+            view = self.history.query(metric, self.graph_window_seconds, pixels)
+            data_x, data_y = decimate_view(view, pixels)
+            self._set_plot_data(trace, data_x, data_y, color)
+            metric_bounds = self.history.bounds(metric)
+            if metric_bounds is not None:
+                bounds.append(metric_bounds)
+
+        x_end = self.history.latest_time or 0.0
+        x_start = max(self._history_start, x_end - self.graph_window_seconds)
+        y_min, y_max = self._tight_range(bounds)
+        target_graph.setRange(xRange=[x_start, x_end + 0.5], yRange=[y_min, y_max], padding=0.02)
+
+    def refresh_core_heatmap(self) -> None:
+        ring = self.vector_history.ring(CPU_CORE_PERCENT)
+        if ring is None or len(ring) == 0:
+            return
+        x_end = float(ring.times()[-1])
+        # Same x-axis as the line graphs, which start before 0 when the history store backfilled them.
+        x_start = max(self._history_start, x_end - self.graph_window_seconds)
+        times, matrix = ring.window(x_start)
+        # Samples are pooled down to about one row per horizontal pixel before the upload.
+        image = np.nan_to_num(max_pool_rows(matrix, self._plot_width_pixels(self.core_heatmap)), nan=0.0)
+        with SELF_PROFILER.stage("setImage"):
+            self.heatmap_image.setImage(image, autoLevels=False, levels=(0.0, 100.0))
+        first = float(times[0])
+        self.heatmap_image.setRect(QtCore.QRectF(first, 0.0, max(x_end - first, 1e-3), image.shape[1]))
+        self.core_heatmap.setRange(xRange=[x_start, x_end + 0.5], yRange=[0, image.shape[1]], padding=0.0)
+
+    @staticmethod
+    def _plot_width_pixels(graph_widget: PlotWidget) -> int:
+        width = int(graph_widget.getPlotItem().getViewBox().width())
+        if width < 2:
+            width = graph_widget.width()
+        return max(width, 100)
 
     def show_cpu_graph(self) -> None:
+        self._graph_dirty = True
         self.current_graph = "cpu"
         self.cpu_graph.setTitle("CPU percent")
         self.ram_graph.hide()
+        self.core_heatmap.hide()
         self.cpu_graph.show()
         self.pushButton.setEnabled(False)
         self.pushButton_2.setEnabled(True)
@@ -238,11 +603,14 @@ class MainWindow(QMainWindow):
         self.both_graph_button.setStyleSheet(
             "QPushButton { background-color: rgb(72, 195, 135); color: white; }"
         )
+        self._reset_heatmap_button()
 
     def show_ram_graph(self) -> None:
+        self._graph_dirty = True
         self.current_graph = "ram"
         self.ram_graph.setTitle("RAM percent")
         self.cpu_graph.hide()
+        self.core_heatmap.hide()
         self.ram_graph.show()
         self.pushButton_2.setEnabled(False)
         self.pushButton.setEnabled(True)
@@ -255,11 +623,14 @@ class MainWindow(QMainWindow):
         self.both_graph_button.setStyleSheet(
             "QPushButton { background-color: rgb(72, 195, 135); color: white; }"
         )
+        self._reset_heatmap_button()
 
     def show_both_graph(self) -> None:
+        self._graph_dirty = True
         self.current_graph = "both"
         self.cpu_graph.setTitle("CPU and RAM percent")
         self.ram_graph.hide()
+        self.core_heatmap.hide()
         self.cpu_graph.show()
         self.pushButton.setEnabled(True)
         self.pushButton_2.setEnabled(True)
@@ -273,46 +644,65 @@ class MainWindow(QMainWindow):
         self.both_graph_button.setStyleSheet(
             "QPushButton { background-color: lightblue; }"
         )
+        self._reset_heatmap_button()
+
+    def show_core_heatmap(self) -> None:
+        self._graph_dirty = True
+        self.current_graph = "cores"
+        self.cpu_graph.hide()
+        self.ram_graph.hide()
+        self.core_heatmap.show()
+        self.pushButton.setEnabled(True)
+        self.pushButton_2.setEnabled(True)
+        self.both_graph_button.setEnabled(True)
+        self.heatmap_button.setEnabled(False)
+        self.pushButton.setStyleSheet(
+            "QPushButton { background-color: rgba(85, 170, 255, 255); color: white; }"
+        )
+        self.pushButton_2.setStyleSheet(
+            "QPushButton { background-color: rgb(255, 44, 174); color: white; }"
+        )
+        self.both_graph_button.setStyleSheet(
+            "QPushButton { background-color: rgb(72, 195, 135); color: white; }"
+        )
+        self.heatmap_button.setStyleSheet("QPushButton { background-color: lightblue; }")
+
+    def _reset_heatmap_button(self) -> None:
+        self.heatmap_button.setEnabled(True)
+        self.heatmap_button.setStyleSheet(
+            "QPushButton { background-color: rgb(230, 150, 40); color: white; }"
+        )
 
     def _set_plot_data(
         self,
         name: str,
-        data_x: list[float],
-        data_y: list[float],
+        data_x: np.ndarray,
+        data_y: np.ndarray,
         color: tuple[int, int, int],
     ) -> None:
         if name not in self.graph_traces:
             target = self.graph_targets.get(name, self.cpu_graph)
             self.graph_traces[name] = target.getPlotItem().plot(pen=pg.mkPen(color, width=3))
-        self.graph_traces[name].setData(data_x, data_y)
+        with SELF_PROFILER.stage("setData"):
+            self.graph_traces[name].setData(data_x, data_y)
 
     def _clear_trace(self, name: str) -> None:
         if name in self.graph_traces:
             self.graph_traces[name].setData([], [])
 
-    def _set_ring_value(self, value: float, label: QLabel, progress_bar, color: str) -> None:
+    def _set_ring_value(self, value: float, label: QLabel, ring: ProgressRing) -> None:
         html_text = (
             '<p align="center"><span style=" font-size:50pt;">{VALUE}</span>'
             '<span style=" font-size:40pt; vertical-align:super;">%</span></p>'
         )
-        label.setText(html_text.replace("{VALUE}", f"{value:.1f}"))
-        self._apply_progress_bar(value, progress_bar, color)
-
-    def _apply_progress_bar(self, value: float, widget, color: str) -> None:
-        style = (
-            "QFrame{"
-            "border-radius: 110px;"
-            "background-color: qconicalgradient(cx:0.5, cy:0.5, angle:90, "
-            "stop:{STOP_1} rgba(255, 0, 127, 0), stop:{STOP_2} {COLOR});"
-            "}"
-        )
+        self._set_text(label, html_text.replace("{VALUE}", f"{value:.1f}"))
+        ring.set_value(value)
 
-        progress = (100 - value) / 100.0
-        stop_1 = "1.000" if value >= 100 else str(max(progress - 0.001, 0.0))
-        stop_2 = "1.000" if value >= 100 else str(progress)
-        widget.setStyleSheet(
-            style.replace("{STOP_1}", stop_1).replace("{STOP_2}", stop_2).replace("{COLOR}", color)
-        )
+    @staticmethod
+    def _set_text(label: QLabel, text: str) -> None:
+        # setText relayouts and repaints even for identical text, so unchanged values skip it.
+        if label.text() != text:
+            label.setText(text)
 
     @staticmethod
     def _format_rate(bytes_per_second: float) -> str:
@@ -335,17 +725,52 @@ class MainWindow(QMainWindow):
         return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
     @staticmethod
-    def _tight_range(values: list[float]) -> tuple[float, float]:
-        if not values:
+    def _tight_range(bounds: list[tuple[float, float]]) -> tuple[float, float]:
+        if not bounds:
             return 0.0, 100.0
-        low = min(values)
-        high = max(values)
+        low = min(bound[0] for bound in bounds)
+        high = max(bound[1] for bound in bounds)
         if low == high:
             pad = 2.5 if low < 95 else 1.0
             return max(0.0, low - pad), min(100.0, high + pad)
         return max(0.0, low - 2.0), min(100.0, high + 2.0)
 
+    def showEvent(self, event) -> None:  # noqa: N802 (Qt naming)
+        super().showEvent(event)
+        handle = self.windowHandle()
+        if handle is not None and handle is not self._watched_window:
+            # Expose events (occluded, other virtual desktop) go to the QWindow, not to this widget.
+            handle.installEventFilter(self)
+            self._watched_window = handle
+        self._update_render_state()
+
+    def hideEvent(self, event) -> None:  # noqa: N802 (Qt naming)
+        super().hideEvent(event)
+        self._update_render_state()
+
+    def changeEvent(self, event) -> None:  # noqa: N802 (Qt naming)
+        super().changeEvent(event)
+        if event.type() == QtCore.QEvent.WindowStateChange:
+            self._update_render_state()
+
+    def eventFilter(self, watched, event) -> bool:  # noqa: N802 (Qt naming)
+        if watched is self._watched_window and event.type() == QtCore.QEvent.Expose:
+            # I defer the re-check so the catch-up frame runs outside Qt's expose handling.
+            QtCore.QTimer.singleShot(0, self._update_render_state)
+        return super().eventFilter(watched, event)
+
+    def resizeEvent(self, event) -> None:  # noqa: N802 (Qt naming)
+        # Decimation depends on the plot width, so a resize needs a fresh graph on the next frame.
+        self._graph_dirty = True
+        super().resizeEvent(event)
+
     def closeEvent(self, event) -> None:  # noqa: N802 (Qt naming)
+        self.process_sampler.stop()
+        self.sampler.stop()
         if self.exporter:
             self.exporter.close()
+        if self.history_store:
+            self.history_store.close()
+        if self.alert_engine is not None:
+            self.alert_engine.close()
         super().closeEvent(event)
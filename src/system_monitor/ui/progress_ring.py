@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from PyQt5 import QtCore
+from PyQt5.QtGui import QColor, QPainter, QPen
+from PyQt5.QtWidgets import QWidget
+
+# QPainter arcs are specified in 1/16th of a degree.
+FULL_CIRCLE = 360 * 16
+
+
+class ProgressRing(QWidget):
+    # Paints the usage arc directly instead of rebuilding a qconicalgradient stylesheet per tick,
+    # which made Qt's style engine reparse and repolish the frame on every sample. `set_value`
+    # only schedules a repaint when the arc would actually move by at least 1/16th of a degree.
+    def __init__(self, color: QColor, thickness: int = 15, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.color = QColor(color)
+        self.thickness = thickness
+        self._span = 0
+        self.setAttribute(QtCore.Qt.WA_TranslucentBackground, True)
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents, True)
+
+    @property
+    def span(self) -> int:
+        return self._span
+
+    def set_value(self, percent: float) -> bool:
+        span = int(round(max(0.0, min(100.0, percent)) / 100.0 * FULL_CIRCLE))
+        if span == self._span:
+            return False
+        self._span = span
+        self.update()
+        return True
+
+    def paintEvent(self, event) -> None:  # noqa: N802 (Qt naming)
+        if self._span == 0:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        pen = QPen(self.color, self.thickness)
+        pen.setCapStyle(QtCore.Qt.FlatCap)
+        painter.setPen(pen)
+        inset = self.thickness / 2.0
+        bounds = QtCore.QRectF(self.rect()).adjusted(inset, inset, -inset, -inset)
+        # Start at 12 o'clock and run clockwise, like the original conical gradient.
+        painter.drawArc(bounds, 90 * 16, -self._span)
+        painter.end()
@@ -1,22 +1,35 @@
 from __future__ import annotations
 
-from typing import Callable
+import time
+from typing import Generator
 
-from PyQt5 import QtCore, uic
+from PyQt5 import QtCore
 from PyQt5.QtGui import QColor
 from PyQt5.QtWidgets import QGraphicsDropShadowEffect, QMainWindow
 
 from system_monitor.constants import SPLASH_UI_FILE
+from system_monitor.ui.ui_loader import load_ui
+
+# Progress milestones: the splash paints, the dashboard gets built, then the first snapshot lands.
+BUILD_AT_PERCENT = 10.0
+BUILT_PERCENT = 80.0
+WAITING_PERCENT = 95.0
+PROGRESS_STEP = 2.5
+READY_TIMEOUT_SECONDS = 5.0
 
 
 class SplashScreen(QMainWindow):
-    def __init__(self, window_factory: Callable[[], QMainWindow]) -> None:
+    def __init__(self, build: Generator[float, None, QMainWindow]) -> None:
         super().__init__()
-        self.ui = uic.loadUi(str(SPLASH_UI_FILE), self)
-        self.window_factory = window_factory
+        self.ui = load_ui(SPLASH_UI_FILE, self)
+        self.build = build
+        self._building = False
+        self._progress_style: str | None = None
 
         self._counter = 0.0
+        self._target = BUILD_AT_PERCENT
         self._next_label_step = 10
+        self._built_at: float | None = None
         self.main_window: QMainWindow | None = None
 
         self.progress_bar_value(0.0)
@@ -34,34 +47,58 @@ class SplashScreen(QMainWindow):
         self.timer.timeout.connect(self.progress)
         self.timer.start(15)
 
+    def _update_target(self) -> None:
+        # I start the build only after a few animation ticks, so the splash has painted before the
+        # GUI thread spends time importing pyqtgraph and constructing widgets.
+        if self.main_window is None:
+            if self._counter >= BUILD_AT_PERCENT and not self._building:
+                self._building = True
+                QtCore.QTimer.singleShot(0, self._build_step)
+            return
+
+        is_ready = getattr(self.main_window, "is_ready", None)
+        timed_out = time.monotonic() - self._built_at >= READY_TIMEOUT_SECONDS
+        if is_ready is None or is_ready() or timed_out:
+            self._target = 100.0
+        elif self._counter >= BUILT_PERCENT:
+            self._target = WAITING_PERCENT
+
+    def _build_step(self) -> None:
+        # One step per event loop turn: the animation timer and repaints run between steps, and the
+        # progress target follows the fraction of the build done.
+        try:
+            done = next(self.build)
+        except StopIteration as finished:
+            self.main_window = finished.value
+            self._built_at = time.monotonic()
+            self._target = BUILT_PERCENT
+            return
+        self._target = BUILD_AT_PERCENT + done * (BUILT_PERCENT - BUILD_AT_PERCENT)
+        QtCore.QTimer.singleShot(0, self._build_step)
+
     def progress(self) -> None:
+        self._update_target()
+        self._counter = min(self._target, self._counter + PROGRESS_STEP)
         value = self._counter
         html_text = (
             '<p><span style=" font-size:68pt;">{VALUE}</span>'
             '<span style=" font-size:58pt; vertical-align:super;">%</span></p>'
         )
 
-        if value > self._next_label_step:
+        if value >= self._next_label_step:
             self.ui.labelPercentage.setText(html_text.replace("{VALUE}", str(self._next_label_step)))
             self._next_label_step += 10
 
         self.progress_bar_value(1.0 if value >= 100 else value)
 
-        if self.main_window is None and self._counter >= 10:
-            self.main_window = self.window_factory()
-
-        if self._counter > 100:
+        if value >= 100:
             self.timer.stop()
-            if self.main_window is None:
-                self.main_window = self.window_factory()
             if getattr(self.main_window, "start_maximized", False):
                 self.main_window.showMaximized()
             else:
                 self.main_window.show()
             self.close()
 
-        self._counter += 0.5
-
     def progress_bar_value(self, value: float) -> None:
         style_sheet = (
             "QFrame{"
@@ -75,4 +112,7 @@ class SplashScreen(QMainWindow):
         stop_1 = str(max(progress - 0.001, 0.0))
         stop_2 = str(progress)
         new_style = style_sheet.replace("{STOP_1}", stop_1).replace("{STOP_2}", stop_2)
-        self.ui.circularProgress.setStyleSheet(new_style)
+        # Re-applying a stylesheet re-polishes the frame, so a tick that did not move the ring skips it.
+        if new_style != self._progress_style:
+            self._progress_style = new_style
+            self.ui.circularProgress.setStyleSheet(new_style)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import importlib.util
+import io
+import os
+from pathlib import Path
+import tempfile
+from typing import TypeVar
+
+from PyQt5.QtWidgets import QWidget
+
+from system_monitor.constants import UI_CACHE_DIR
+
+WidgetT = TypeVar("WidgetT", bound=QWidget)
+
+
+def _cache_dir() -> Path:
+    override = os.environ.get("SYSTEM_MONITOR_UI_CACHE", "").strip()
+    return Path(override) if override else UI_CACHE_DIR
+
+
+def compiled_ui_path(ui_file: Path, cache_dir: Path | None = None) -> Path:
+    stat = ui_file.stat()
+    return (cache_dir or _cache_dir()) / f"{ui_file.stem}_{stat.st_mtime_ns:x}_{stat.st_size:x}.py"
+
+
+def compile_ui(ui_file: Path, cache_dir: Path | None = None) -> Path:
+    # I compile `.ui` XML to Python once per file version; later launches import the cached module
+    # (and its bytecode) instead of parsing XML through uic on every start.
+    target = compiled_ui_path(ui_file, cache_dir)
+    if target.exists():
+        return target
+
+    from PyQt5 import uic
+
+    source = io.StringIO()
+    with ui_file.open(encoding="utf-8") as ui_handle:
+        uic.compileUi(ui_handle, source)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=target.parent, suffix=".tmp", delete=False, encoding="utf-8") as handle:
+        handle.write(source.getvalue())
+    os.replace(handle.name, target)
+    return target
+
+
+def load_ui(ui_file: Path, widget: WidgetT) -> WidgetT:
+    try:
+        module_path = compile_ui(ui_file)
+    except OSError:
+        # Read-only home or cache dir: fall back to parsing the XML directly.
+        from PyQt5 import uic
+
+        return uic.loadUi(str(ui_file), widget)
+
+    spec = importlib.util.spec_from_file_location(f"system_monitor_ui_{module_path.stem}", module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    form_class = next(value for name, value in vars(module).items() if name.startswith("Ui_"))
+    form = form_class()
+    form.setupUi(widget)
+    # Match uic.loadUi, which exposes every named child directly on the widget.
+    for name, value in vars(form).items():
+        setattr(widget, name, value)
+    return widget
@@ -0,0 +1,156 @@
+from datetime import datetime, timedelta
+import math
+from pathlib import Path
+import random
+import sys
+import tempfile
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.alerts import AlertEngine, HookCommand, parse_duration, parse_rule, read_rule_file
+
+
+def _snapshot(elapsed: float, cpu: float = 0.0, ram: float = 0.0, net_recv: float = 0.0) -> SystemSnapshot:
+    return SystemSnapshot(
+        captured_at=datetime(2024, 1, 1) + timedelta(seconds=elapsed),
+        elapsed_seconds=elapsed,
+        uptime_seconds=100.0,
+        cpu_percent=cpu,
+        ram_percent=ram,
+        disk_percent=50.0,
+        process_count=100,
+        net_sent_bps=0.0,
+        net_recv_bps=net_recv,
+    )
+
+
+def _feed(rule, samples):
+    return [(elapsed, event.firing) for elapsed, snapshot in samples if (event := rule.observe(elapsed, snapshot))]
+
+
+class ParseRuleTest(unittest.TestCase):
+    def test_parses_names_functions_scales_and_holds(self) -> None:
+        rule = parse_rule("hot: p95(net_recv, 5min) > 10M for 30s")
+        self.assertEqual((rule.name, rule.metric, rule.hold_seconds), ("hot", "net_recv_bps", 30.0))
+        self.assertEqual(rule.statistic.threshold, 10e6)
+        self.assertEqual(rule.expression, "p95(net_recv, 5min) > 10M for 30s")
+        self.assertEqual(parse_rule("cpu_percent >= 1.5e1").name, "cpu_percent >= 1.5e1")
+        self.assertEqual(parse_duration("250ms"), 0.25)
+        self.assertEqual(parse_duration("1h"), 3600.0)
+
+    def test_rejects_bad_rules(self) -> None:
+        for spec in ("cpu >> 3", "gpu > 1", "q9(cpu, 1s) > 1", "p100(cpu, 1s) > 1", "avg(cpu, 0s) > 1", "cpu > 1 for soon"):
+            with self.subTest(spec=spec), self.assertRaises(ValueError):
+                parse_rule(spec)
+
+    def test_rule_files_skip_comments_and_report_line_numbers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "rules.txt"
+            path.write_text("# host alerts\ncpu > 90 for 60s\n\nslope(ram, 30s) > 0.5  # leak\n", encoding="utf-8")
+            self.assertEqual([rule.name for rule in read_rule_file(path)], ["cpu > 90 for 60s", "slope(ram, 30s) > 0.5"])
+            path.write_text("cpu > 90\ncpu >\n", encoding="utf-8")
+            with self.assertRaisesRegex(ValueError, "rules.txt:2"):
+                read_rule_file(path)
+
+
+class AlertRuleTest(unittest.TestCase):
+    def test_threshold_fires_after_holding_and_resolves(self) -> None:
+        rule = parse_rule("cpu > 90 for 60s")
+        samples = [(float(t), _snapshot(t, cpu=95.0 if 10 <= t < 100 or t == 130 else 20.0)) for t in range(0, 200, 10)]
+        self.assertEqual(_feed(rule, samples), [(70.0, True), (100.0, False)])
+
+    def test_window_mean_forgets_old_samples(self) -> None:
+        rule = parse_rule("avg(cpu, 20s) > 50")
+        samples = [(float(t), _snapshot(t, cpu=100.0 if t < 10 else 0.0)) for t in range(40)]
+        events = _feed(rule, samples)
+        self.assertEqual(events[0], (0.0, True))
+        self.assertEqual(events[1][1], False)
+        self.assertLess(events[1][0], 21.0)
+        self.assertAlmostEqual(rule.statistic.value, 0.0)
+
+    def test_window_quantile_matches_a_full_sort(self) -> None:
+        rng = random.Random(7)
+        values = [rng.lognormvariate(10, 1.5) for _ in range(2000)]
+        for operator in (">", ">=", "<", "<="):
+            for threshold in (10_000.0, 40_000.0, 200_000.0):
+                for quantile in (0.5, 0.95, 0.99):
+                    spec = f"p{quantile * 100:g}(net_recv, 1h) {operator} {threshold}"
+                    rule = parse_rule(spec)
+                    for index, value in enumerate(values):
+                        holds = rule.statistic.push(float(index), value)
+                        if index % 97 == 0 or index == len(values) - 1:
+                            window = sorted(values[: index + 1])
+                            exact = window[max(1, math.ceil(quantile * len(window))) - 1]
+                            expected = {">": exact > threshold, ">=": exact >= threshold, "<": exact < threshold, "<=": exact <= threshold}
+                            self.assertEqual(holds, expected[operator], (spec, index))
+
+    def test_window_quantile_drops_expired_slices(self) -> None:
+        rule = parse_rule("p95(cpu, 100s) > 50")
+        for t in range(100):
+            self.assertTrue(rule.statistic.push(float(t), 99.0 if t < 50 else 10.0) or t >= 50)
+        # Half the window is still hot, so p95 is above 50 ...
+        self.assertTrue(rule.statistic.push(100.0, 10.0))
+        # ... until those slices fall out.
+        self.assertFalse(rule.statistic.push(160.0, 10.0))
+        # 5s slices: the window now holds the slices from t=65 on, plus the samples at 100 and 160.
+        self.assertEqual(rule.statistic.window.count, 2.0 + sum(1 for t in range(100) if t >= 65))
+
+    def test_ewma_slope_follows_a_ramp(self) -> None:
+        rule = parse_rule("slope(ram, 10s) > 0.4")
+        events = _feed(rule, [(t * 0.5, _snapshot(t * 0.5, ram=20.0 + 0.25 * t)) for t in range(200)])
+        # 0.5 percent per second: the smoothed slope needs about one time constant to cross 0.4.
+        self.assertEqual(len(events), 1)
+        self.assertTrue(events[0][1])
+        self.assertGreater(events[0][0], 10.0)
+        self.assertLess(events[0][0], 25.0)
+        self.assertAlmostEqual(rule.statistic.value, 0.5, places=3)
+
+    def test_ewma_restarts_cleanly_when_the_clock_goes_back(self) -> None:
+        rule = parse_rule("slope(cpu, 5s) > 100")
+        for t in range(10):
+            rule.observe(float(t), _snapshot(t, cpu=float(t)))
+        before = rule.statistic.value
+        # Without the restart the step from 9 back to 0 would read as a -9/s slope.
+        rule.observe(0.0, _snapshot(0, cpu=0.0))
+        self.assertEqual(rule.statistic.value, before)
+        self.assertFalse(rule.observe(1.0, _snapshot(1, cpu=1.0)))
+        self.assertGreater(rule.statistic.value, before)
+        self.assertLess(rule.statistic.value, 1.0)
+
+
+class AlertEngineTest(unittest.TestCase):
+    def test_tracks_firing_rules_and_dispatches_transitions(self) -> None:
+        received = []
+        engine = AlertEngine([parse_rule("cpu > 90"), parse_rule("busy: ram > 80")], [received.append])
+        self.addCleanup(engine.close)
+        engine.observe(_snapshot(0, cpu=95.0, ram=85.0))
+        self.assertEqual([event.rule for event in engine.firing], ["cpu > 90", "busy"])
+        engine.observe(_snapshot(1, cpu=10.0, ram=85.0))
+        self.assertEqual([event.rule for event in engine.firing], ["busy"])
+        self.assertEqual(engine.version, 2)
+        self.assertEqual(engine.observe(_snapshot(2, cpu=10.0, ram=85.0)), [])
+        engine.close()
+        self.assertEqual([(event.rule, event.firing) for event in received], [("cpu > 90", True), ("busy", True), ("cpu > 90", False)])
+
+    def test_rejects_duplicate_names(self) -> None:
+        with self.assertRaises(ValueError):
+            AlertEngine([parse_rule("a: cpu > 1"), parse_rule("a: ram > 1")])
+
+    @unittest.skipIf(sys.platform == "win32", "the hook test uses a POSIX shell")
+    def test_hook_command_gets_the_event_in_its_environment(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "hook.txt"
+            engine = AlertEngine([parse_rule("cpu > 90")], [HookCommand(f'echo "$ALERT_STATE $ALERT_RULE $ALERT_VALUE" >> {out}')])
+            engine.observe(_snapshot(0, cpu=95.0))
+            engine.observe(_snapshot(1, cpu=5.0))
+            engine.close()
+            self.assertEqual(out.read_text().splitlines(), ["firing cpu > 90 95.0", "resolved cpu > 90 5.0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
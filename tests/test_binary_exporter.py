@@ -0,0 +1,89 @@
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.binary_exporter import RECORD_DTYPE, load_binary_metrics, read_header, read_vector_labels
+from system_monitor.services.exporters import create_exporter
+from system_monitor.services.metric_vectors import make_vector
+
+
+def _snapshot(index: int) -> SystemSnapshot:
+    return SystemSnapshot(
+        captured_at=datetime(2024, 1, 1, 12, 0, index, 250_000),
+        elapsed_seconds=float(index),
+        uptime_seconds=100.0 + index,
+        cpu_percent=10.5,
+        ram_percent=20.25,
+        disk_percent=30.0,
+        process_count=100 + index,
+        net_sent_bps=1.5,
+        net_recv_bps=2.5,
+    )
+
+
+class BinaryMetricsExporterTest(unittest.TestCase):
+    def test_records_round_trip_through_memory_map(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.bin"
+            exporter = create_exporter(path)
+            for index in range(5):
+                exporter.write(_snapshot(index))
+            exporter.close()
+
+            dtype, offset = read_header(path)
+            self.assertEqual(dtype, RECORD_DTYPE)
+            self.assertEqual(offset % 64, 0)
+
+            records = load_binary_metrics(path)
+            self.assertIsInstance(records, np.memmap)
+            self.assertEqual(len(records), 5)
+            self.assertEqual(records["process_count"].tolist(), [100, 101, 102, 103, 104])
+            self.assertAlmostEqual(float(records["ram_percent"][0]), 20.25)
+            expected_ns = int(_snapshot(4).captured_at.timestamp() * 1_000_000) * 1_000
+            self.assertEqual(int(records["captured_at_ns"][-1]), expected_ns)
+
+    def test_vector_layout_becomes_fixed_width_subarrays(self) -> None:
+        layout = {"cpu_core_percent": ("cpu0", "cpu1", "cpu2"), "net_if_recv_bps": ("eth0",)}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.bin"
+            exporter = create_exporter(path, vector_layout=layout)
+            for index in range(3):
+                vectors = {
+                    "cpu_core_percent": make_vector(layout["cpu_core_percent"], [index, 50.0, 100.0]),
+                    "net_if_recv_bps": make_vector(("lo", "eth0"), [1.0, 2048.0]),
+                }
+                exporter.write(replace(_snapshot(index), vectors=vectors))
+            exporter.close()
+
+            dtype, offset = read_header(path)
+            self.assertEqual(dtype.itemsize, RECORD_DTYPE.itemsize + 4 * 4)
+            self.assertEqual(offset % 64, 0)
+            self.assertEqual(read_vector_labels(path), layout)
+
+            records = load_binary_metrics(path)
+            self.assertEqual(records["cpu_core_percent"].shape, (3, 3))
+            self.assertEqual(records["cpu_core_percent"][:, 0].tolist(), [0.0, 1.0, 2.0])
+            self.assertEqual(records["net_if_recv_bps"][:, 0].tolist(), [2048.0] * 3)
+            self.assertEqual(records["process_count"].tolist(), [100, 101, 102])
+
+    def test_rejects_foreign_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.bin"
+            path.write_bytes(b"captured_at,elapsed\n")
+            with self.assertRaises(ValueError):
+                load_binary_metrics(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+from contextlib import redirect_stderr
+from datetime import datetime
+import io
+from pathlib import Path
+import subprocess
+import sys
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.app import main
+from system_monitor.collector import HeadlessCollector
+from system_monitor.models import SystemSnapshot
+from system_monitor.services import system_stats
+
+
+class _StepSource:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def sample(self) -> SystemSnapshot:
+        self.calls += 1
+        return SystemSnapshot(datetime(2024, 1, 1), self.calls * 0.01, 1.0, 40.0, 50.0, 60.0, 7, 0.0, 0.0)
+
+
+class HeadlessCollectorTest(unittest.TestCase):
+    def test_collects_into_history_and_stream(self) -> None:
+        output = io.StringIO()
+        collector = HeadlessCollector(_StepSource(), interval_ms=10, history_seconds=30, output=output)
+        collector.run(duration_seconds=0.1)
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0].split(",")[0], "captured_at")
+        self.assertGreaterEqual(len(lines), 3)
+        self.assertEqual(len(collector.history), len(lines) - 1)
+        self.assertFalse(collector.sampler.is_running)
+
+    @unittest.skipIf(system_stats.psutil is None, "psutil is not installed")
+    def test_headless_entry_point_never_imports_qt(self) -> None:
+        script = (
+            "import sys\n"
+            f"sys.path.insert(0, {str(SRC)!r})\n"
+            "from system_monitor.app import main\n"
+            "main(['--headless', '--duration', '0.05'])\n"
+            "assert not any(name.startswith(('PyQt5', 'pyqtgraph')) for name in sys.modules), 'Qt was imported'\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=30)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertTrue(result.stdout.startswith("captured_at,"))
+
+    def test_parquet_export_flags_it_cannot_honour_are_usage_errors(self) -> None:
+        for extra in (["--export-append"], ["--export-rotate-every", "hourly"]):
+            stderr = io.StringIO()
+            with self.subTest(extra=extra), redirect_stderr(stderr), self.assertRaises(SystemExit) as raised:
+                main(["--headless", "--export", "metrics.parquet", *extra])
+            self.assertEqual(raised.exception.code, 2)
+            self.assertIn("parquet export does not support", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+from contextlib import redirect_stderr
+from dataclasses import replace
+from datetime import datetime
+import io
+from pathlib import Path
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.buffered_exporter import BufferedExporter, FlushPolicy, parse_flush_policy
+from system_monitor.services.csv_exporter import CsvMetricsExporter
+from system_monitor.services.metric_vectors import make_vector
+
+
+def _snapshot(index: int) -> SystemSnapshot:
+    return SystemSnapshot(
+        captured_at=datetime(2024, 1, 1, 12, 0, index),
+        elapsed_seconds=float(index),
+        uptime_seconds=100.0,
+        cpu_percent=10.0,
+        ram_percent=20.0,
+        disk_percent=30.0,
+        process_count=5,
+        net_sent_bps=1.0,
+        net_recv_bps=2.0,
+    )
+
+
+class FlushPolicyTest(unittest.TestCase):
+    def test_parse_flush_policy(self) -> None:
+        self.assertEqual(parse_flush_policy("5s").max_seconds, 5.0)
+        self.assertEqual(parse_flush_policy("250ms").max_seconds, 0.25)
+        self.assertEqual(parse_flush_policy("100rows").max_rows, 100)
+        self.assertEqual(parse_flush_policy("64KB").max_bytes, 65536)
+        with self.assertRaises(ValueError):
+            parse_flush_policy("soon")
+
+
+class _StallingSink(io.BytesIO):
+    # Holds the writer thread in its first write until released, and fails on close like a
+    # compressor would.
+    def __init__(self) -> None:
+        super().__init__()
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, data) -> int:
+        self.writing.set()
+        self.release.wait(2.0)
+        return super().write(data)
+
+    def close(self) -> None:
+        raise ValueError("zstd: corrupted frame")
+
+
+class _RowExporter(BufferedExporter):
+    def _encode(self, snapshot: SystemSnapshot) -> bytes:
+        return b"row\n"
+
+
+class BufferedExporterTest(unittest.TestCase):
+    def test_encode_is_abstract(self) -> None:
+        with self.assertRaises(TypeError):
+            BufferedExporter(io.BytesIO())
+
+    def test_a_full_queue_drops_rows_instead_of_blocking(self) -> None:
+        sink = _StallingSink()
+        exporter = _RowExporter(sink, policy=FlushPolicy(max_rows=1), queue_size=1)
+        exporter.write(_snapshot(0))
+        self.assertTrue(sink.writing.wait(2.0))
+
+        started = time.monotonic()
+        for index in range(1, 4):
+            exporter.write(_snapshot(index))
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(exporter.dropped, 2)
+
+        sink.release.set()
+        stderr = io.StringIO()
+        with redirect_stderr(stderr), self.assertRaises(RuntimeError) as raised:
+            exporter.close()
+        self.assertIn("dropped 2 rows", stderr.getvalue())
+        # The sink's close error is kept and raised by close, not lost on the writer thread.
+        self.assertIsInstance(raised.exception.__cause__, ValueError)
+
+
+class CsvMetricsExporterTest(unittest.TestCase):
+    def test_rows_are_batched_until_threshold_and_flushed_on_close(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.csv"
+            exporter = CsvMetricsExporter(path, flush_policy=FlushPolicy(max_rows=3))
+            exporter.write(_snapshot(0))
+            exporter.write(_snapshot(1))
+            time.sleep(0.05)
+            self.assertEqual(path.read_text(encoding="utf-8"), "")
+
+            exporter.write(_snapshot(2))
+            exporter.write(_snapshot(3))
+            exporter.close()
+            exporter.close()
+
+            lines = path.read_text(encoding="utf-8").splitlines()
+            self.assertEqual(lines[0].split(",")[0], "captured_at")
+            self.assertEqual(len(lines), 5)
+            self.assertTrue(lines[-1].startswith("2024-01-01T12:00:03,3.0"))
+
+    def test_time_policy_flushes_without_close(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.csv"
+            exporter = CsvMetricsExporter(path, flush_policy=FlushPolicy(max_seconds=0.05))
+            try:
+                exporter.write(_snapshot(0))
+                deadline = time.monotonic() + 2.0
+                while time.monotonic() < deadline and len(path.read_text(encoding="utf-8").splitlines()) < 2:
+                    time.sleep(0.01)
+                self.assertEqual(len(path.read_text(encoding="utf-8").splitlines()), 2)
+            finally:
+                exporter.close()
+
+    def test_vector_layout_adds_one_column_per_label(self) -> None:
+        layout = {"mount_percent": ("/", "/data")}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.csv"
+            exporter = CsvMetricsExporter(path, vector_layout=layout)
+            # "/data" is unmounted by the time this sample is taken.
+            vectors = {"mount_percent": make_vector(("/",), [3.9])}
+            exporter.write(replace(_snapshot(0), vectors=vectors))
+            exporter.close()
+
+            header, row = path.read_text(encoding="utf-8").splitlines()
+            self.assertTrue(header.endswith(",mount_percent[/],mount_percent[/data]"))
+            self.assertTrue(row.endswith(",3.9,nan"))
+
+
+if __name__ == "__main__":
+    unittest.main()
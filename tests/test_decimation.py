@@ -0,0 +1,66 @@
+from pathlib import Path
+import sys
+import unittest
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.services.decimation import decimate_view, m4_decimate, max_pool_rows
+from system_monitor.services.history_tiers import SeriesView
+
+
+class DecimationTest(unittest.TestCase):
+    def test_short_series_pass_through(self) -> None:
+        x = np.arange(10.0)
+        y = np.arange(10.0)
+        out_x, out_y = m4_decimate(x, y, pixels=100)
+        self.assertIs(out_x, x)
+        self.assertIs(out_y, y)
+
+    def test_m4_keeps_spikes_and_bounds_point_count(self) -> None:
+        x = np.arange(100_000, dtype=float)
+        y = np.full(100_000, 20.0)
+        y[31_337] = 100.0
+        y[77_777] = 0.0
+
+        out_x, out_y = m4_decimate(x, y, pixels=500)
+
+        self.assertLessEqual(len(out_x), 4 * 500)
+        self.assertEqual(out_y.max(), 100.0)
+        self.assertEqual(out_y.min(), 0.0)
+        self.assertIn(31_337.0, out_x)
+        self.assertEqual(out_x[0], 0.0)
+        self.assertEqual(out_x[-1], 99_999.0)
+        self.assertTrue(np.all(np.diff(out_x) >= 0))
+
+    def test_rollup_views_draw_min_max_strokes(self) -> None:
+        view = SeriesView(
+            time=np.array([0.0, 10.0]),
+            mean=np.array([5.0, 6.0]),
+            minimum=np.array([1.0, 2.0]),
+            maximum=np.array([9.0, 8.0]),
+            resolution_seconds=10.0,
+        )
+        out_x, out_y = decimate_view(view, pixels=100)
+        self.assertEqual(out_x.tolist(), [0.0, 0.0, 10.0, 10.0])
+        self.assertEqual(out_y.tolist(), [1.0, 9.0, 2.0, 8.0])
+
+    def test_max_pool_rows_keeps_per_core_peaks(self) -> None:
+        matrix = np.zeros((1000, 4), dtype=np.float32)
+        matrix[501, 2] = 95.0
+        matrix[:10, 0] = np.nan
+
+        pooled = max_pool_rows(matrix, rows=100)
+
+        self.assertEqual(pooled.shape, (100, 4))
+        self.assertEqual(float(pooled[:, 2].max()), 95.0)
+        self.assertFalse(np.isnan(pooled[1:, 0]).any())
+        self.assertIs(max_pool_rows(matrix, rows=5000), matrix)
+
+
+if __name__ == "__main__":
+    unittest.main()
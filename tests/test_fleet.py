@@ -0,0 +1,200 @@
+from datetime import datetime
+import os
+from pathlib import Path
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.app import parse_fleet_address
+from system_monitor.models import SystemSnapshot
+from system_monitor.services import system_stats
+from system_monitor.services.binary_exporter import encode_record
+from system_monitor.services.fleet import FleetAggregator
+from system_monitor.services.fleet_agent import FleetAgent, open_fleet_socket
+from system_monitor.services.fleet_protocol import (
+    MAX_FRAME_BYTES,
+    RECORDS,
+    ProtocolError,
+    decode_hello,
+    encode_frame,
+    encode_hello,
+    frame_length,
+)
+
+
+def _snapshot(index: int, cpu: float = 25.0) -> SystemSnapshot:
+    return SystemSnapshot(datetime(2024, 1, 1, 12, 0, index), float(index), 1.0, cpu, 50.0, 60.0, 7, 0.0, 0.0)
+
+
+def _wait_for(predicate, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class FleetProtocolTest(unittest.TestCase):
+    def test_hello_round_trip(self) -> None:
+        frame = encode_hello("db-01", 0.5)
+        length, kind = frame_length(frame[:5])
+        self.assertEqual(length, len(frame) - 5)
+        self.assertEqual(decode_hello(frame[5:]), ("db-01", 0.5))
+
+    def test_rejects_oversized_frames_and_foreign_hellos(self) -> None:
+        with self.assertRaises(ProtocolError):
+            frame_length(encode_frame(RECORDS, b"")[:1] + b"\xff\xff\xff\xff")
+        with self.assertRaises(ProtocolError):
+            encode_frame(RECORDS, bytes(MAX_FRAME_BYTES + 1))
+        with self.assertRaises(ProtocolError):
+            decode_hello(b'{"version":99,"host":"x","interval":1,"record_size":56}')
+
+    def test_parse_fleet_address(self) -> None:
+        self.assertEqual(parse_fleet_address("unix:/run/fleet.sock"), "/run/fleet.sock")
+        self.assertEqual(parse_fleet_address("./fleet.sock"), "./fleet.sock")
+        self.assertEqual(parse_fleet_address("10.0.0.5:9200"), ("10.0.0.5", 9200))
+
+
+class FleetAggregatorTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _aggregator(self, address) -> FleetAggregator:
+        aggregator = FleetAggregator(address, history_seconds=10.0)
+        aggregator.start()
+        self.addCleanup(aggregator.close)
+        return aggregator
+
+    def _run_agents(self, address: str, count: int) -> None:
+        agents = [
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    str(ROOT / "systemMonitor.py"),
+                    "--headless",
+                    "--push-to",
+                    address,
+                    "--host-name",
+                    f"agent-{index}",
+                    "--interval-ms",
+                    "20",
+                    "--duration",
+                    "0.5",
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            for index in range(count)
+        ]
+        for agent in agents:
+            _, errors = agent.communicate(timeout=60)
+            self.assertEqual(agent.returncode, 0, errors)
+
+    @unittest.skipIf(system_stats.psutil is None, "psutil is not installed")
+    def test_agent_processes_over_a_unix_socket(self) -> None:
+        path = os.path.join(self.tmp.name, "fleet.sock")
+        aggregator = self._aggregator(path)
+        self._run_agents(f"unix:{path}", 3)
+
+        self.assertTrue(_wait_for(lambda: all(not host.connected for host in aggregator.hosts())))
+        hosts = aggregator.hosts()
+        self.assertEqual([host.name for host in hosts], ["agent-0", "agent-1", "agent-2"])
+        for host in hosts:
+            self.assertGreaterEqual(host.records, 3)
+            self.assertEqual(len(host.series()), min(host.records, host.history.capacity))
+            self.assertTrue(host.stale())
+        self.assertEqual([host.name for host in aggregator.take_changed()], ["agent-0", "agent-1", "agent-2"])
+        self.assertEqual(aggregator.take_changed(), [])
+        self.assertEqual(aggregator.rejected, 0)
+
+    @unittest.skipIf(system_stats.psutil is None, "psutil is not installed")
+    def test_agent_processes_over_tcp(self) -> None:
+        aggregator = self._aggregator(("127.0.0.1", 0))
+        self._run_agents(f"127.0.0.1:{aggregator.address[1]}", 2)
+        self.assertTrue(_wait_for(lambda: len(aggregator.hosts()) == 2 and not any(h.connected for h in aggregator.hosts())))
+        self.assertTrue(all(host.records >= 3 for host in aggregator.hosts()))
+
+    def test_agent_drops_while_the_aggregator_is_down_and_reconnects(self) -> None:
+        path = os.path.join(self.tmp.name, "fleet.sock")
+        agent = FleetAgent(path, "late", interval_seconds=1.0, retry_seconds=0.01)
+        self.addCleanup(agent.close)
+        agent.write(_snapshot(0))
+        self.assertEqual((agent.sent, agent.dropped), (0, 1))
+
+        aggregator = self._aggregator(path)
+        time.sleep(0.02)
+        for index in range(1, 4):
+            agent.write(_snapshot(index, cpu=float(index)))
+        self.assertEqual((agent.sent, agent.dropped, agent.connects), (3, 1, 1))
+        self.assertTrue(_wait_for(lambda: aggregator.hosts() and aggregator.hosts()[0].records == 3))
+        self.assertEqual(aggregator.hosts()[0].series()[:, 1].tolist(), [1.0, 2.0, 3.0])
+
+    def test_duplicate_names_are_suffixed_and_reconnects_keep_history(self) -> None:
+        aggregator = self._aggregator(("127.0.0.1", 0))
+        first = FleetAgent(aggregator.address, "web", interval_seconds=1.0)
+        second = FleetAgent(aggregator.address, "web", interval_seconds=1.0)
+        first.write(_snapshot(0))
+        self.assertTrue(_wait_for(lambda: len(aggregator.hosts()) == 1))
+        second.write(_snapshot(0))
+        self.assertTrue(_wait_for(lambda: [h.name for h in aggregator.hosts()] == ["web", "web#2"]))
+        second.close()
+
+        first.close()
+        self.assertTrue(_wait_for(lambda: not aggregator.hosts()[0].connected))
+        again = FleetAgent(aggregator.address, "web", interval_seconds=1.0)
+        self.addCleanup(again.close)
+        again.write(_snapshot(1))
+        self.assertTrue(_wait_for(lambda: aggregator.hosts()[0].records == 2))
+        self.assertEqual(len(aggregator.hosts()), 2)
+
+    def test_cpu_percentiles_merge_every_live_host(self) -> None:
+        aggregator = self._aggregator(("127.0.0.1", 0))
+        agents = [FleetAgent(aggregator.address, name, interval_seconds=1.0) for name in ("low", "high")]
+        for agent, base in zip(agents, (10.0, 90.0)):
+            self.addCleanup(agent.close)
+            for index in range(10):
+                agent.write(_snapshot(index, cpu=base))
+        self.assertTrue(_wait_for(lambda: sum(host.records for host in aggregator.hosts()) == 20))
+        p25, p75 = aggregator.cpu_quantiles([0.25, 0.75]).tolist()
+        self.assertAlmostEqual(p25, 10.0, delta=0.2)
+        self.assertAlmostEqual(p75, 90.0, delta=1.8)
+        agents[1].close()
+        self.assertTrue(_wait_for(lambda: not aggregator.hosts()[0].connected))
+        self.assertAlmostEqual(aggregator.cpu_quantiles([0.99])[0], 10.0, delta=0.2)
+
+    def test_protocol_violations_are_rejected(self) -> None:
+        aggregator = self._aggregator(("127.0.0.1", 0))
+        with open_fleet_socket(aggregator.address) as connection:
+            # Records before the hello.
+            connection.sendall(encode_frame(RECORDS, encode_record(_snapshot(0))))
+            self.assertTrue(_wait_for(lambda: aggregator.rejected == 1))
+        with open_fleet_socket(aggregator.address) as connection:
+            connection.sendall(encode_hello("odd", 1.0) + encode_frame(RECORDS, b"\x00" * 10))
+            self.assertTrue(_wait_for(lambda: aggregator.rejected == 2))
+            self.assertEqual(connection.recv(1), b"")
+        self.assertEqual(aggregator.hosts()[0].records, 0)
+
+    def test_a_live_unix_socket_is_not_taken_over(self) -> None:
+        path = os.path.join(self.tmp.name, "fleet.sock")
+        self._aggregator(path)
+        with self.assertRaises(RuntimeError):
+            FleetAggregator(path)
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(os.path.join(self.tmp.name, "stale.sock"))
+        stale.close()
+        self._aggregator(os.path.join(self.tmp.name, "stale.sock"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+from datetime import datetime
+from pathlib import Path
+import os
+import sys
+import time
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.fleet import FleetAggregator
+from system_monitor.services.fleet_agent import FleetAgent
+
+try:
+    from PyQt5.QtWidgets import QApplication
+
+    import numpy as np
+
+    from system_monitor.ui.fleet_window import TILE_WIDTH, FleetWindow, SparklineTile
+except ModuleNotFoundError:  # pragma: no cover - PyQt5 missing
+    FleetWindow = None
+
+
+def _wait_for(predicate, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@unittest.skipIf(FleetWindow is None, "PyQt5 is not installed")
+class FleetWindowTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_tiles_follow_hosts_and_show_disconnects(self) -> None:
+        aggregator = FleetAggregator(("127.0.0.1", 0), history_seconds=10.0)
+        aggregator.start()
+        self.addCleanup(aggregator.close)
+        window = FleetWindow(aggregator)
+        self.addCleanup(window.close)
+        agents = [FleetAgent(aggregator.address, name, interval_seconds=1.0) for name in ("b", "a", "c")]
+        for agent in agents:
+            self.addCleanup(agent.close)
+            agent.write(SystemSnapshot(datetime(2024, 1, 1), 0.0, 1.0, 40.0, 50.0, 60.0, 7, 0.0, 0.0))
+        self.assertTrue(_wait_for(lambda: sum(host.records for host in aggregator.hosts()) == 3))
+
+        window.render_frame()
+        self.assertEqual(sorted(window.tiles), ["a", "b", "c"])
+        self.assertEqual(window.statusBar().currentMessage().split(",")[:2], ["3 hosts", " 3 live"])
+
+        agents[0].close()
+        self.assertTrue(_wait_for(lambda: not aggregator.hosts()[1].connected))
+        window.render_frame()
+        self.assertTrue(window.tiles["b"].stale)
+        self.assertFalse(window.tiles["a"].stale)
+
+    def test_sparklines_span_the_host_window(self) -> None:
+        tile = SparklineTile("db")
+        series = np.array([[100.0, 0.0, 50.0], [105.0, 100.0, 50.0], [110.0, 150.0, 50.0]])
+        tile.set_series(series, span_seconds=10.0, stale=False)
+        cpu, ram = tile.polylines()
+        points = [(point.x(), point.y()) for point in cpu]
+        bounds = tile._plot_bounds()  # noqa: SLF001
+        self.assertEqual(points[0], (bounds.left(), bounds.bottom()))
+        # The newest sample sits on the right edge; values above 100% are clipped to the top.
+        self.assertEqual(points[-1], (bounds.right(), bounds.top()))
+        self.assertAlmostEqual(points[1][0], bounds.left() + bounds.width() / 2)
+        self.assertEqual({point.y() for point in ram}, {bounds.center().y()})
+        self.assertLessEqual(bounds.right(), TILE_WIDTH)
+
+
+if __name__ == "__main__":
+    unittest.main()
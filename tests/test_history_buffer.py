@@ -18,9 +18,45 @@ class HistoryBufferTest(unittest.TestCase):
         history.append(3.0, 12.0, 22.0)
         history.append(4.0, 13.0, 23.0)
 
-        self.assertEqual(history.time_points, [2.0, 3.0, 4.0])
-        self.assertEqual(history.cpu_points, [11.0, 12.0, 13.0])
-        self.assertEqual(history.ram_points, [21.0, 22.0, 23.0])
+        self.assertEqual(history.time_points.tolist(), [2.0, 3.0, 4.0])
+        self.assertEqual(history.cpu_points.tolist(), [11.0, 12.0, 13.0])
+        self.assertEqual(history.ram_points.tolist(), [21.0, 22.0, 23.0])
+
+    def test_windows_are_contiguous_views_across_wraparound(self) -> None:
+        history = HistoryBuffer(max_points=4, columns=("time", "cpu", "ram", "disk"))
+        for index in range(11):
+            history.append(float(index), index + 10.0, index + 20.0, index + 30.0)
+
+        self.assertEqual(len(history), 4)
+        self.assertEqual(history.column("disk").tolist(), [37.0, 38.0, 39.0, 40.0])
+        self.assertEqual(history.cpu_window(2).tolist(), [19.0, 20.0])
+        self.assertEqual(history.ram_window(10).tolist(), [27.0, 28.0, 29.0, 30.0])
+        self.assertEqual(history.latest("time"), 10.0)
+
+        window = history.column("time")
+        self.assertTrue(window.flags.c_contiguous)
+        self.assertFalse(window.flags.writeable)
+        self.assertFalse(window.flags.owndata)
+
+    def test_extend_matches_repeated_append(self) -> None:
+        appended = HistoryBuffer(max_points=5)
+        extended = HistoryBuffer(max_points=5)
+        appended.append(-1.0, 1.0, 2.0)
+        extended.append(-1.0, 1.0, 2.0)
+        for batch in (3, 4, 12):
+            rows = [(float(index), index + 10.0, index + 20.0) for index in range(batch)]
+            for row in rows:
+                appended.append(*row)
+            extended.extend(rows)
+            self.assertEqual(extended.time_points.tolist(), appended.time_points.tolist())
+            self.assertEqual(extended.ram_points.tolist(), appended.ram_points.tolist())
+        with self.assertRaises(ValueError):
+            extended.extend([(1.0, 2.0)])
+
+    def test_append_rejects_wrong_width(self) -> None:
+        history = HistoryBuffer(max_points=2)
+        with self.assertRaises(ValueError):
+            history.append(1.0, 2.0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.binary_exporter import captured_at_ns
+from system_monitor.services.buffered_exporter import FlushPolicy
+from system_monitor.services.history_store import HistoryStore, backfill_history, query_history
+from system_monitor.services.history_tiers import TieredHistory
+
+START = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def _snapshot(index: int, elapsed: float | None = None) -> SystemSnapshot:
+    return SystemSnapshot(
+        captured_at=START + timedelta(seconds=index),
+        elapsed_seconds=float(index) if elapsed is None else elapsed,
+        uptime_seconds=100.0 + index,
+        cpu_percent=float(index % 100),
+        ram_percent=40.0,
+        disk_percent=70.0,
+        process_count=200 + index,
+        net_sent_bps=1.5,
+        net_recv_bps=2.5,
+    )
+
+
+class HistoryStoreTest(unittest.TestCase):
+    def test_range_queries_survive_reopening(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "history.sqlite3"
+            store = HistoryStore(path, flush_policy=FlushPolicy(max_rows=7))
+            for index in range(100):
+                store.write(_snapshot(index))
+            store.close()
+
+            reopened = HistoryStore(path)
+            try:
+                everything = reopened.query(0)
+                middle = reopened.query(captured_at_ns(_snapshot(10)), captured_at_ns(_snapshot(20)))
+            finally:
+                reopened.close()
+
+        self.assertEqual(len(everything), 100)
+        self.assertEqual(everything["process_count"].tolist(), list(range(200, 300)))
+        self.assertEqual(middle["elapsed_seconds"].tolist(), [float(index) for index in range(10, 20)])
+
+    def test_retention_prunes_old_chunks(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "history.sqlite3"
+            store = HistoryStore(path, retention_days=30 / 86400, flush_policy=FlushPolicy(max_rows=10))
+            for index in range(50):
+                store.write(_snapshot(index))
+            store.close()
+            # The first flush prunes (nothing is old yet) and the next one is an hour away.
+            self.assertEqual(len(query_history(path, 0)), 50)
+
+            store = HistoryStore(path, retention_days=30 / 86400, flush_policy=FlushPolicy(max_rows=10))
+            for index in range(50, 60):
+                store.write(_snapshot(index))
+            store.close()
+            kept = query_history(path, 0)
+
+        # Whole chunks go: 20..29 ends exactly at the cutoff (59s - 30s) and stays.
+        self.assertEqual(kept["elapsed_seconds"][0], 20.0)
+        self.assertEqual(kept["elapsed_seconds"][-1], 59.0)
+
+    def test_a_chunk_with_the_same_start_is_merged_not_replaced(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "history.sqlite3"
+            store = HistoryStore(path, flush_policy=FlushPolicy(max_rows=3))
+            for index in (0, 2, 4):
+                store.write(_snapshot(index))
+            store.close()
+
+            # A second session whose first sample lands on the same nanosecond.
+            store = HistoryStore(path, flush_policy=FlushPolicy(max_rows=3))
+            for index in (0, 1, 5):
+                store.write(_snapshot(index))
+            store.close()
+
+            records = query_history(path, captured_at_ns(_snapshot(0)))
+            self.assertEqual(records["process_count"].tolist(), [200, 200, 201, 202, 204, 205])
+
+    def test_overlapping_chunks_come_back_oldest_first(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "history.sqlite3"
+            # Two sessions (or a clock step) whose chunks cover the same stretch of time.
+            for indices in ((0, 3, 6), (1, 4, 7)):
+                store = HistoryStore(path, flush_policy=FlushPolicy(max_rows=3))
+                for index in indices:
+                    store.write(_snapshot(index))
+                store.close()
+
+            records = query_history(path, 0)
+            self.assertEqual(records["process_count"].tolist(), [200, 201, 203, 204, 206, 207])
+
+    def test_missing_store_queries_empty(self) -> None:
+        self.assertEqual(len(query_history(Path(tempfile.gettempdir()) / "no-such-history.sqlite3", 0)), 0)
+
+    def test_backfill_places_earlier_sessions_before_the_first_live_sample(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "history.sqlite3"
+            store = HistoryStore(path)
+            for index in range(20):
+                store.write(_snapshot(index))
+            store.close()
+            records = query_history(path, 0)
+
+        history = TieredHistory.for_window(60, 1000)
+        first_live = _snapshot(25, elapsed=0.5)
+        self.assertEqual(backfill_history(history, records, first_live), 20)
+        history.append(first_live.elapsed_seconds, first_live.cpu_percent, first_live.ram_percent)
+
+        times = history.raw.time_points.tolist()
+        self.assertEqual(times[0], -24.5)
+        self.assertEqual(times[19], -5.5)
+        self.assertEqual(times[-1], 0.5)
+        self.assertEqual(history.bounds("cpu"), (0.0, 25.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
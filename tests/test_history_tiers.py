@@ -0,0 +1,72 @@
+from pathlib import Path
+import sys
+import unittest
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.services.history_tiers import TieredHistory
+
+
+class TieredHistoryTest(unittest.TestCase):
+    def test_rollups_track_min_max_mean_per_bucket(self) -> None:
+        history = TieredHistory(metrics=("cpu",), raw_points=100, retention_seconds=600)
+        for index, value in enumerate([10.0, 30.0, 20.0, 90.0, 50.0]):
+            history.append(index * 0.5, value)
+
+        one_second = history.tiers[0].buffer
+        self.assertEqual(one_second.time_points.tolist(), [0.0, 1.0, 2.0])
+        self.assertEqual(one_second.column("cpu_min").tolist(), [10.0, 20.0, 50.0])
+        self.assertEqual(one_second.column("cpu_max").tolist(), [30.0, 90.0, 50.0])
+        self.assertEqual(one_second.column("cpu_mean").tolist(), [20.0, 55.0, 50.0])
+
+    def test_query_picks_coarsest_tier_that_fits_the_pixels(self) -> None:
+        history = TieredHistory(metrics=("cpu",), raw_points=200, retention_seconds=7 * 86400)
+        for index in range(3 * 3600):
+            history.append(float(index), float(index % 100))
+
+        short = history.query("cpu", span_seconds=60, pixels=600)
+        self.assertTrue(short.is_raw)
+
+        hour = history.query("cpu", span_seconds=3600, pixels=400)
+        self.assertEqual(hour.resolution_seconds, 1.0)
+
+        long = history.query("cpu", span_seconds=3 * 3600, pixels=300)
+        self.assertEqual(long.resolution_seconds, 10.0)
+        self.assertGreaterEqual(len(long), 300)
+        self.assertLess(len(long), 10 * 300)
+        self.assertEqual(float(long.maximum.max()), 99.0)
+
+    def test_extend_matches_repeated_append(self) -> None:
+        rng = np.random.default_rng(3)
+        times = np.cumsum(rng.uniform(0.05, 0.4, 3000)) - 500.0
+        values = rng.uniform(0.0, 100.0, (3000, 2))
+        appended = TieredHistory(raw_points=400, retention_seconds=600)
+        extended = TieredHistory(raw_points=400, retention_seconds=600)
+        for history in (appended, extended):
+            history.append(-600.0, 1.0, 2.0)
+        for time_point, row in zip(times, values):
+            appended.append(float(time_point), *row)
+        extended.extend(times, values)
+
+        self.assertEqual(extended.raw.time_points.tolist(), appended.raw.time_points.tolist())
+        for fast, slow in zip(extended.tiers, appended.tiers):
+            for column in slow.buffer.columns:
+                np.testing.assert_allclose(fast.buffer.column(column), slow.buffer.column(column))
+        self.assertEqual(extended.bounds("cpu"), appended.bounds("cpu"))
+        extended.append(float(times[-1]) + 0.5, 50.0, 50.0)
+        appended.append(float(times[-1]) + 0.5, 50.0, 50.0)
+        np.testing.assert_allclose(extended.tiers[0].buffer.column("cpu_mean"), appended.tiers[0].buffer.column("cpu_mean"))
+
+    def test_tier_memory_is_bounded(self) -> None:
+        history = TieredHistory(metrics=("cpu",), raw_points=50, retention_seconds=7 * 86400, tier_points=500)
+        self.assertEqual(history.raw.capacity, 50)
+        self.assertTrue(all(tier.buffer.capacity <= 500 for tier in history.tiers))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+from datetime import datetime
+from pathlib import Path
+import sys
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.low_power import IdleBackoff
+
+
+def _snapshot(cpu_percent: float) -> SystemSnapshot:
+    return SystemSnapshot(
+        captured_at=datetime(2024, 1, 1),
+        elapsed_seconds=0.0,
+        uptime_seconds=0.0,
+        cpu_percent=cpu_percent,
+        ram_percent=0.0,
+        disk_percent=0.0,
+        process_count=0,
+        net_sent_bps=0.0,
+        net_recv_bps=0.0,
+    )
+
+
+class IdleBackoffTest(unittest.TestCase):
+    def test_quiet_samples_double_the_interval_up_to_the_cap(self) -> None:
+        backoff = IdleBackoff(0.5, idle_samples=2, max_stretch=4)
+        intervals = [backoff(_snapshot(1.0)) for _ in range(8)]
+
+        self.assertEqual(intervals, [0.5, 1.0, 1.0, 2.0, 2.0, 2.0, 2.0, 2.0])
+
+    def test_busy_sample_restores_the_base_interval(self) -> None:
+        backoff = IdleBackoff(0.5, idle_samples=1)
+        for _ in range(3):
+            backoff(_snapshot(2.0))
+        self.assertEqual(backoff.interval_seconds, 4.0)
+
+        self.assertEqual(backoff(_snapshot(40.0)), 0.5)
+        # The quiet streak starts over after the load.
+        self.assertEqual(backoff(_snapshot(2.0)), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
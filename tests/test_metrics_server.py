@@ -0,0 +1,116 @@
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+import sys
+import unittest
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.app import parse_listen_address
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.history_tiers import TieredHistory
+from system_monitor.services.metric_vectors import make_vector
+from system_monitor.services.metrics_server import HISTORY_CHUNK_ROWS, MetricsServer, render_prometheus
+from system_monitor.services.sampler import BackgroundSampler
+
+
+class _StubSource:
+    def sample(self) -> SystemSnapshot:
+        raise AssertionError("the server must not sample on its own")
+
+
+def _snapshot() -> SystemSnapshot:
+    return SystemSnapshot(
+        captured_at=datetime(2024, 1, 1, 12, 0, 0),
+        elapsed_seconds=5.0,
+        uptime_seconds=100.0,
+        cpu_percent=12.5,
+        ram_percent=40.0,
+        disk_percent=70.0,
+        process_count=321,
+        net_sent_bps=1.5,
+        net_recv_bps=float("nan"),
+        vectors={"mount_percent": make_vector(("/", '/mnt/"odd"'), [10.0, 20.0])},
+    )
+
+
+class MetricsServerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = MetricsServer(("127.0.0.1", 0))
+        self.server.start()
+        self.addCleanup(self.server.close)
+        host, port = self.server.address
+        self.base = f"http://{host}:{port}"
+
+    def test_parse_listen_address(self) -> None:
+        self.assertEqual(parse_listen_address(":9105"), ("", 9105))
+        self.assertEqual(parse_listen_address("127.0.0.1:9105"), ("127.0.0.1", 9105))
+        self.assertEqual(parse_listen_address("9105"), ("", 9105))
+        with self.assertRaises(ValueError):
+            parse_listen_address("localhost:http")
+
+    def test_render_escapes_labels_and_special_values(self) -> None:
+        text = render_prometheus(_snapshot())
+        self.assertIn("system_monitor_cpu_percent 12.5\n", text)
+        self.assertIn("system_monitor_processes 321\n", text)
+        self.assertIn("system_monitor_net_recv_bytes_per_second NaN\n", text)
+        self.assertIn('system_monitor_mount_percent{mount="/mnt/\\"odd\\""} 20.0\n', text)
+
+    def test_render_labels_rolling_percentiles_by_percentile_and_window(self) -> None:
+        vectors = {"cpu_percent_quantiles": make_vector(("p50_1m", "p95_1h", "p90"), [10.0, 30.0, 20.0])}
+        text = render_prometheus(replace(_snapshot(), vectors=vectors))
+        self.assertIn('system_monitor_cpu_percent_quantiles{percentile="p50",window="1m"} 10.0\n', text)
+        self.assertIn('system_monitor_cpu_percent_quantiles{percentile="p95",window="1h"} 30.0\n', text)
+        self.assertIn('system_monitor_cpu_percent_quantiles{percentile="p90"} 20.0\n', text)
+        self.assertNotIn("quantile=", text)
+
+    def test_every_metric_family_has_help(self) -> None:
+        vectors = {
+            "cpu_core_percent": make_vector(("cpu0",), [5.0]),
+            "gpu_percent": make_vector(("gpu0",), [7.0]),
+            "ram_percent_quantiles": make_vector(("p99_1m",), [50.0]),
+        }
+        text = render_prometheus(replace(_snapshot(), vectors=vectors), BackgroundSampler(_StubSource(), interval_ms=1000))
+        types = [line.split()[2] for line in text.splitlines() if line.startswith("# TYPE")]
+        helps = [line.split()[2] for line in text.splitlines() if line.startswith("# HELP")]
+        self.assertEqual(helps, types)
+
+    def test_metrics_serves_the_payload_cached_at_the_last_sample(self) -> None:
+        with urlopen(f"{self.base}/metrics") as response:
+            self.assertTrue(response.headers["Content-Type"].startswith("text/plain; version=0.0.4"))
+            self.assertNotIn("system_monitor_cpu_percent", response.read().decode())
+
+        self.server.update(_snapshot())
+        cached = self.server.payload()
+        with urlopen(f"{self.base}/metrics") as first, urlopen(f"{self.base}/metrics") as second:
+            self.assertEqual(first.read(), cached)
+            self.assertEqual(second.read(), cached)
+        self.assertIn(b"process_resident_memory_bytes", cached)
+
+    def test_history_streams_raw_samples_since(self) -> None:
+        history = TieredHistory.for_window(600, 100)
+        count = HISTORY_CHUNK_ROWS + 10
+        for index in range(count):
+            history.append(index * 0.1, float(index % 100), 50.0)
+        self.server.attach(BackgroundSampler(_StubSource(), 100), history)
+
+        with urlopen(f"{self.base}/history?since=10") as response:
+            self.assertEqual(response.headers["Transfer-Encoding"], "chunked")
+            lines = response.read().decode().splitlines()
+        self.assertEqual(lines[0], "elapsed_seconds,cpu_percent,ram_percent")
+        self.assertEqual(len(lines) - 1, count - 100)
+        self.assertEqual(lines[1].split(","), ["10", "0", "50"])
+
+        with self.assertRaises(HTTPError) as raised:
+            urlopen(f"{self.base}/history?since=soon")
+        self.assertEqual(raised.exception.code, 400)
+        raised.exception.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+from datetime import datetime
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services import parquet_exporter
+from system_monitor.services.binary_exporter import captured_at_ns
+from system_monitor.services.buffered_exporter import FlushPolicy
+from system_monitor.services.metric_vectors import make_vector
+
+
+@unittest.skipIf(parquet_exporter.pa is None, "pyarrow is not installed")
+class ParquetMetricsExporterTest(unittest.TestCase):
+    def test_each_flush_writes_a_row_group(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.parquet"
+            exporter = parquet_exporter.ParquetMetricsExporter(path, flush_policy=FlushPolicy(max_rows=2))
+            for index in range(5):
+                exporter.write(
+                    SystemSnapshot(datetime(2024, 1, 1, 0, 0, index), float(index), 1.0, 2.0, 3.0, 4.0, 5, 6.0, 7.0)
+                )
+            exporter.close()
+
+            parquet_file = parquet_exporter.pq.ParquetFile(path)
+            self.assertEqual(parquet_file.metadata.num_rows, 5)
+            self.assertEqual(parquet_file.num_row_groups, 3)
+            table = parquet_file.read()
+            self.assertEqual(table.column("elapsed_seconds").to_pylist(), [0.0, 1.0, 2.0, 3.0, 4.0])
+
+    def test_captured_at_is_stored_as_utc_epoch_nanoseconds(self) -> None:
+        snapshot = SystemSnapshot(datetime(2024, 1, 1, 12, 30, 0, 250000), 0.0, 1.0, 2.0, 3.0, 4.0, 5, 6.0, 7.0)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.parquet"
+            exporter = parquet_exporter.ParquetMetricsExporter(path)
+            exporter.write(snapshot)
+            exporter.close()
+
+            column = parquet_exporter.pq.read_table(path).column("captured_at")
+            self.assertEqual(column.type, parquet_exporter.pa.timestamp("ns", tz="UTC"))
+            self.assertEqual(column.cast("int64").to_pylist(), [captured_at_ns(snapshot)])
+
+    def test_vectors_are_fixed_size_list_columns(self) -> None:
+        labels = ("cpu0", "cpu1")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.parquet"
+            exporter = parquet_exporter.ParquetMetricsExporter(
+                path, vector_layout={"cpu_core_percent": labels, "mount_percent": ()}
+            )
+            for index in range(3):
+                exporter.write(
+                    SystemSnapshot(
+                        datetime(2024, 1, 1, 0, 0, index), float(index), 1.0, 2.0, 3.0, 4.0, 5, 6.0, 7.0,
+                        vectors={"cpu_core_percent": make_vector(labels, [index, 50.0])},
+                    )
+                )
+            exporter.close()
+
+            table = parquet_exporter.pq.read_table(path)
+            self.assertNotIn("mount_percent", table.column_names)
+            self.assertEqual(table.column("cpu_core_percent").to_pylist(), [[0.0, 50.0], [1.0, 50.0], [2.0, 50.0]])
+            self.assertIn(b"vector_labels", table.schema.metadata)
+
+
+if __name__ == "__main__":
+    unittest.main()
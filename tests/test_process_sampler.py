@@ -0,0 +1,156 @@
+from pathlib import Path
+import sys
+import unittest
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.services.process_sampler import ProcessSampler
+
+
+class _NoSuchProcess(Exception):
+    pass
+
+
+class _AccessDenied(Exception):
+    pass
+
+
+class _Memory:
+    def __init__(self, rss: int) -> None:
+        self.rss = rss
+
+
+class _OneShot:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+class _FakeHost:
+    # A stand-in for the psutil module: pids map to (create_time, cpu percent, rss).
+    NoSuchProcess = _NoSuchProcess
+    ZombieProcess = _NoSuchProcess
+    AccessDenied = _AccessDenied
+
+    def __init__(self) -> None:
+        self.processes: dict[int, tuple[float, float, int]] = {}
+        self.refreshes: list[int] = []
+
+    def pids(self) -> list[int]:
+        return list(self.processes)
+
+    def Process(self, pid: int):  # noqa: N802 (psutil naming)
+        host = self
+        if pid not in host.processes:
+            raise _NoSuchProcess(pid)
+        created = host.processes[pid][0]
+
+        class _Handle:
+            def oneshot(self) -> _OneShot:
+                return _OneShot()
+
+            def create_time(self) -> float:
+                return created
+
+            def name(self) -> str:
+                return f"proc-{pid}-{created:g}"
+
+            def is_running(self) -> bool:
+                state = host.processes.get(pid)
+                return state is not None and state[0] == created
+
+            def _state(self) -> tuple[float, float, int]:
+                # Like psutil, reads go by pid and do not notice that the pid was reused.
+                state = host.processes.get(pid)
+                if state is None:
+                    raise _NoSuchProcess(pid)
+                return state
+
+            def cpu_percent(self, interval=None) -> float:
+                host.refreshes.append(pid)
+                return self._state()[1]
+
+            def memory_info(self) -> _Memory:
+                return _Memory(self._state()[2])
+
+        return _Handle()
+
+
+class ProcessSamplerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.host = _FakeHost()
+        patcher = patch("system_monitor.services.process_sampler.psutil", self.host)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_top_lists_rank_by_cpu_and_rss(self) -> None:
+        self.host.processes = {
+            1: (1.0, 5.0, 900),
+            2: (1.0, 80.0, 100),
+            3: (1.0, 20.0, 5_000),
+            4: (1.0, 0.0, 50),
+        }
+        table = ProcessSampler(top_n=2, budget_seconds=1.0).sample()
+
+        self.assertEqual([info.pid for info in table.top_cpu], [2, 3])
+        self.assertEqual([info.pid for info in table.top_rss], [3, 1])
+        self.assertEqual([info.pid for info in table.rows()], [2, 3, 1])
+        self.assertEqual(table.process_count, 4)
+        self.assertEqual(table.refreshed_count, 4)
+
+    def test_dead_and_recycled_pids_are_evicted(self) -> None:
+        self.host.processes = {1: (1.0, 10.0, 100), 2: (1.0, 90.0, 100)}
+        sampler = ProcessSampler(top_n=5, budget_seconds=1.0)
+        sampler.sample()
+        self.assertEqual(len(sampler), 2)
+
+        # pid 2 exits and its number is reused by a new, idle process.
+        self.host.processes = {1: (1.0, 10.0, 100), 2: (7.0, 0.0, 100)}
+        table = sampler.sample()
+        self.assertEqual(table.top_cpu[0].pid, 1)
+
+        del self.host.processes[1]
+        table = sampler.sample()
+        self.assertEqual(len(sampler), 1)
+        self.assertEqual([info.pid for info in table.top_cpu], [2])
+
+    def test_a_pid_reused_between_ticks_is_tracked_again(self) -> None:
+        self.host.processes = {1: (1.0, 10.0, 100), 2: (1.0, 5.0, 100)}
+        sampler = ProcessSampler(top_n=5, budget_seconds=1.0)
+        sampler.sample()
+
+        # pid 2 exits and a busy process takes its number before the next tick, so it never leaves pids().
+        self.host.processes[2] = (7.0, 90.0, 4_000)
+        table = sampler.sample()
+
+        self.assertEqual(len(sampler), 2)
+        self.assertEqual(table.top_cpu[0].pid, 2)
+        self.assertEqual(table.top_cpu[0].name, "proc-2-7")
+        self.assertEqual(table.top_rss[0].rss_bytes, 4_000)
+
+    def test_zero_budget_still_covers_every_process_over_several_ticks(self) -> None:
+        self.host.processes = {pid: (1.0, 0.0, pid) for pid in range(1, 21)}
+        sampler = ProcessSampler(top_n=1, budget_seconds=0.0)
+
+        ticks = 0
+        while len(sampler) < 20:
+            table = sampler.sample()
+            ticks += 1
+            # One new process, the (at most two) current leaders and one rotated process.
+            self.assertLessEqual(table.refreshed_count, 4)
+        self.assertGreater(ticks, 1)
+
+        self.host.refreshes.clear()
+        for _ in range(20):
+            sampler.sample()
+        self.assertEqual(set(self.host.refreshes), set(range(1, 21)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.services.procfs_stats import ProcfsStatsService
+from system_monitor.services.system_stats import create_stats_service
+
+NET_DEV_HEADER = (
+    "Inter-|   Receive                                                |  Transmit\n"
+    " face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed\n"
+)
+
+
+def _stat(user: int, idle: int, iowait: int = 0, guest: int = 0) -> str:
+    return (
+        f"cpu  {user} 0 0 {idle} {iowait} 0 0 0 {guest} 0\n"
+        f"cpu0 {user} 0 0 {idle} {iowait} 0 0 0 {guest} 0\n"
+        "intr 1 0 0\n"
+        "btime 1000\n"
+    )
+
+
+def _net_dev(*interfaces: tuple[str, int, int]) -> str:
+    lines = [f"{name:>6}: {recv} 1 0 0 0 0 0 0 {sent} 1 0 0 0 0 0 0\n" for name, recv, sent in interfaces]
+    return NET_DEV_HEADER + "".join(lines)
+
+
+class ProcfsStatsServiceTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.proc = Path(temp_dir.name)
+        (self.proc / "net").mkdir()
+        for pid in ("1", "42", "1337"):
+            (self.proc / pid).mkdir()
+        (self.proc / "self").mkdir()
+        (self.proc / "stat").write_text(_stat(user=100, idle=900))
+        (self.proc / "meminfo").write_text(
+            "MemTotal:        1000000 kB\nMemFree:          100000 kB\nMemAvailable:     450000 kB\n"
+        )
+        (self.proc / "net" / "dev").write_text(_net_dev(("lo", 500, 500), ("eth0", 1000, 3000)))
+
+    @patch("system_monitor.services.procfs_stats.time")
+    def test_sample_matches_psutil_semantics(self, time_module) -> None:
+        time_module.monotonic.side_effect = [10.0, 12.0]
+        time_module.time.return_value = 1100.0
+        service = ProcfsStatsService(proc_root=self.proc, disk_path=str(self.proc))
+        self.addCleanup(service.close)
+
+        # 60 busy ticks out of 200; iowait counts as idle and guest time is already inside user.
+        (self.proc / "stat").write_text(_stat(user=160, idle=1000, iowait=40, guest=5))
+        (self.proc / "net" / "dev").write_text(_net_dev(("lo", 700, 700), ("eth0", 1600, 3400)))
+        snapshot = service.sample()
+
+        self.assertEqual(snapshot.cpu_percent, 30.0)
+        self.assertEqual(snapshot.ram_percent, 55.0)
+        self.assertEqual(snapshot.process_count, 3)
+        self.assertEqual(snapshot.uptime_seconds, 100.0)
+        self.assertAlmostEqual(snapshot.elapsed_seconds, 2.0)
+        self.assertAlmostEqual(snapshot.net_recv_bps, 400.0)
+        self.assertAlmostEqual(snapshot.net_sent_bps, 300.0)
+
+    @patch("system_monitor.services.procfs_stats.time")
+    def test_vectors_cover_cores_interfaces_and_mounts(self, time_module) -> None:
+        time_module.monotonic.side_effect = [10.0, 12.0, 12.0]
+        time_module.time.return_value = 1100.0
+        (self.proc / "stat").write_text(
+            "cpu  200 0 0 1800 0 0 0 0 0 0\n"
+            "cpu0 100 0 0 900 0 0 0 0 0 0\n"
+            "cpu1 100 0 0 900 0 0 0 0 0 0\n"
+            "intr 1\nbtime 1000\n"
+        )
+        (self.proc / "filesystems").write_text("nodev\ttmpfs\n\text4\n")
+        (self.proc / "self" / "mounts").write_text(
+            f"/dev/vda1 {self.proc} ext4 rw 0 0\ntmpfs /run tmpfs rw 0 0\n"
+        )
+        (self.proc / "diskstats").write_text("   8       1 vda1 10 0 100 0 20 0 200 0 0 0 0\n")
+        service = ProcfsStatsService(proc_root=self.proc, disk_path=str(self.proc), collect_vectors=True)
+        self.addCleanup(service.close)
+
+        (self.proc / "stat").write_text(
+            "cpu  300 0 0 1900 0 0 0 0 0 0\n"
+            "cpu0 190 0 0 910 0 0 0 0 0 0\n"
+            "cpu1 110 0 0 990 0 0 0 0 0 0\n"
+            "intr 1\nbtime 1000\n"
+        )
+        (self.proc / "net" / "dev").write_text(_net_dev(("lo", 500, 500), ("eth0", 5000, 3000)))
+        (self.proc / "diskstats").write_text("   8       1 vda1 10 0 500 0 20 0 200 0 0 0 0\n")
+        vectors = service.sample().vectors
+
+        self.assertEqual(vectors["cpu_core_percent"].labels, ("cpu0", "cpu1"))
+        self.assertEqual(vectors["cpu_core_percent"].values.tolist(), [90.0, 10.0])
+        self.assertEqual(vectors["net_if_recv_bps"].labels, ("lo", "eth0"))
+        self.assertEqual(vectors["net_if_recv_bps"].values.tolist(), [0.0, 2000.0])
+        self.assertEqual(vectors["mount_percent"].labels, (str(self.proc),))
+        self.assertEqual(vectors["mount_read_bps"].values.tolist(), [400 * 512 / 2.0])
+        self.assertEqual(vectors["mount_write_bps"].values.tolist(), [0.0])
+        self.assertEqual(service.vector_layout()["cpu_core_percent"], ("cpu0", "cpu1"))
+
+    def test_net_dev_larger_than_the_initial_buffer_is_read_whole(self) -> None:
+        interfaces = [(f"veth{index}", 10, 20) for index in range(400)]
+        (self.proc / "net" / "dev").write_text(_net_dev(*interfaces))
+        service = ProcfsStatsService(proc_root=self.proc, disk_path=str(self.proc))
+        self.addCleanup(service.close)
+
+        self.assertGreater((self.proc / "net" / "dev").stat().st_size, 16 * 1024)
+        names, recv, sent = service._read_net_dev()
+        self.assertEqual(len(names), 400)
+        self.assertEqual((sum(sent), sum(recv)), (8000, 4000))
+
+    def test_missing_procfs_is_reported(self) -> None:
+        with self.assertRaises(RuntimeError):
+            ProcfsStatsService(proc_root=self.proc / "missing")
+
+    def test_unknown_backend_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            create_stats_service("sysctl")
+
+
+if __name__ == "__main__":
+    unittest.main()
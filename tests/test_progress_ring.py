@@ -0,0 +1,55 @@
+from pathlib import Path
+import os
+import sys
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    from PyQt5.QtGui import QColor
+    from PyQt5.QtWidgets import QApplication
+
+    from system_monitor.ui.progress_ring import FULL_CIRCLE, ProgressRing
+except ModuleNotFoundError:  # pragma: no cover - PyQt5 missing
+    ProgressRing = None
+
+
+@unittest.skipIf(ProgressRing is None, "PyQt5 is not installed")
+class ProgressRingTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_only_repaints_when_the_arc_moves(self) -> None:
+        ring = ProgressRing(QColor(85, 170, 255))
+        self.assertTrue(ring.set_value(50.0))
+        self.assertEqual(ring.span, FULL_CIRCLE // 2)
+        self.assertFalse(ring.set_value(50.0))
+        # Less than 1/16th of a degree is below what QPainter can draw.
+        self.assertFalse(ring.set_value(50.001))
+        self.assertTrue(ring.set_value(50.5))
+
+    def test_clamps_out_of_range_values(self) -> None:
+        ring = ProgressRing(QColor(255, 0, 127))
+        ring.set_value(140.0)
+        self.assertEqual(ring.span, FULL_CIRCLE)
+        ring.set_value(-3.0)
+        self.assertEqual(ring.span, 0)
+
+    def test_paints_offscreen(self) -> None:
+        ring = ProgressRing(QColor(85, 170, 255))
+        ring.resize(220, 220)
+        ring.set_value(30.0)
+        image = ring.grab().toImage()
+        # 30% clockwise from 12 o'clock covers the right edge but not the left one.
+        self.assertEqual(image.pixelColor(212, 110).name(), "#55aaff")
+        self.assertNotEqual(image.pixelColor(8, 110).name(), "#55aaff")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+from datetime import datetime
+import math
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.app import build_exporter, build_parser
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.exporters import create_exporter
+from system_monitor.services.metric_vectors import make_vector
+from system_monitor.services.quantile_sketch import (
+    PERCENT_RANGE,
+    RATE_RANGE,
+    QuantileSketch,
+    QuantileSource,
+    QuantileTracker,
+    WindowedSketch,
+)
+from system_monitor.services.replay import ReplaySource
+
+FRACTIONS = (0.01, 0.1, 0.5, 0.9, 0.95, 0.99, 0.999)
+
+
+def _exact(values: np.ndarray, fraction: float) -> float:
+    ordered = np.sort(values)
+    return float(ordered[max(1, math.ceil(fraction * len(ordered))) - 1])
+
+
+def _snapshot(elapsed: float, cpu: float, net_recv: float = 0.0) -> SystemSnapshot:
+    return SystemSnapshot(
+        captured_at=datetime(2024, 1, 1, 12, 0, 0),
+        elapsed_seconds=elapsed,
+        uptime_seconds=100.0,
+        cpu_percent=cpu,
+        ram_percent=50.0,
+        disk_percent=60.0,
+        process_count=10,
+        net_sent_bps=0.0,
+        net_recv_bps=net_recv,
+        vectors={"cpu_core_percent": make_vector(("cpu0",), [cpu])},
+    )
+
+
+class _ListSource:
+    def __init__(self, snapshots) -> None:
+        self._snapshots = iter(snapshots)
+
+    def vector_layout(self):
+        return {"cpu_core_percent": ("cpu0",)}
+
+    def next_interval(self, snapshot: SystemSnapshot) -> float:
+        return 0.25
+
+    def sample(self) -> SystemSnapshot | None:
+        return next(self._snapshots, None)
+
+
+class QuantileSketchTest(unittest.TestCase):
+    def test_quantiles_stay_within_the_relative_accuracy(self) -> None:
+        values = np.random.default_rng(11).lognormal(10.0, 2.0, 50_000)
+        sketch = QuantileSketch(*RATE_RANGE)
+        sketch.extend(values)
+        for fraction, estimate in zip(FRACTIONS, sketch.quantiles(FRACTIONS).tolist()):
+            exact = _exact(values, fraction)
+            self.assertLessEqual(abs(estimate - exact), sketch.relative_accuracy * exact * (1 + 1e-9), fraction)
+
+    def test_memory_is_fixed_by_the_range(self) -> None:
+        sketch = QuantileSketch(*PERCENT_RANGE)
+        size = sketch.counts.nbytes
+        for value in np.random.default_rng(1).uniform(0.0, 100.0, 100_000).tolist():
+            sketch.add(value)
+        self.assertEqual(sketch.counts.nbytes, size)
+        self.assertEqual(int(sketch.counts.sum()), sketch.count)
+
+    def test_out_of_range_values_clamp(self) -> None:
+        sketch = QuantileSketch(*PERCENT_RANGE)
+        for value in (0.0, 0.001, -5.0, float("nan")):
+            sketch.add(value)
+        self.assertEqual(sketch.quantile(1.0), 0.0)
+        sketch.add(1e9)
+        self.assertAlmostEqual(sketch.quantile(1.0), 100.0, delta=100.0 * sketch.relative_accuracy)
+
+    def test_merging_equals_sketching_the_union(self) -> None:
+        rng = np.random.default_rng(5)
+        first, second = rng.uniform(0.0, 100.0, 1000), rng.uniform(20.0, 80.0, 3000)
+        merged = QuantileSketch(*PERCENT_RANGE)
+        merged.extend(first)
+        other = QuantileSketch(*PERCENT_RANGE)
+        for value in second.tolist():
+            other.add(value)
+        merged.merge(other)
+        union = QuantileSketch(*PERCENT_RANGE)
+        union.extend(np.concatenate((first, second)))
+        np.testing.assert_array_equal(merged.counts, union.counts)
+        self.assertEqual(merged.count, 4000)
+        with self.assertRaises(ValueError):
+            merged.merge(QuantileSketch(*PERCENT_RANGE, relative_accuracy=0.02))
+
+    def test_empty_sketch_reads_nan(self) -> None:
+        self.assertTrue(math.isnan(QuantileSketch(*PERCENT_RANGE).quantile(0.5)))
+
+
+class WindowedSketchTest(unittest.TestCase):
+    def test_old_slices_fall_out_of_the_window(self) -> None:
+        window = WindowedSketch(60.0, *PERCENT_RANGE)
+        for second in range(60):
+            window.add(float(second), 90.0)
+        self.assertAlmostEqual(window.sketch.quantile(0.5), 90.0, delta=0.9)
+        for second in range(60, 120):
+            window.add(float(second), 10.0)
+        # 3s slices: the slice holding t=57..59 went out with the one holding t=117..119.
+        self.assertEqual(window.sketch.count, 60)
+        self.assertAlmostEqual(window.sketch.quantile(0.99), 10.0, delta=0.1)
+
+    def test_a_clock_that_goes_back_starts_over(self) -> None:
+        window = WindowedSketch(60.0, *PERCENT_RANGE)
+        for second in range(30):
+            window.add(float(second), 90.0)
+        window.add(0.0, 10.0)
+        self.assertEqual(window.sketch.count, 1)
+
+
+class QuantileSourceTest(unittest.TestCase):
+    def test_snapshots_carry_rolling_percentiles(self) -> None:
+        snapshots = [_snapshot(index * 0.5, float(index % 100), net_recv=1000.0 * index) for index in range(400)]
+        source = QuantileSource(_ListSource(snapshots))
+        layout = source.vector_layout()
+        self.assertEqual(layout["cpu_core_percent"], ("cpu0",))
+        self.assertEqual(layout["cpu_percent_quantiles"][:3], ("p50_1m", "p95_1m", "p99_1m"))
+        self.assertEqual(source.next_interval(snapshots[0]), 0.25)
+
+        last = None
+        while (snapshot := source.sample()) is not None:
+            last = snapshot
+        self.assertEqual(last.vectors["cpu_core_percent"].labels, ("cpu0",))
+        values = dict(zip(last.vectors["cpu_percent_quantiles"].labels, last.vectors["cpu_percent_quantiles"].values.tolist()))
+        # The 1m window holds the last 114-120 samples, the 1h one all 400.
+        recent = np.array([index % 100 for index in range(400)][-120:], dtype=float)
+        self.assertAlmostEqual(values["p95_1h"], _exact(np.arange(400) % 100, 0.95), delta=1.0)
+        self.assertAlmostEqual(values["p50_1m"], _exact(recent, 0.5), delta=5.0)
+        self.assertGreater(last.vectors["net_recv_bps_quantiles"].values[1], 300_000.0)
+
+    def test_exports_and_replays_the_percentile_columns(self) -> None:
+        source = QuantileSource(_ListSource([_snapshot(float(index), 10.0 * index) for index in range(5)]))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.csv"
+            exporter = create_exporter(path, vector_layout=source.vector_layout())
+            while (snapshot := source.sample()) is not None:
+                exporter.write(snapshot)
+            exporter.close()
+            self.assertIn("cpu_percent_quantiles[p99_1h]", path.read_text().splitlines()[0])
+            replay = ReplaySource(path, speed=None)
+            self.assertEqual(replay.vector_layout()["ram_percent_quantiles"], QuantileTracker().labels)
+            for _ in range(4):
+                replay.sample()
+            self.assertAlmostEqual(float(replay.sample().vectors["cpu_percent_quantiles"].values[2]), 40.0, delta=0.4)
+
+    def test_a_plain_export_keeps_the_percentile_columns(self) -> None:
+        source = QuantileSource(_ListSource([_snapshot(float(index), 50.0) for index in range(3)]))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.csv"
+            exporter = build_exporter(build_parser().parse_args(["--export", str(path)]), source)
+            while (snapshot := source.sample()) is not None:
+                exporter.write(snapshot)
+            exporter.close()
+            header = path.read_text().splitlines()[0]
+        self.assertIn("net_recv_bps_quantiles[p95_1m]", header)
+        self.assertNotIn("cpu_core_percent[cpu0]", header)
+
+
+if __name__ == "__main__":
+    unittest.main()
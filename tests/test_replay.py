@@ -0,0 +1,120 @@
+from datetime import datetime
+from pathlib import Path
+import sys
+import tempfile
+import threading
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.collector import HeadlessCollector
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.exporters import create_exporter
+from system_monitor.services.metric_vectors import make_vector
+from system_monitor.services.replay import MAX_SPEED_INTERVAL_SECONDS, ReplaySource, parse_replay_speed
+
+try:
+    import pyarrow  # noqa: F401
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+LAYOUT = {"cpu_core_percent": ("cpu0", "cpu1")}
+
+
+def _snapshot(index: int, elapsed: float | None = None) -> SystemSnapshot:
+    return SystemSnapshot(
+        captured_at=datetime(2024, 1, 1, 12, 0, index, 250_000),
+        elapsed_seconds=float(index) * 0.5 if elapsed is None else elapsed,
+        uptime_seconds=100.0 + index,
+        cpu_percent=10.0 + index,
+        ram_percent=20.25,
+        disk_percent=30.0,
+        process_count=100 + index,
+        net_sent_bps=1.5,
+        net_recv_bps=2.5,
+        vectors={"cpu_core_percent": make_vector(LAYOUT["cpu_core_percent"], [index, 2 * index])},
+    )
+
+
+def _record(path: Path, snapshots: list[SystemSnapshot]) -> None:
+    exporter = create_exporter(path, vector_layout=LAYOUT)
+    for snapshot in snapshots:
+        exporter.write(snapshot)
+    exporter.close()
+
+
+class ReplaySourceTest(unittest.TestCase):
+    def _assert_round_trip(self, suffix: str) -> None:
+        recorded = [_snapshot(index) for index in range(5)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / f"metrics{suffix}"
+            _record(path, recorded)
+            source = ReplaySource(path, speed=None)
+            replayed = [source.sample() for _ in range(5)]
+            with self.assertRaises(EOFError):
+                source.sample()
+
+        self.assertEqual(source.vector_layout(), LAYOUT)
+        self.assertEqual(replayed, recorded)
+        self.assertEqual(replayed[3].vectors["cpu_core_percent"].values.tolist(), [3.0, 6.0])
+        self.assertTrue(source.finished)
+
+    def test_binary_round_trip(self) -> None:
+        self._assert_round_trip(".bin")
+
+    def test_csv_round_trip(self) -> None:
+        self._assert_round_trip(".csv")
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_parquet_round_trip(self) -> None:
+        self._assert_round_trip(".parquet")
+
+    def test_interval_follows_recorded_gaps_divided_by_speed(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.bin"
+            _record(path, [_snapshot(index) for index in range(3)])
+            source = ReplaySource(path, speed=10.0)
+            first = source.sample()
+            self.assertAlmostEqual(source.next_interval(first), 0.05)
+            source.sample()
+            last = source.sample()
+            self.assertEqual(source.next_interval(last), MAX_SPEED_INTERVAL_SECONDS)
+
+    def test_appended_recording_keeps_time_moving_forward(self) -> None:
+        recorded = [_snapshot(0, 0.0), _snapshot(1, 1.0), _snapshot(2, 0.0), _snapshot(3, 0.5)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.csv"
+            _record(path, recorded)
+            source = ReplaySource(path)
+            elapsed = [source.sample().elapsed_seconds for _ in range(4)]
+
+        self.assertEqual(elapsed, [0.0, 1.0, 1.0, 1.5])
+
+    def test_parse_replay_speed(self) -> None:
+        self.assertEqual(parse_replay_speed("10x"), 10.0)
+        self.assertEqual(parse_replay_speed("1"), 1.0)
+        self.assertIsNone(parse_replay_speed("max"))
+        with self.assertRaises(ValueError):
+            parse_replay_speed("-2x")
+
+    def test_collector_stops_when_the_replay_runs_out(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.bin"
+            _record(path, [_snapshot(index) for index in range(20)])
+            source = ReplaySource(path, speed=None)
+            collector = HeadlessCollector(
+                source, interval_ms=1000, history_seconds=60, interval_policy=source.next_interval
+            )
+            finished = threading.Event()
+            threading.Thread(target=lambda: (collector.run(), finished.set()), daemon=True).start()
+
+            self.assertTrue(finished.wait(5.0))
+        self.assertTrue(collector.sampler.exhausted)
+        self.assertEqual(len(collector.history), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+from datetime import datetime
+import gzip
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.services.rotating_sink import RotatingFileSink, RotationPolicy
+
+
+class RotatingFileSinkTest(unittest.TestCase):
+    def test_size_rotation_compresses_and_prunes_segments(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.csv"
+            sink = RotatingFileSink(
+                path,
+                header=b"h\n",
+                policy=RotationPolicy(max_bytes=10, compression="gzip", keep=2),
+            )
+            for index in range(5):
+                sink.write(f"row{index}\n".encode())
+            sink.close()
+
+            segments = sink.closed_segments()
+            self.assertEqual(len(segments), 2)
+            self.assertTrue(all(segment.name.endswith(".csv.gz") for segment in segments))
+            self.assertEqual(gzip.decompress(segments[-1].read_bytes()), b"h\nrow3\n")
+            self.assertEqual(path.read_bytes(), b"h\nrow4\n")
+            self.assertEqual(list(Path(tmp).glob("*.part")), [])
+
+    def test_hourly_rotation_names_segment_after_its_start(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.bin"
+            sink = RotatingFileSink(path, header=b"H", policy=RotationPolicy(interval="hourly"))
+            sink._opened_at = datetime(2024, 1, 1, 9, 59, 30)
+            sink.write(b"a")
+            sink.write(b"b")
+            sink.close()
+
+            self.assertEqual([segment.name for segment in sink.closed_segments()], ["metrics.20240101-095930.bin"])
+            self.assertEqual(path.read_bytes(), b"Hb")
+
+    def test_append_resumes_existing_file_without_repeating_header(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics.csv"
+            first = RotatingFileSink(path, header=b"h\n")
+            first.write(b"one\n")
+            first.close()
+
+            second = RotatingFileSink(path, header=b"h\n", append=True)
+            second.write(b"two\n")
+            second.close()
+            self.assertEqual(path.read_bytes(), b"h\none\ntwo\n")
+
+            third = RotatingFileSink(path, header=b"other\n", append=True)
+            third.close()
+            self.assertEqual(path.read_bytes(), b"other\n")
+            self.assertEqual(third.closed_segments()[0].read_bytes(), b"h\none\ntwo\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
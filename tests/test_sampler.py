@@ -0,0 +1,127 @@
+from contextlib import redirect_stderr
+from datetime import datetime
+import io
+from pathlib import Path
+import sys
+import threading
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.sampler import BackgroundSampler
+
+
+def _snapshot(index: int) -> SystemSnapshot:
+    return SystemSnapshot(
+        captured_at=datetime(2024, 1, 1),
+        elapsed_seconds=float(index),
+        uptime_seconds=0.0,
+        cpu_percent=float(index),
+        ram_percent=0.0,
+        disk_percent=0.0,
+        process_count=0,
+        net_sent_bps=0.0,
+        net_recv_bps=0.0,
+    )
+
+
+class _CountingSource:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def sample(self) -> SystemSnapshot:
+        self.calls += 1
+        return _snapshot(self.calls)
+
+
+class BackgroundSamplerTest(unittest.TestCase):
+    def test_drain_keeps_latest_and_drops_stale(self) -> None:
+        sampler = BackgroundSampler(_CountingSource(), interval_ms=1000, max_pending=2)
+        for index in range(1, 6):
+            sampler._publish(_snapshot(index))
+
+        drained = sampler.drain()
+
+        self.assertEqual([snapshot.elapsed_seconds for snapshot in drained], [4.0, 5.0])
+        self.assertEqual(sampler.dropped_count, 3)
+        self.assertEqual(sampler.drain(), [])
+
+    def test_worker_thread_feeds_listeners(self) -> None:
+        source = _CountingSource()
+        sampler = BackgroundSampler(source, interval_ms=1)
+        seen = threading.Event()
+        threads: list[str] = []
+
+        def listener(snapshot: SystemSnapshot) -> None:
+            threads.append(threading.current_thread().name)
+            if len(threads) >= 3:
+                seen.set()
+
+        sampler.add_listener(listener)
+        sampler.start()
+        try:
+            self.assertTrue(seen.wait(2.0))
+        finally:
+            sampler.stop()
+
+        self.assertFalse(sampler.is_running)
+        self.assertNotIn(threading.main_thread().name, threads)
+        self.assertTrue(sampler.drain())
+
+    def test_interval_policy_retunes_the_scheduler(self) -> None:
+        seen = threading.Event()
+        sampler = BackgroundSampler(
+            _CountingSource(), interval_ms=1, interval_policy=lambda snapshot: 0.001 * snapshot.cpu_percent
+        )
+        sampler.add_listener(lambda snapshot: snapshot.cpu_percent >= 3 and seen.set())
+        sampler.start()
+        try:
+            self.assertTrue(seen.wait(2.0))
+        finally:
+            sampler.stop()
+
+        self.assertGreaterEqual(sampler.scheduler.interval_seconds, 0.003)
+
+    def test_a_failing_listener_is_reported_once_and_the_others_keep_running(self) -> None:
+        sampler = BackgroundSampler(_CountingSource(), interval_ms=1000, max_pending=0)
+        seen: list[float] = []
+
+        def broken(snapshot: SystemSnapshot) -> None:
+            raise RuntimeError("disk full")
+
+        sampler.add_listener(broken)
+        sampler.add_listener(lambda snapshot: seen.append(snapshot.elapsed_seconds))
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            for index in range(3):
+                sampler._publish(_snapshot(index))
+
+        self.assertEqual(seen, [0.0, 1.0, 2.0])
+        self.assertEqual(sampler.listener_errors, 3)
+        self.assertEqual(stderr.getvalue().count("disk full"), 1)
+
+    def test_a_failing_source_ends_the_run(self) -> None:
+        class _BrokenSource:
+            def sample(self) -> SystemSnapshot:
+                raise OSError("no /proc")
+
+        sampler = BackgroundSampler(_BrokenSource(), interval_ms=1)
+        ended = threading.Event()
+        sampler.on_exhausted = ended.set
+        with redirect_stderr(io.StringIO()):
+            sampler.start()
+            try:
+                self.assertTrue(ended.wait(2.0))
+            finally:
+                sampler.stop()
+
+        self.assertIsInstance(sampler.error, OSError)
+        self.assertFalse(sampler.exhausted)
+
+
+if __name__ == "__main__":
+    unittest.main()
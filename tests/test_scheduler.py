@@ -0,0 +1,111 @@
+from pathlib import Path
+import sys
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.services.scheduler import DeadlineScheduler, Histogram
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeStopEvent:
+    # Waiting advances the fake clock by the delay plus a fixed oversleep, like a real timer would.
+    def __init__(self, clock: _FakeClock, oversleep: float = 0.0) -> None:
+        self.clock = clock
+        self.oversleep = oversleep
+
+    def wait(self, delay: float) -> bool:
+        self.clock.now += delay + self.oversleep
+        return False
+
+    def is_set(self) -> bool:
+        return False
+
+
+class HistogramTest(unittest.TestCase):
+    def test_percentiles_are_bucket_bounds_within_twenty_percent(self) -> None:
+        histogram = Histogram()
+        for _ in range(98):
+            histogram.record(0.001)
+        histogram.record(0.050)
+        histogram.record(0.200)
+
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.percentile(0.5), 0.001, delta=0.0002)
+        self.assertAlmostEqual(histogram.percentile(0.99), 0.050, delta=0.010)
+        self.assertEqual(histogram.percentile(1.0), 0.200)
+        self.assertEqual(sum(count for _, count in histogram.buckets()), 100)
+
+    def test_empty_and_negative_values(self) -> None:
+        histogram = Histogram()
+        self.assertEqual(histogram.percentile(0.99), 0.0)
+        histogram.record(-0.5)
+        self.assertEqual(histogram.maximum, 0.0)
+        self.assertEqual(histogram.count, 1)
+
+
+class DeadlineSchedulerTest(unittest.TestCase):
+    def test_oversleep_does_not_accumulate_into_drift(self) -> None:
+        clock = _FakeClock()
+        stop = _FakeStopEvent(clock, oversleep=0.004)
+        scheduler = DeadlineScheduler(0.1, clock=clock)
+        scheduler.start()
+
+        wake_times = []
+        for _ in range(50):
+            self.assertTrue(scheduler.wait(stop))
+            wake_times.append(clock.now)
+            clock.now += 0.01
+            scheduler.advance()
+
+        # Every wake is 4ms late, but tick 49 is still due at origin + 4.9s rather than 49 * 4ms later.
+        self.assertAlmostEqual(wake_times[-1] - 100.0, 4.9 + 0.004)
+        self.assertEqual(scheduler.missed_ticks, 0)
+        self.assertAlmostEqual(scheduler.jitter.maximum, 0.004)
+
+    def test_overrun_skips_missed_ticks_instead_of_bursting(self) -> None:
+        clock = _FakeClock()
+        stop = _FakeStopEvent(clock)
+        scheduler = DeadlineScheduler(0.1, clock=clock)
+        scheduler.start()
+
+        self.assertTrue(scheduler.wait(stop))
+        clock.now += 0.35
+        scheduler.advance()
+
+        self.assertEqual(scheduler.missed_ticks, 3)
+        self.assertAlmostEqual(scheduler.next_deadline, 100.4)
+        self.assertTrue(scheduler.wait(stop))
+        self.assertAlmostEqual(clock.now, 100.4)
+
+    def test_interval_change_rebases_on_the_last_deadline(self) -> None:
+        clock = _FakeClock()
+        stop = _FakeStopEvent(clock)
+        scheduler = DeadlineScheduler(0.1, clock=clock)
+        scheduler.start()
+        for _ in range(3):
+            scheduler.wait(stop)
+            clock.now += 0.01
+            scheduler.advance()
+
+        # Tick 2 was due at 100.2; the next one comes a full new interval after it.
+        scheduler.set_interval(0.5)
+        self.assertAlmostEqual(scheduler.next_deadline, 100.7)
+        scheduler.wait(stop)
+        scheduler.advance()
+        self.assertAlmostEqual(scheduler.next_deadline, 101.2)
+        self.assertEqual(scheduler.missed_ticks, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
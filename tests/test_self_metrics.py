@@ -0,0 +1,83 @@
+from pathlib import Path
+import json
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor import self_metrics
+from system_monitor.self_metrics import SelfProfiler
+
+
+class SelfProfilerTest(unittest.TestCase):
+    def test_disabled_stages_record_nothing(self) -> None:
+        profiler = SelfProfiler()
+        with profiler.stage("sample"):
+            pass
+
+        self.assertIs(profiler.stage("sample"), profiler.stage("refresh_graph"))
+        self.assertEqual(profiler.histograms(), {})
+
+    def test_enabled_stages_collect_percentiles(self) -> None:
+        profiler = SelfProfiler()
+        profiler.enable()
+        for _ in range(5):
+            with profiler.stage("sample"):
+                pass
+        with profiler.stage("setData"):
+            pass
+
+        summary = profiler.summary()
+        self.assertEqual(summary["stages"]["sample"]["count"], 5)
+        self.assertEqual(set(summary["stages"]), {"sample", "setData"})
+        self.assertLessEqual(summary["stages"]["sample"]["p50_ms"], summary["stages"]["sample"]["p99_ms"])
+        self.assertGreater(summary["process"]["rss_bytes"], 0)
+        self.assertIn("setData", profiler.format_table())
+
+    def test_enabling_without_psutil_explains_the_install(self) -> None:
+        profiler = SelfProfiler()
+        with mock.patch.object(self_metrics, "psutil", None):
+            with self.assertRaisesRegex(RuntimeError, "psutil is not installed"):
+                profiler.enable()
+        self.assertFalse(profiler.enabled)
+
+    def test_dump_writes_json(self) -> None:
+        profiler = SelfProfiler()
+        profiler.enable()
+        with profiler.stage("export flush"):
+            pass
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "nested" / "self.json"
+            profiler.dump(path)
+            payload = json.loads(path.read_text(encoding="utf-8"))
+
+        self.assertEqual(payload["stages"]["export flush"]["count"], 1)
+        self.assertIn("cpu_percent", payload["process"])
+
+    def test_overlapping_threads_keep_their_own_start_times(self) -> None:
+        profiler = SelfProfiler()
+        profiler.enable()
+
+        def quick_writer() -> None:
+            with profiler.stage("export encode"):
+                pass
+
+        with profiler.stage("export encode"):
+            time.sleep(0.05)
+            writer = threading.Thread(target=quick_writer)
+            writer.start()
+            writer.join()
+
+        histogram = profiler.histograms()["export encode"]
+        self.assertEqual(histogram.count, 2)
+        self.assertGreaterEqual(histogram.maximum, 0.05)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+from datetime import datetime
+import os
+from pathlib import Path
+import subprocess
+import sys
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.metric_vectors import make_vector
+from system_monitor.services.shared_ring import (
+    CATCH_UP_INTERVAL_SECONDS,
+    SharedRingReader,
+    SharedRingSource,
+    SharedSnapshotRing,
+)
+
+LAYOUT = {"cpu_core_percent": ("cpu0", "cpu1")}
+
+
+def _snapshot(index: int) -> SystemSnapshot:
+    return SystemSnapshot(
+        captured_at=datetime(2024, 1, 1, 12, 0, index % 60, 250_000),
+        elapsed_seconds=float(index),
+        uptime_seconds=100.0 + index,
+        cpu_percent=float(index % 100),
+        ram_percent=20.25,
+        disk_percent=30.0,
+        process_count=100 + index,
+        net_sent_bps=1.5,
+        net_recv_bps=2.5,
+        vectors={"cpu_core_percent": make_vector(LAYOUT["cpu_core_percent"], [index, 2 * index])},
+    )
+
+
+class SharedRingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.name = f"system-monitor-test-{os.getpid()}-{self.id().rsplit('.', 1)[-1]}"
+        self.ring = SharedSnapshotRing(self.name, capacity=8, vector_layout=LAYOUT, interval_seconds=0.5)
+        self.addCleanup(self.ring.close)
+
+    def test_reader_sees_records_and_vector_labels(self) -> None:
+        reader = SharedRingReader(self.name)
+        self.addCleanup(reader.close)
+        self.assertIsNone(reader.latest())
+        for index in range(3):
+            self.ring.write(_snapshot(index))
+
+        self.assertEqual(reader.head, 3)
+        self.assertEqual(reader.vector_layout, LAYOUT)
+        self.assertEqual(reader.publisher_interval, 0.5)
+        self.assertEqual(reader.read(1)["process_count"], 101)
+        self.assertEqual(reader.latest()["cpu_core_percent"].tolist(), [2.0, 4.0])
+        self.assertIsNone(reader.read(3))
+        # The zero-copy view is the shared memory itself, so it changes under the reader.
+        self.assertEqual(reader.records["elapsed_seconds"][:3].tolist(), [0.0, 1.0, 2.0])
+        self.assertFalse(reader.records.flags.writeable)
+
+    def test_overwritten_records_raise_lookup_error(self) -> None:
+        reader = SharedRingReader(self.name)
+        self.addCleanup(reader.close)
+        for index in range(10):
+            self.ring.write(_snapshot(index))
+        with self.assertRaises(LookupError):
+            reader.read(1)
+        self.assertEqual(reader.oldest, 2)
+        self.assertEqual(reader.read(2)["elapsed_seconds"], 2.0)
+
+    def test_source_follows_the_ring_and_ends_when_it_closes(self) -> None:
+        self.ring.write(_snapshot(0))
+        self.ring.write(_snapshot(1))
+        source = SharedRingSource(self.name)
+        self.addCleanup(source.close)
+
+        first = source.sample()
+        self.assertEqual(first.elapsed_seconds, 1.0)
+        self.assertEqual(first.vectors["cpu_core_percent"].values.tolist(), [1.0, 2.0])
+        self.assertIsNone(source.sample())
+        self.assertEqual(source.next_interval(first), 0.25)
+
+        for index in range(2, 13):
+            self.ring.write(_snapshot(index))
+        self.assertEqual(source.next_interval(first), CATCH_UP_INTERVAL_SECONDS)
+        # Records 2..4 were overwritten before the source got to them.
+        self.assertEqual(source.sample().elapsed_seconds, 5.0)
+        self.assertEqual(source.lost, 3)
+
+        self.ring.close()
+        remaining = [source.sample().elapsed_seconds for _ in range(7)]
+        self.assertEqual(remaining, [6.0, 7.0, 8.0, 9.0, 10.0, 11.0, 12.0])
+        with self.assertRaises(EOFError):
+            source.sample()
+
+    def test_a_live_publisher_keeps_its_name(self) -> None:
+        with self.assertRaises(RuntimeError):
+            SharedSnapshotRing(self.name, capacity=4)
+
+    def test_a_crashed_publishers_ring_is_replaced(self) -> None:
+        name = f"{self.name}-stale"
+        crash = (
+            f"import os, sys; sys.path.insert(0, {str(SRC)!r})\n"
+            "from multiprocessing import resource_tracker\n"
+            "from system_monitor.services.shared_ring import SharedSnapshotRing\n"
+            f"ring = SharedSnapshotRing({name!r}, capacity=4)\n"
+            # Without its tracker's cleanup the segment outlives the process, as after a SIGKILL of both.
+            "resource_tracker.unregister(ring._segment._name, 'shared_memory')\n"
+            "os._exit(0)\n"
+        )
+        subprocess.run([sys.executable, "-c", crash], check=True)
+
+        replacement = SharedSnapshotRing(name, capacity=8)
+        self.addCleanup(replacement.close)
+        reader = SharedRingReader(name)
+        self.addCleanup(reader.close)
+        self.assertEqual(reader.capacity, 8)
+        self.assertEqual(reader.publisher_pid, os.getpid())
+
+    def test_attaching_to_a_missing_ring_explains_itself(self) -> None:
+        with self.assertRaises(RuntimeError):
+            SharedRingReader(f"{self.name}-missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
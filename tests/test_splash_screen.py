@@ -0,0 +1,69 @@
+from pathlib import Path
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    from PyQt5.QtWidgets import QApplication, QMainWindow
+
+    from system_monitor.ui.splash_screen import BUILD_AT_PERCENT, BUILT_PERCENT, SplashScreen
+except ModuleNotFoundError:  # pragma: no cover - PyQt5 missing
+    SplashScreen = None
+
+
+@unittest.skipIf(SplashScreen is None, "PyQt5 is not installed")
+class SplashScreenTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def _run_until(self, condition, timeout: float = 5.0) -> None:
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.001)
+
+    def test_builds_one_step_per_event_loop_turn(self) -> None:
+        window = QMainWindow()
+        targets = []
+
+        def build():
+            for done in (0.25, 0.5, 0.75, 1.0):
+                targets.append(splash._target)
+                yield done
+            return window
+
+        splash = SplashScreen(build=build())
+        splash.show()
+        self._run_until(lambda: splash.main_window is not None)
+        splash.timer.stop()
+
+        self.assertIs(splash.main_window, window)
+        # Each step sees the target its predecessor set, so the progress followed the build.
+        self.assertEqual(targets, [BUILD_AT_PERCENT, 27.5, 45.0, 62.5])
+        self.assertEqual(splash._target, BUILT_PERCENT)
+        splash.close()
+        window.close()
+
+    def test_skips_the_stylesheet_when_the_ring_did_not_move(self) -> None:
+        splash = SplashScreen(build=iter(()))
+        splash.timer.stop()
+        with mock.patch.object(splash.ui.circularProgress, "setStyleSheet") as set_style:
+            splash.progress_bar_value(0.0)
+            splash.progress_bar_value(5.0)
+            splash.progress_bar_value(5.0)
+        self.assertEqual(set_style.call_count, 1)
+        splash.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+try:
+    from system_monitor.ui.ui_loader import compile_ui, compiled_ui_path
+except ModuleNotFoundError:  # pragma: no cover - PyQt5 missing
+    compile_ui = None
+
+from system_monitor.constants import MAIN_UI_FILE
+
+
+@unittest.skipIf(compile_ui is None, "PyQt5 is not installed")
+class UiLoaderTest(unittest.TestCase):
+    def test_compiles_once_per_ui_version(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_dir = Path(tmp)
+            compiled = compile_ui(MAIN_UI_FILE, cache_dir)
+            self.assertEqual(compiled, compiled_ui_path(MAIN_UI_FILE, cache_dir))
+            self.assertIn("class Ui_MainWindow", compiled.read_text(encoding="utf-8"))
+
+            first_mtime = compiled.stat().st_mtime_ns
+            self.assertEqual(compile_ui(MAIN_UI_FILE, cache_dir), compiled)
+            self.assertEqual(compiled.stat().st_mtime_ns, first_mtime)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+from datetime import datetime
+from pathlib import Path
+import math
+import sys
+import unittest
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.models import SystemSnapshot
+from system_monitor.services.metric_vectors import CounterRates, aligned_values, make_vector
+from system_monitor.services.vector_history import VectorHistory, VectorRing
+
+
+def _snapshot(vectors) -> SystemSnapshot:
+    return SystemSnapshot(
+        captured_at=datetime(2024, 1, 1),
+        elapsed_seconds=0.0,
+        uptime_seconds=0.0,
+        cpu_percent=0.0,
+        ram_percent=0.0,
+        disk_percent=0.0,
+        process_count=0,
+        net_sent_bps=0.0,
+        net_recv_bps=0.0,
+        vectors=vectors,
+    )
+
+
+class VectorRingTest(unittest.TestCase):
+    def test_keeps_newest_rows_as_contiguous_views(self) -> None:
+        ring = VectorRing(max_points=3)
+        labels = ("cpu0", "cpu1")
+        for index in range(7):
+            ring.append(float(index), make_vector(labels, [index, 10 * index]))
+
+        self.assertEqual(len(ring), 3)
+        self.assertEqual(ring.times().tolist(), [4.0, 5.0, 6.0])
+        self.assertEqual(ring.matrix().tolist(), [[4, 40], [5, 50], [6, 60]])
+        self.assertFalse(ring.matrix().flags.writeable)
+        times, matrix = ring.window(5.0)
+        self.assertEqual(times.tolist(), [5.0, 6.0])
+        self.assertEqual(matrix.shape, (2, 2))
+
+    def test_new_labels_keep_history_by_label(self) -> None:
+        ring = VectorRing(max_points=4)
+        ring.append(0.0, make_vector(("eth0", "lo"), [1.0, 2.0]))
+        ring.append(1.0, make_vector(("lo", "wlan0"), [3.0, 4.0]))
+
+        self.assertEqual(ring.labels, ("lo", "wlan0"))
+        matrix = ring.matrix()
+        self.assertEqual(matrix[0, 0], 2.0)
+        self.assertTrue(math.isnan(matrix[0, 1]))
+        self.assertEqual(matrix[1].tolist(), [3.0, 4.0])
+
+    def test_history_keeps_one_ring_per_metric(self) -> None:
+        history = VectorHistory(max_points=10)
+        history.append(0.0, {"a": make_vector(("x",), [1.0]), "b": make_vector(("y", "z"), [2.0, 3.0])})
+        self.assertIn("a", history)
+        self.assertEqual(history.ring("b").matrix().shape, (1, 2))
+        self.assertIsNone(history.ring("missing"))
+
+
+class MetricVectorHelpersTest(unittest.TestCase):
+    def test_counter_rates_handle_new_labels_and_resets(self) -> None:
+        rates = CounterRates()
+        self.assertEqual(rates.update(("eth0",), [1000], 0.0).tolist(), [0.0])
+        self.assertEqual(rates.update(("eth0",), [3000], 2.0).tolist(), [1000.0])
+        # A new interface starts at 0, and a counter that went backwards is clamped to 0.
+        self.assertEqual(rates.update(("eth0", "eth1"), [2000, 500], 3.0).tolist(), [0.0, 0.0])
+        self.assertEqual(rates.update(("eth0", "eth1"), [2500, 600], 4.0).tolist(), [500.0, 100.0])
+
+    def test_aligned_values_follow_the_layout(self) -> None:
+        snapshot = _snapshot({"mount_percent": make_vector(("/", "/data"), [10.0, 20.0])})
+        same = aligned_values(snapshot, "mount_percent", ("/", "/data"))
+        self.assertIs(same, snapshot.vectors["mount_percent"].values)
+
+        moved = aligned_values(snapshot, "mount_percent", ("/data", "/gone"))
+        self.assertEqual(moved[0], 20.0)
+        self.assertTrue(np.isnan(moved[1]))
+        self.assertTrue(np.isnan(aligned_values(snapshot, "cpu_core_percent", ("cpu0",))).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
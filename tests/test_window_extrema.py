@@ -0,0 +1,55 @@
+from pathlib import Path
+import random
+import sys
+import unittest
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from system_monitor.services.window_extrema import SlidingWindowExtrema
+
+
+class SlidingWindowExtremaTest(unittest.TestCase):
+    def test_matches_brute_force_over_time_window(self) -> None:
+        rng = random.Random(3)
+        extrema = SlidingWindowExtrema(window_seconds=5.0)
+        samples: list[tuple[float, float]] = []
+        for index in range(500):
+            timestamp = index * 0.5
+            value = rng.uniform(0.0, 100.0)
+            samples.append((timestamp, value))
+            extrema.push(timestamp, value)
+
+            visible = [sample for sample_time, sample in samples if sample_time >= timestamp - 5.0]
+            self.assertEqual(extrema.bounds(), (min(visible), max(visible)))
+
+    def test_extend_matches_pushing_each_sample(self) -> None:
+        rng = random.Random(11)
+        pushed = SlidingWindowExtrema(window_seconds=5.0)
+        extended = SlidingWindowExtrema(window_seconds=5.0)
+        timestamp = 0.0
+        for batch in (1, 7, 40, 3):
+            times, values = [], []
+            for _ in range(batch):
+                timestamp += 0.25
+                times.append(timestamp)
+                values.append(float(rng.randint(0, 20)))
+                pushed.push(times[-1], values[-1])
+            extended.extend(np.array(times), np.array(values))
+            self.assertEqual(extended.bounds(), pushed.bounds())
+            self.assertEqual(list(extended._min), list(pushed._min))
+            self.assertEqual(list(extended._max), list(pushed._max))
+
+    def test_empty_window_has_no_bounds(self) -> None:
+        extrema = SlidingWindowExtrema(window_seconds=1.0)
+        self.assertIsNone(extrema.bounds())
+        self.assertIsNone(extrema.minimum)
+        self.assertIsNone(extrema.maximum)
+
+
+if __name__ == "__main__":
+    unittest.main()